@@ -9,7 +9,8 @@ setup(
         'google-auth-httplib2',
         'google-auth-oauthlib',
         'PyGObject',
-        'pytz'
+        'pytz',
+        'requests'
     ],
     entry_points={
         'console_scripts': [
@@ -36,5 +37,5 @@ setup(
         "Programming Language :: Python :: 3",
         "Topic :: Office/Business :: Scheduling",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 ) 
\ No newline at end of file
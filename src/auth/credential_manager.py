@@ -0,0 +1,180 @@
+"""OAuth credential storage and background token refresh."""
+from datetime import datetime, timedelta, timezone
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+from google.auth.exceptions import RefreshError, TransportError
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from storage.atomic_file import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Refresh this long before the access token expires
+REFRESH_MARGIN = timedelta(minutes=5)
+# Wait before retrying a failed background refresh
+RETRY_DELAY = 60
+# How long to sleep when the token has no expiry
+IDLE_DELAY = 3600
+# Longest single sleep, so the wall clock is re-checked after a suspend
+MAX_SLEEP = 300
+
+def is_invalid_grant(error):
+    """Whether a RefreshError means the refresh token was revoked or has expired."""
+    details = error.args[1] if len(error.args) > 1 else None
+    if isinstance(details, dict):
+        return details.get('error') == 'invalid_grant'
+    return 'invalid_grant' in str(error)
+
+class ManagedCredentials(Credentials):
+    """User credentials whose refreshes are delegated to a CredentialManager.
+
+    google-auth calls refresh() inline when a request finds the token expired
+    or gets a 401; routing that through the manager means it shares the lock
+    (and the result) of any refresh already in flight and the new token is
+    saved.
+    """
+
+    manager = None
+
+    def refresh(self, request):
+        """Refresh through the manager, or directly if there is none."""
+        if self.manager is None:
+            super().refresh(request)
+        else:
+            self.manager.refresh(request, stale_token=self.token)
+
+    def refresh_token_now(self, request):
+        """Exchange the refresh token for a new access token."""
+        super().refresh(request)
+
+class CredentialManager:
+    """Loads, saves and proactively refreshes the user's OAuth credentials.
+
+    Tokens are stored as JSON (written atomically, readable only by the user).
+    A background thread refreshes the access token shortly before it expires,
+    so API calls during a poll find a valid token and never wait for one.
+    Concurrent refreshes are single-flight: callers that find a refresh in
+    progress wait for it and use its token instead of starting another.
+    """
+
+    def __init__(self, token_file, scopes, legacy_token_file=None):
+        """Create the manager; call load() or set_credentials() next."""
+        self.token_file = str(token_file)
+        self.legacy_token_file = str(legacy_token_file) if legacy_token_file else None
+        self.scopes = scopes
+        self.credentials = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._on_revoked = None
+
+    def load(self):
+        """Read saved credentials, migrating a legacy token.pickle; returns None if there are none."""
+        try:
+            if os.path.exists(self.token_file):
+                with open(self.token_file, 'r') as f:
+                    self._adopt(json.load(f))
+            elif self.legacy_token_file and os.path.exists(self.legacy_token_file):
+                with open(self.legacy_token_file, 'rb') as token:
+                    self.set_credentials(pickle.load(token))
+                os.remove(self.legacy_token_file)
+                logger.info(f"Migrated OAuth token to {self.token_file}")
+        except Exception as e:
+            logger.error(f"Error loading saved credentials: {e}")
+            self.credentials = None
+        return self.credentials
+
+    def set_credentials(self, credentials):
+        """Take over credentials from an OAuth flow and save them."""
+        self._adopt(json.loads(credentials.to_json()))
+        self._save()
+
+    def refresh(self, request=None, stale_token=None):
+        """Refresh the access token unless another caller already replaced stale_token.
+
+        Args:
+            request: google.auth transport request to use; a new one by default.
+            stale_token (str): The token the caller found unusable. Defaults to
+                               the current token, which forces a refresh.
+        """
+        if stale_token is None:
+            stale_token = self.credentials.token
+        with self._lock:
+            if self.credentials.token != stale_token:
+                return  # Refreshed by another caller while this one waited
+            self.credentials.refresh_token_now(request or Request())
+            self._save()
+            logger.info(f"Access token refreshed, valid until {self.credentials.expiry} UTC")
+
+    def start(self, on_revoked=None):
+        """Start refreshing the token in the background before it expires.
+
+        Args:
+            on_revoked (callable): Optional. Called on the refresh thread as
+                                   on_revoked(error) when the refresh token was
+                                   revoked or expired; the saved token is removed
+                                   and refreshing stops, so the user must sign in again.
+        """
+        if self._thread is not None:
+            return
+        self._on_revoked = on_revoked
+        self._thread = threading.Thread(target=self._run, name='token-refresh', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Refresh loop: sleep until shortly before expiry, then refresh."""
+        while True:
+            delay = self._seconds_until_refresh()
+            if delay > 0:
+                time.sleep(min(delay, MAX_SLEEP))
+                continue
+            try:
+                self.refresh()
+            except RefreshError as e:
+                if is_invalid_grant(e):
+                    # Retrying cannot help; the user has to sign in again
+                    logger.error(f"OAuth refresh token is no longer valid: {e}")
+                    self._forget()
+                    if self._on_revoked is not None:
+                        self._on_revoked(e)
+                    return
+                logger.warning(f"Background token refresh failed, retrying in {RETRY_DELAY}s: {e}")
+                time.sleep(RETRY_DELAY)
+            except TransportError as e:
+                logger.warning(f"Background token refresh failed, retrying in {RETRY_DELAY}s: {e}")
+                time.sleep(RETRY_DELAY)
+            except Exception:
+                # Keep the refresher alive whatever went wrong (e.g. saving the token)
+                logger.exception(f"Unexpected error in background token refresh, retrying in {RETRY_DELAY}s")
+                time.sleep(RETRY_DELAY)
+
+    def _seconds_until_refresh(self):
+        """Seconds until the token should be refreshed; zero or less means now."""
+        expiry = self.credentials.expiry
+        if expiry is None:
+            return IDLE_DELAY if self.credentials.token else 0
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (expiry - REFRESH_MARGIN - now).total_seconds()
+
+    def _adopt(self, info):
+        """Build managed credentials from authorized-user JSON info."""
+        credentials = ManagedCredentials.from_authorized_user_info(info, self.scopes)
+        credentials.manager = self
+        self.credentials = credentials
+
+    def _forget(self):
+        """Remove the saved token so the next start runs the sign-in flow."""
+        try:
+            os.remove(self.token_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error removing saved credentials: {e}")
+
+    def _save(self):
+        """Write the credentials as JSON, atomically."""
+        write_atomic(self.token_file, self.credentials.to_json())
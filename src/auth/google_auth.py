@@ -1,12 +1,11 @@
 """Google Calendar authentication module with simplified user flow."""
 import os
-import pickle
-from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+from google.auth.exceptions import TransportError
 import logging
 from pathlib import Path
 import json
+from .credential_manager import CredentialManager
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +16,13 @@ class GoogleAuth:
         """Initialize the auth handler."""
         self.creds = None
         self.config_dir = Path.home() / '.config' / 'meeting-notifier'
-        self.token_file = str(self.config_dir / 'token.pickle')
         self.scopes = ['https://www.googleapis.com/auth/calendar.readonly']
+        # Tokens are kept in token.json; an old token.pickle is migrated on first load
+        self.credential_manager = CredentialManager(
+            self.config_dir / 'token.json',
+            self.scopes,
+            legacy_token_file=self.config_dir / 'token.pickle'
+        )
         
         # Load OAuth config from a secure location
         config_file = os.path.join(os.path.dirname(__file__), 'oauth_config.json')
@@ -39,21 +43,28 @@ class GoogleAuth:
                 }
             }
         
-    def authenticate(self):
+    def authenticate(self, on_revoked=None):
         """
         Authenticate with Google Calendar.
         Opens a browser window for user login if needed.
+        
+        Args:
+            on_revoked (callable): Optional. Called from the token refresh thread
+                                   with the error when the sign-in stops working.
         """
         try:
             # Try to load existing credentials
-            if os.path.exists(self.token_file):
-                with open(self.token_file, 'rb') as token:
-                    self.creds = pickle.load(token)
+            self.creds = self.credential_manager.load()
                     
             # If no valid credentials available, let the user log in
             if not self.creds or not self.creds.valid:
                 if self.creds and self.creds.expired and self.creds.refresh_token:
-                    self.creds.refresh(Request())
+                    try:
+                        self.credential_manager.refresh()
+                    except TransportError as e:
+                        # Offline: keep the expired token so the app can start from
+                        # its cached schedule; it is refreshed on the next API call
+                        logger.warning(f"Could not refresh token, starting offline: {e}")
                 else:
                     # Use embedded credentials
                     flow = InstalledAppFlow.from_client_config(
@@ -61,17 +72,16 @@ class GoogleAuth:
                         self.scopes,
                         redirect_uri='http://localhost'
                     )
-                    self.creds = flow.run_local_server(
+                    # Save the credentials for future use
+                    self.credential_manager.set_credentials(flow.run_local_server(
                         port=0,
                         prompt='consent',
                         success_message='Authentication successful! You can close this window.'
-                    )
-                    
-                # Save the credentials for future use
-                self.config_dir.mkdir(parents=True, exist_ok=True)
-                with open(self.token_file, 'wb') as token:
-                    pickle.dump(self.creds, token)
-                    
+                    ))
+                self.creds = self.credential_manager.credentials
+                
+            # Keep the access token fresh from now on so polls never wait for a refresh
+            self.credential_manager.start(on_revoked)
             return self.creds
             
         except Exception as e:
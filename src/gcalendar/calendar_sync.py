@@ -2,109 +2,632 @@
 from datetime import datetime, timedelta
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from dateutil import parser
+from googleapiclient.http import BatchHttpRequest
 import pytz
+import heapq
 import logging
 import os
+import time
+from .event import Event, LIST_FIELDS, parse_event_time
+from .meeting_links import extract_meeting_link
+from .resilience import CircuitBreaker, CircuitOpenError, QuotaCounter, RetryPolicy
+from .transport import PooledHttp, ValidatorCache
+from metrics.registry import get_metrics
 
 # Disable cache warnings
 logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
 logger = logging.getLogger(__name__)
 
+EVENTS_PARSED = get_metrics().counter(
+    'meeting_notifier_events_parsed_total', "Event resources parsed into Event objects"
+)
+PARSE_SECONDS = get_metrics().histogram(
+    'meeting_notifier_parse_seconds', "Time to parse one page of events, by source (api or store)"
+)
+
+# How far back the initial full sync reaches, so events in progress are kept
+FULL_SYNC_LOOKBACK = timedelta(days=1)
+# How far ahead a full sync reaches; recurring series without an end would
+# otherwise download every future instance
+FULL_SYNC_HORIZON = timedelta(days=28)
+# A calendar is fully resynced once its horizon is closer than this
+FULL_SYNC_RENEW = timedelta(days=7)
+# Page size used when walking sync and window results
+SYNC_PAGE_SIZE = 250
+# How long the cached calendar list is trusted before calendarList is queried again
+CALENDAR_LIST_MAX_AGE = timedelta(days=1)
+# Maximum number of calls the Calendar API accepts in one batch request
+BATCH_LIMIT = 50
+# How long the cached calendar timezone is used before it is looked up again
+TIMEZONE_MAX_AGE = timedelta(days=1)
+
+class EventPage(list):
+    """Parsed events from one API response page."""
+    
+    def __init__(self, events, more):
+        """Wrap a page of events; more tells whether further pages follow."""
+        super().__init__(events)
+        self.more = more
+
 class CalendarSync:
     """Handles Google Calendar synchronization and event monitoring."""
     
-    def __init__(self, credentials):
-        """Initialize the calendar service with credentials."""
-        # Disable cache file
-        os.environ['GOOGLE_DISCOVERY_SERVICE_ACCOUNT_CACHE'] = 'false'
+    def __init__(self, credentials, store=None, calendar_ids=None, api_endpoint=None):
+        """Initialize the calendar service with credentials.
+        
+        Args:
+            credentials: Google OAuth credentials.
+            store (EventStore): Optional local event store. When given, events are
+                                synced incrementally with sync tokens and queried
+                                locally instead of re-downloading the time window.
+            calendar_ids (list): Calendars to fetch. None uses the calendars
+                                 selected in the user's Google Calendar list.
+            api_endpoint (str): Optional root URL replacing https://www.googleapis.com/,
+                                e.g. tools/fake_calendar_server.py for load tests.
+        """
+        self.store = store
+        self.set_calendar_ids(calendar_ids)
         
-        self.service = build('calendar', 'v3', credentials=credentials, cache_discovery=False)
+        # All API calls share one pooled, keep-alive session with explicit timeouts
+        self.http = PooledHttp(credentials)
+        client_options = None
+        self.batch_uri = None
+        if api_endpoint:
+            root = api_endpoint.rstrip('/') + '/'
+            client_options = {'api_endpoint': root + 'calendar/v3/'}
+            # The client builds batch URIs from the discovery document's rootUrl
+            self.batch_uri = root + 'batch/calendar/v3'
+        # Use the discovery document bundled with google-api-python-client
+        # instead of downloading it on every start
+        self.service = build(
+            'calendar', 'v3',
+            http=self.http,
+            static_discovery=True,
+            client_options=client_options
+        )
+        # Transient failures are retried with backoff; repeated ones open the breaker
+        # so polls fail fast (and the app serves its cached schedule) for a while
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        # Calls to a test endpoint do not use the Google project's quota
+        self.quota = QuotaCounter(
+            os.path.expanduser('~/.config/meeting-notifier/test_api_quota.json') if api_endpoint else None
+        )
+        # ETags of recent responses; unchanged ones come back as 304 and are served from here
+        self.validators = ValidatorCache()
         self.timezone = pytz.timezone('UTC')  # Default to UTC
+        self._load_timezone()
+        
+    def _load_timezone(self):
+        """Use the timezone cached in the store; look it up only on the first run."""
+        if self.store is not None:
+            name, updated_at = self.store.get_metadata('timezone')
+            if name:
+                self.timezone = pytz.timezone(name)
+                # A stale value is still used; it is refreshed with the next sync
+                self._timezone_stale = time.time() - updated_at > TIMEZONE_MAX_AGE.total_seconds()
+                return
+        self._refresh_timezone()
+        
+    def _refresh_timezone(self):
+        """Look up the user's timezone in the calendar settings."""
+        self._timezone_stale = False
         try:
-            # Try to get user's timezone from calendar settings
-            settings = self.service.settings().get(setting='timezone').execute()
+            settings = self._execute(self.service.settings().get(setting='timezone'))
             if settings.get('value'):
                 self.timezone = pytz.timezone(settings['value'])
+                if self.store is not None:
+                    self.store.set_metadata('timezone', settings['value'])
+        except Exception as e:
+            logger.warning(f"Could not get user timezone, using {self.timezone.zone}: {e}")
+        
+    def close(self):
+        """Write state that is saved lazily, such as the quota count."""
+        self.quota.flush()
+        
+    def set_calendar_ids(self, calendar_ids):
+        """Choose which calendars to sync; None follows the user's calendar list selection."""
+        self.calendar_ids = list(calendar_ids) if calendar_ids is not None else None
+        
+    def list_calendars(self, max_age=CALENDAR_LIST_MAX_AGE, offline=False):
+        """Return the user's calendars, using the cached calendar list when fresh.
+        
+        Args:
+            max_age (timedelta): How old the cached list may be before it is
+                                 fetched again from calendarList.
+            offline (bool): Only use the cached list, however old it is.
+        
+        Returns:
+            list: Dictionaries with 'id', 'summary', 'primary' and 'selected' keys.
+        """
+        cached = None
+        if self.store is not None:
+            cached, fetched_at = self.store.get_calendars()
+            fresh = datetime.now().timestamp() - fetched_at < max_age.total_seconds()
+            if cached is not None and (fresh or offline):
+                return cached
+        if offline:
+            return []
+        
+        try:
+            calendars = self._fetch_calendars()
         except Exception as e:
-            logger.warning(f"Could not get user timezone, using UTC: {e}")
+            if cached is None:
+                raise
+            # Better a stale calendar list than none while the API is unreachable
+            logger.warning(f"Could not refresh calendar list, using cached list: {e}")
+            return cached
+        
+        if self.store is not None:
+            self.store.save_calendars(calendars)
+        return calendars
+        
+    def _fetch_calendars(self):
+        """Download the calendar list, following all pages."""
+        calendars = []
+        request = self.service.calendarList().list(minAccessRole='reader')
+        while request is not None:
+            result = self._execute(request)
+            for entry in result.get('items', []):
+                calendars.append({
+                    'id': entry['id'],
+                    'summary': entry.get('summaryOverride', entry.get('summary', entry['id'])),
+                    'primary': entry.get('primary', False),
+                    'selected': entry.get('selected', False)
+                })
+            request = self.service.calendarList().list_next(request, result)
+        return calendars
+        
+    def get_selected_calendar_ids(self, offline=False):
+        """Return the ids of the calendars to fetch events from."""
+        if self.calendar_ids:
+            return self.calendar_ids
+        try:
+            selected = [
+                calendar['id'] for calendar in self.list_calendars(offline=offline)
+                if calendar['selected'] or calendar['primary']
+            ]
+        except Exception as e:
+            logger.warning(f"Could not list calendars, using primary only: {e}")
+            selected = []
+        return selected or ['primary']
+        
+    def _execute_batch(self, requests):
+        """Execute several API requests in as few HTTP round trips as possible.
+        
+        Args:
+            requests (dict): Maps a string key to an unexecuted HttpRequest.
+        
+        Returns:
+            dict: Maps each key to a (response, exception) tuple.
+        """
+        results = {}
+        if len(requests) == 1:
+            # A single request does not need the multipart batch overhead
+            key, request = next(iter(requests.items()))
+            try:
+                results[key] = (self._execute(request), None)
+            except HttpError as error:
+                results[key] = (None, error)
+            return results
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                cached = self.validators.resolve(requests[request_id], exception)
+                if cached is not None:
+                    response, exception = cached, None
+            else:
+                self.validators.store(requests[request_id], response)
+            results[request_id] = (response, exception)
+        
+        def execute_pending():
+            # First round sends everything, retries only the throttled parts
+            pending = [key for key in requests if key not in results or self._is_retryable(results[key][1])]
+            for i in range(0, len(pending), BATCH_LIMIT):
+                chunk = pending[i:i + BATCH_LIMIT]
+                batch = self._new_batch(on_response)
+                for key in chunk:
+                    self.validators.prepare(requests[key])
+                    batch.add(requests[key], request_id=key)
+                # Every part of a batch counts against the quota
+                self.quota.add(len(chunk))
+                batch.execute()
+            for key in pending:
+                if self._is_retryable(results[key][1]):
+                    raise results[key][1]
+        
+        try:
+            self._call(execute_pending, calls=0)
+        except HttpError:
+            if len(results) < len(requests):
+                raise
+            # Parts still throttled after the last retry keep their error in results
+        return results
+        
+    def _new_batch(self, callback):
+        """Create a batch request for the configured endpoint."""
+        if self.batch_uri is None:
+            return self.service.new_batch_http_request(callback=callback)
+        return BatchHttpRequest(callback=callback, batch_uri=self.batch_uri)
+        
+    def _is_retryable(self, error):
+        """Whether a batch part failed with an error worth retrying."""
+        return error is not None and self.retry_policy.is_retryable(error)
+        
+    def _execute(self, request):
+        """Execute a request with If-None-Match; a 304 returns the cached result."""
+        self.validators.prepare(request)
+        
+        def execute():
+            try:
+                result = request.execute()
+            except HttpError as error:
+                cached = self.validators.resolve(request, error)
+                if cached is None:
+                    raise
+                return cached
+            self.validators.store(request, result)
+            return result
+        
+        return self._call(execute)
+        
+    def _call(self, execute, calls=1):
+        """Run one API round trip through the retry policy and quota counter, if the breaker allows.
+        
+        Args:
+            execute (callable): Sends the request and returns its result,
+                                e.g. HttpRequest.execute.
+            calls (int): API calls each attempt counts against the daily quota.
+        
+        Raises:
+            CircuitOpenError: The breaker is open; nothing was sent.
+        """
+        self.breaker.check()
+        
+        def attempt():
+            if calls:
+                self.quota.add(calls)
+            return execute()
+        
+        # The breaker counts whole polls; get_upcoming_events records the outcome
+        return self.retry_policy.call(attempt)
+        
+    def sync(self, on_page=None):
+        """Bring the local store up to date with all selected calendars.
+        
+        Uses the stored sync token of each calendar to fetch only changed or
+        cancelled events. Falls back to a full resync of a calendar when it has
+        no token, the server reports it as expired (HTTP 410) or the window of
+        its last full sync (FULL_SYNC_HORIZON ahead) is about to end. All calendars
+        are fetched together in one batch request per page round, and each page
+        is written to the store as soon as it arrives.
+        
+        A full resync is staged over the stored rows: events it does not return
+        are only removed, and its sync token saved, once its last page arrived.
+        Until then the last-known schedule stays in place for offline use.
+        
+        Args:
+            on_page (callable): Called without arguments after a page round when
+                                more pages are still to come.
+        """
+        if self._timezone_stale:
+            self._refresh_timezone()
         
-    def get_upcoming_events(self, minutes_ahead=5):
+        # calendar_id -> request state for the next page round
+        pending = {}
+        for calendar_id in self.get_selected_calendar_ids():
+            sync_token = self.store.get_sync_token(calendar_id)
+            if sync_token and self._horizon_due(calendar_id):
+                # Incremental syncs keep the window of the full sync; move it forward
+                logger.info(f"Sync window of {calendar_id} ends soon, running full resync")
+                sync_token = None
+            pending[calendar_id] = self._sync_state(sync_token)
+        calendar_count = len(pending)
+        errors = {}
+        
+        while pending:
+            requests = {
+                calendar_id: self.service.events().list(**self._sync_params(calendar_id, state))
+                for calendar_id, state in pending.items()
+            }
+            responses = self._execute_batch(requests)
+            
+            next_pending = {}
+            for calendar_id, (result, error) in responses.items():
+                state = pending[calendar_id]
+                if error is not None:
+                    if isinstance(error, HttpError) and error.resp.status == 410:
+                        logger.info(f"Sync token for {calendar_id} expired, running full resync")
+                        next_pending[calendar_id] = self._sync_state(None)
+                    else:
+                        errors[calendar_id] = error
+                    continue
+                
+                self._apply_sync_page(calendar_id, result, state['seen_ids'])
+                if result.get('nextPageToken'):
+                    next_pending[calendar_id] = dict(state, page_token=result['nextPageToken'])
+                elif state['sync_token']:
+                    self.store.save_sync_token(calendar_id, result.get('nextSyncToken'))
+                    logger.debug(f"Incremental sync of {calendar_id} complete")
+                else:
+                    self.store.finish_full_sync(calendar_id, state['seen_ids'], result.get('nextSyncToken'))
+                    self.store.set_metadata(f'sync_horizon:{calendar_id}', str(state['time_max'].timestamp()))
+                    logger.debug(f"Full sync of {calendar_id} complete")
+            pending = next_pending
+            if pending and on_page is not None:
+                on_page()
+        
+        # Events that ended before the lookback window are no longer needed
+        self.store.prune((datetime.now(pytz.utc) - FULL_SYNC_LOOKBACK).timestamp())
+        self._raise_for_calendar_errors(errors, calendar_count)
+        
+    def _raise_for_calendar_errors(self, errors, calendar_count):
+        """Fail a fetch for transient per-calendar errors, or when every calendar failed.
+        
+        Other errors, such as a 404 for a calendar the user unsubscribed from or a
+        403 for one no longer shared, only skip that calendar so the others still sync.
+        
+        Args:
+            errors (dict): Maps calendar ids to the error their request failed with.
+            calendar_count (int): Number of calendars that were fetched.
+        """
+        for calendar_id, error in errors.items():
+            if self._is_retryable(error) or isinstance(error, CircuitOpenError):
+                logger.error(f"Failed to sync calendar {calendar_id}: {error}")
+                raise error
+        if errors and len(errors) == calendar_count:
+            raise next(iter(errors.values()))
+        for calendar_id, error in errors.items():
+            logger.warning(f"Skipping calendar {calendar_id}: {error}")
+        
+    def _sync_state(self, sync_token):
+        """Return the request state of a calendar's sync; full syncs get a fixed window."""
+        state = {'sync_token': sync_token, 'page_token': None, 'seen_ids': None}
+        if not sync_token:
+            state['seen_ids'] = set()  # Rows not seen again are dropped at the end
+            now = datetime.now(self.timezone)
+            state['time_min'] = now - FULL_SYNC_LOOKBACK
+            state['time_max'] = now + FULL_SYNC_HORIZON
+        return state
+        
+    def _horizon_due(self, calendar_id):
+        """Whether the window of a calendar's last full sync ends too soon."""
+        value, _ = self.store.get_metadata(f'sync_horizon:{calendar_id}')
+        if value is None:
+            return True  # Synced before full syncs were bounded
+        return float(value) - time.time() < FULL_SYNC_RENEW.total_seconds()
+        
+    def _sync_params(self, calendar_id, state):
+        """Build events.list parameters for a full or incremental sync page."""
+        params = {
+            'calendarId': calendar_id,
+            'singleEvents': True,
+            'maxResults': SYNC_PAGE_SIZE,
+            'fields': LIST_FIELDS
+        }
+        if state['sync_token']:
+            params['syncToken'] = state['sync_token']
+        else:
+            params['timeMin'] = state['time_min'].isoformat()
+            params['timeMax'] = state['time_max'].isoformat()
+        if state['page_token']:
+            params['pageToken'] = state['page_token']
+        return params
+        
+    def _apply_sync_page(self, calendar_id, result, seen_ids=None):
+        """Write one page of sync results to the store.
+        
+        Args:
+            seen_ids (set): During a full sync, collects the ids of the events kept.
+        """
+        upserts = []
+        deleted_ids = []
+        for event in result.get('items', []):
+            if event.get('status') == 'cancelled':
+                deleted_ids.append(event['id'])
+                continue
+            start_time, end_time = self._parse_times(event)
+            upserts.append((event['id'], start_time.timestamp(), end_time.timestamp(), event))
+            if seen_ids is not None:
+                seen_ids.add(event['id'])
+        self.store.apply_changes(calendar_id, upserts, deleted_ids)
+        
+    def _parse_times(self, event):
+        """Return the (start, end) datetimes of an event resource."""
+        start_time = parse_event_time(event['start'], self.timezone)
+        end_time = parse_event_time(event['end'], self.timezone) if 'end' in event else start_time
+        return start_time, end_time
+        
+    def _parse_event(self, event, calendar_id, start_time, end_time):
+        """Turn an event resource into the Event used by the UI."""
+        meeting_link, meeting_provider = extract_meeting_link(event)
+        
+        return Event(
+            event['id'],
+            calendar_id,
+            event.get('summary', 'No Title'),
+            start_time,
+            end_time,
+            description=event.get('description', ''),
+            location=event.get('location', ''),
+            meeting_link=meeting_link,
+            meeting_provider=meeting_provider,
+            organizer=event.get('organizer', {}).get('email', '')
+        )
+        
+    def get_upcoming_events(self, minutes_ahead=5, on_partial=None):
         """Get upcoming events starting in the next few minutes or hours.
         
         Args:
             minutes_ahead (int): Number of minutes to look ahead for events.
                                Default is 5 minutes for immediate notifications.
                                Use larger values like 1440 (24 hours) for daily view.
+            on_partial (callable): Optional. Called with the sorted events received
+                                   so far whenever more pages are still downloading,
+                                   so a view can render before the fetch completes.
         """
         try:
-            now = datetime.now(self.timezone)
-            time_min = now.isoformat()
-            time_max = (now + timedelta(minutes=minutes_ahead)).isoformat()
-            
-            # For longer time ranges, increase the max results
-            max_results = 50 if minutes_ahead > 60 else 10
-            
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime',
-                maxResults=max_results
-            ).execute()
-            
-            events = events_result.get('items', [])
-            upcoming = []
-            
-            for event in events:
-                # Get event start time
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                start_time = parser.parse(start)
-                
-                # Make sure start_time is timezone aware
-                if start_time.tzinfo is None:
-                    start_time = self.timezone.localize(start_time)
-                
-                # For immediate notifications (5 minutes), only include events about to start
-                # For longer ranges (daily view), include all events in the range
-                if minutes_ahead <= 5:
-                    if not (start_time > now and start_time <= now + timedelta(minutes=minutes_ahead)):
-                        continue
-                
-                # Extract meeting link from conference data
-                meeting_link = None
-                if 'conferenceData' in event:
-                    for entry in event.get('conferenceData', {}).get('entryPoints', []):
-                        if entry.get('entryPointType') == 'video':
-                            meeting_link = entry.get('uri')
-                            break
-                
-                upcoming.append({
-                    'id': event['id'],
-                    'summary': event.get('summary', 'No Title'),
-                    'start_time': start_time,
-                    'description': event.get('description', ''),
-                    'location': event.get('location', ''),
-                    'meeting_link': meeting_link,
-                    'attendees': [
-                        attendee.get('email')
-                        for attendee in event.get('attendees', [])
-                        if attendee.get('email')
-                    ],
-                    'organizer': event.get('organizer', {}).get('email', '')
-                })
-            
-            # Sort events by start time
-            upcoming.sort(key=lambda x: x['start_time'])
-            return upcoming
+            if self.store is not None:
+                events = self._get_stored_events(minutes_ahead, on_partial)
+            else:
+                events = []
+                seen = set()
+                for page in self.iter_upcoming_event_pages(minutes_ahead):
+                    # Each page is sorted and merged into the result; copies of a meeting
+                    # already seen on another calendar are dropped. The server's startTime
+                    # order is not relied on, since it may place all-day events in another
+                    # timezone than the one they are parsed in here
+                    fresh = sorted(
+                        (event for event in page if event.id not in seen),
+                        key=lambda x: x.start_time
+                    )
+                    seen.update(event.id for event in fresh)
+                    events = list(heapq.merge(events, fresh, key=lambda x: x.start_time))
+                    if on_partial is not None and page.more:
+                        on_partial(events)
             
         except HttpError as error:
-            logger.error(f"Failed to fetch calendar events: {error}")
-            if error.resp.status == 401:
-                # Handle authentication errors
-                raise Exception("Calendar access unauthorized. Please sign in again.")
+            self._record_poll_failure(error)
+            self._handle_http_error(error)
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping calendar fetch: {e}")
             raise
         except Exception as e:
+            self._record_poll_failure(e)
             logger.error(f"Unexpected error fetching calendar events: {e}")
-            raise 
\ No newline at end of file
+            raise
+        self.breaker.record_success()
+        return events
+        
+    def _record_poll_failure(self, error):
+        """Count a failed poll towards opening the breaker, once however many calls it made."""
+        # Only errors that say "slow down" or "unavailable" count towards opening
+        if self.retry_policy.is_retryable(error):
+            self.breaker.record_failure()
+            
+    def iter_upcoming_event_pages(self, minutes_ahead=5):
+        """Yield lists of parsed events, one per API response page.
+        
+        The first page of every selected calendar is fetched in one batch;
+        further pages are followed lazily through nextPageToken, so no events
+        are truncated. Events are ordered by start time within each page.
+        """
+        now = datetime.now(self.timezone)
+        time_max = now + timedelta(minutes=minutes_ahead)
+        params = {
+            'timeMin': now.isoformat(),
+            'timeMax': time_max.isoformat(),
+            'singleEvents': True,
+            'orderBy': 'startTime',
+            'maxResults': SYNC_PAGE_SIZE,
+            'fields': LIST_FIELDS
+        }
+        
+        requests = {
+            calendar_id: self.service.events().list(calendarId=calendar_id, **params)
+            for calendar_id in self.get_selected_calendar_ids()
+        }
+        first_pages = self._execute_batch(requests)
+        self._raise_for_calendar_errors(
+            {calendar_id: error for calendar_id, (_, error) in first_pages.items() if error is not None},
+            len(first_pages)
+        )
+        
+        for calendar_id, (result, error) in first_pages.items():
+            if error is not None:
+                continue  # Skipped above
+            request = requests[calendar_id]
+            while True:
+                next_request = self.service.events().list_next(request, result)
+                yield EventPage(
+                    self._parse_page(result, calendar_id, now, time_max, minutes_ahead),
+                    more=next_request is not None
+                )
+                if next_request is None:
+                    break
+                request = next_request
+                result = self._execute(request)
+                
+    def _parse_page(self, result, calendar_id, now, time_max, minutes_ahead):
+        """Parse the events of one events.list response page."""
+        started = time.monotonic()
+        events = []
+        for event in result.get('items', []):
+            # Get event start and end time
+            start_time, end_time = self._parse_times(event)
+            
+            # For immediate notifications (5 minutes), only include events about to start
+            # For longer ranges (daily view), include all events in the range
+            if minutes_ahead <= 5:
+                if not (start_time > now and start_time <= time_max):
+                    continue
+            
+            events.append(self._parse_event(event, calendar_id, start_time, end_time))
+        PARSE_SECONDS.observe(time.monotonic() - started, source='api')
+        EVENTS_PARSED.inc(len(result.get('items', [])))
+        return events
+            
+    def _get_stored_events(self, minutes_ahead, on_partial=None):
+        """Sync incrementally, then answer the query from the local store."""
+        def on_page():
+            # Publish what is in the store after each page of a long (usually full) sync
+            on_partial(self._query_store(minutes_ahead))
+        
+        self.sync(on_page=on_page if on_partial is not None else None)
+        return self._query_store(minutes_ahead)
+        
+    def get_cached_events(self, minutes_ahead=5):
+        """Return the last-known upcoming events from the store without network access.
+        
+        Returns:
+            tuple: (events, last_synced) where last_synced is the datetime of the
+                   last successful sync, or None if there never was one.
+        """
+        if self.store is None:
+            return [], None
+        events = self._query_store(minutes_ahead, offline=True)
+        synced_at = self.store.last_synced_at()
+        last_synced = datetime.fromtimestamp(synced_at) if synced_at else None
+        return events, last_synced
+        
+    def _query_store(self, minutes_ahead, offline=False):
+        """Read the upcoming events of the selected calendars from the store."""
+        now = datetime.now(self.timezone)
+        time_max = now + timedelta(minutes=minutes_ahead)
+        started = time.monotonic()
+        parsed = 0
+        upcoming = []
+        stored = self.store.iter_events_between(
+            now.timestamp(),
+            time_max.timestamp(),
+            self.get_selected_calendar_ids(offline=offline)
+        )
+        for calendar_id, event in stored:
+            parsed += 1
+            start_time, end_time = self._parse_times(event)
+            # Same rule as the windowed query: short windows only include events about to start
+            if minutes_ahead <= 5 and not (now < start_time <= time_max):
+                continue
+            upcoming.append(self._parse_event(event, calendar_id, start_time, end_time))
+        PARSE_SECONDS.observe(time.monotonic() - started, source='store')
+        EVENTS_PARSED.inc(parsed)
+        
+        return self._dedupe(upcoming)
+        
+    def _dedupe(self, events):
+        """Drop copies of the same meeting that appear on several calendars."""
+        seen = set()
+        unique = []
+        for event in events:
+            if event.id not in seen:
+                seen.add(event.id)
+                unique.append(event)
+        return unique
+        
+    def _handle_http_error(self, error):
+        """Log and re-raise a Calendar API error."""
+        logger.error(f"Failed to fetch calendar events: {error}")
+        if error.resp.status == 401:
+            # Handle authentication errors
+            raise Exception("Calendar access unauthorized. Please sign in again.")
+        raise error 
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""Compact event model used by the notifier and the UI."""
+from datetime import datetime
+
+# Event resource fields the notifier reads; requested with fields= so responses stay small
+EVENT_FIELDS = (
+    'id,etag,status,summary,description,location,start,end,hangoutLink,'
+    'conferenceData(conferenceSolution/name,entryPoints(entryPointType,uri)),'
+    'organizer/email'
+)
+# Partial response mask for events.list; the collection etag enables conditional requests
+LIST_FIELDS = f'etag,items({EVENT_FIELDS}),nextPageToken,nextSyncToken'
+
+def parse_event_time(value, timezone):
+    """Parse an event start/end value into a timezone-aware datetime.
+
+    Args:
+        value (dict): The 'start' or 'end' of an event resource, holding either
+                      an RFC 3339 'dateTime' or an all-day 'date'.
+        timezone: pytz timezone applied to all-day and naive values.
+    """
+    text = value.get('dateTime') or value['date']
+    if text.endswith('Z'):
+        # fromisoformat only accepts 'Z' from Python 3.11 on
+        text = text[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = timezone.localize(parsed)
+    return parsed
+
+class Event:
+    """A calendar event reduced to what notifications and the meetings list show."""
+
+    __slots__ = (
+        'id', 'calendar_id', 'summary', 'start_time', 'end_time', 'description',
+        'location', 'meeting_link', 'meeting_provider', 'organizer'
+    )
+
+    def __init__(self, id, calendar_id, summary, start_time, end_time, description='',
+                 location='', meeting_link=None, meeting_provider=None, organizer=''):
+        """Create an event; start_time and end_time are timezone-aware datetimes."""
+        self.id = id
+        self.calendar_id = calendar_id
+        self.summary = summary
+        self.start_time = start_time
+        self.end_time = end_time
+        self.description = description
+        self.location = location
+        self.meeting_link = meeting_link
+        self.meeting_provider = meeting_provider
+        self.organizer = organizer
+
+    def _key(self):
+        """The fields that make two events the same version of a meeting."""
+        return (
+            self.id, self.calendar_id, self.summary, self.start_time, self.end_time,
+            self.description, self.location, self.meeting_link, self.meeting_provider,
+            self.organizer
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # Mutable and compared by value
+
+    def __repr__(self):
+        return f"Event(id={self.id!r}, summary={self.summary!r}, start_time={self.start_time.isoformat()})"
@@ -0,0 +1,58 @@
+"""In-memory, time-indexed cache of upcoming events."""
+from bisect import bisect_left, bisect_right
+
+class EventCache:
+    """Events sorted by start time, answering range queries with bisect.
+
+    The cache is filled from a single sync and read by both the notification
+    check and the "Today's Meetings" list, so neither needs network access.
+    It is only touched from the GTK main loop.
+    """
+
+    def __init__(self):
+        """Create an empty cache."""
+        self._events = []
+        self._starts = []  # Start timestamps, parallel to _events
+        self._by_id = {}
+        self._max_duration = 0
+
+    def replace(self, events):
+        """Replace the cached events with a freshly synced list."""
+        self._events = sorted(events, key=lambda event: event.start_time)
+        self._starts = [event.start_time.timestamp() for event in self._events]
+        self._by_id = {event.id: event for event in self._events}
+        self._max_duration = max(
+            (self._duration(event) for event in self._events),
+            default=0
+        )
+
+    def overlapping(self, start, end):
+        """Return events in progress at start or starting no later than end."""
+        start_ts = start.timestamp()
+        # No event can still be running if it started more than the longest duration ago
+        lo = bisect_left(self._starts, start_ts - self._max_duration)
+        hi = bisect_right(self._starts, end.timestamp())
+        return [
+            event for event in self._events[lo:hi]
+            if event.end_time.timestamp() > start_ts or event.start_time.timestamp() >= start_ts
+        ]
+
+    def next_start(self, after):
+        """Return the start time of the first event starting after a datetime, or None."""
+        index = bisect_right(self._starts, after.timestamp())
+        return self._events[index].start_time if index < len(self._events) else None
+
+    def get(self, event_id):
+        """Return the cached event with the given id, or None."""
+        return self._by_id.get(event_id)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __iter__(self):
+        return iter(self._events)
+
+    @staticmethod
+    def _duration(event):
+        """Length of an event in seconds."""
+        return event.end_time.timestamp() - event.start_time.timestamp()
@@ -0,0 +1,197 @@
+"""Persistent local store for calendar events and sync tokens."""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS events_by_start ON events (start_ts);
+CREATE TABLE IF NOT EXISTS sync_state (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS calendar_list (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+class EventStore:
+    """SQLite-backed store of raw calendar events keyed by calendar and event id.
+
+    The store keeps the Calendar API's nextSyncToken per calendar so that each
+    poll only has to fetch changed or cancelled events.
+    """
+
+    def __init__(self, path=None):
+        """Open (and create if needed) the event database."""
+        self.path = path or os.path.expanduser('~/.config/meeting-notifier/events.db')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # The store is created on the main thread but used by the fetch worker
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get_sync_token(self, calendar_id):
+        """Return the stored sync token for a calendar, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT sync_token FROM sync_state WHERE calendar_id = ?',
+                (calendar_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def apply_changes(self, calendar_id, upserts, deleted_ids):
+        """Insert or replace changed events and remove cancelled ones.
+
+        Args:
+            calendar_id (str): Calendar the changes belong to.
+            upserts (list): (event_id, start_ts, end_ts, event_resource) tuples.
+            deleted_ids (list): Ids of cancelled events.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO events (calendar_id, event_id, start_ts, end_ts, data) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [
+                    (calendar_id, event_id, start_ts, end_ts, json.dumps(event))
+                    for event_id, start_ts, end_ts, event in upserts
+                ]
+            )
+            self._conn.executemany(
+                'DELETE FROM events WHERE calendar_id = ? AND event_id = ?',
+                [(calendar_id, event_id) for event_id in deleted_ids]
+            )
+
+    def save_sync_token(self, calendar_id, sync_token):
+        """Remember the token to use for the next incremental sync."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (calendar_id, sync_token, synced_at) '
+                'VALUES (?, ?, ?)',
+                (calendar_id, sync_token, time.time())
+            )
+
+    def last_synced_at(self):
+        """Return the timestamp of the most recent successful sync, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT MAX(synced_at) FROM sync_state').fetchone()
+        return row[0] if row else None
+
+    def finish_full_sync(self, calendar_id, seen_ids, sync_token):
+        """Complete a full resync of a calendar once its last page has been applied.
+
+        The pages of a full sync are upserted over the calendar's existing rows,
+        so the last-known schedule stays usable if the sync fails partway. Only
+        here are the rows the full sync did not return dropped, in the same
+        transaction that saves its sync token.
+
+        Args:
+            calendar_id (str): Calendar that was resynced.
+            seen_ids (set): Ids of all events the full sync returned.
+            sync_token (str): nextSyncToken from the last page.
+        """
+        with self._lock, self._conn:
+            stored_ids = [
+                row[0] for row in self._conn.execute(
+                    'SELECT event_id FROM events WHERE calendar_id = ?', (calendar_id,)
+                )
+            ]
+            self._conn.executemany(
+                'DELETE FROM events WHERE calendar_id = ? AND event_id = ?',
+                [(calendar_id, event_id) for event_id in stored_ids if event_id not in seen_ids]
+            )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (calendar_id, sync_token, synced_at) '
+                'VALUES (?, ?, ?)',
+                (calendar_id, sync_token, time.time())
+            )
+
+    def iter_events_between(self, start_ts, end_ts, calendar_ids, chunk_size=200):
+        """Yield (calendar_id, raw event) pairs of the given calendars.
+
+        Only events that have not ended by start_ts and begin no later than
+        end_ts are returned, ordered by start time. Rows are read in chunks so
+        large ranges never have to be held in memory at once.
+        """
+        placeholders = ', '.join('?' * len(calendar_ids))
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT calendar_id, data FROM events '
+                f'WHERE end_ts > ? AND start_ts <= ? AND calendar_id IN ({placeholders}) '
+                'ORDER BY start_ts',
+                (start_ts, end_ts, *calendar_ids)
+            )
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for calendar_id, data in rows:
+                yield calendar_id, json.loads(data)
+
+    def get_calendars(self):
+        """Return the cached calendar list and when it was fetched, or (None, 0)."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, fetched_at FROM calendar_list WHERE id = 1'
+            ).fetchone()
+        if row is None:
+            return None, 0
+        return json.loads(row[0]), row[1]
+
+    def save_calendars(self, calendars):
+        """Cache the calendar list."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO calendar_list (id, data, fetched_at) VALUES (1, ?, ?)',
+                (json.dumps(calendars), time.time())
+            )
+
+    def get_metadata(self, key):
+        """Return a stored value and when it was saved, or (None, 0)."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, updated_at FROM metadata WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None, 0
+        return row[0], row[1]
+
+    def set_metadata(self, key, value):
+        """Store a small string value, such as the user's timezone."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO metadata (key, value, updated_at) VALUES (?, ?, ?)',
+                (key, value, time.time())
+            )
+
+    def prune(self, before_ts):
+        """Drop events that ended before the given timestamp."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM events WHERE end_ts < ?', (before_ts,))
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
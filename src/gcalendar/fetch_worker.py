@@ -0,0 +1,200 @@
+"""Background worker that runs calendar fetches off the GTK main loop."""
+from gi.repository import GLib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class CalendarFetchWorker:
+    """Owns the CalendarSync service and fetches events on a background thread.
+
+    Requests are coalesced: asking for the same window while a fetch for it is
+    still pending only adds the callback to the pending request. Callbacks are
+    always invoked on the GTK main loop through GLib.idle_add, so the worker
+    thread never touches GTK.
+
+    The CalendarSync itself is created on the worker thread, so authentication
+    and building the API client never delay the tray icon; requests made in
+    the meantime are queued and served once it exists.
+    """
+
+    def __init__(self, calendar_factory, on_ready=None):
+        """Start the worker thread.
+
+        Args:
+            calendar_factory (callable): Returns the CalendarSync to use; called
+                                         once on the worker thread.
+            on_ready (callable): Optional. Called on the main loop as
+                                 on_ready(error) once the factory has run; error
+                                 is None on success. The worker stops on error.
+        """
+        self.calendar = None
+        self._calendar_factory = calendar_factory
+        self._on_ready = on_ready
+        self._calendar_ids = None
+        self._condition = threading.Condition()
+        self._pending = {}  # request key -> (function, callbacks, partial callbacks)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name='calendar-fetch',
+            daemon=True
+        )
+        self._thread.start()
+
+    def request_events(self, minutes_ahead, callback, on_partial=None):
+        """Queue a fetch of upcoming events.
+
+        Args:
+            minutes_ahead (int): Window passed to CalendarSync.get_upcoming_events.
+            callback (callable): Called on the main loop as callback(events, error),
+                                 where exactly one of the two is None.
+            on_partial (callable): Optional. Called on the main loop with the events
+                                   received so far while a long fetch is still
+                                   downloading further pages.
+        """
+        def fetch(partial_callbacks):
+            def publish(events):
+                for partial_callback in partial_callbacks:
+                    GLib.idle_add(self._deliver_partial, partial_callback, events)
+
+            return self.calendar.get_upcoming_events(
+                minutes_ahead=minutes_ahead,
+                on_partial=publish if partial_callbacks else None
+            )
+
+        self._submit(('events', minutes_ahead), fetch, callback, on_partial)
+
+    def request_cached_events(self, minutes_ahead, callback):
+        """Queue a read of the last-known events from the local store.
+
+        Args:
+            minutes_ahead (int): Window passed to CalendarSync.get_cached_events.
+            callback (callable): Called on the main loop as
+                                 callback((events, last_synced), error).
+        """
+        self._submit(
+            ('cached', minutes_ahead),
+            lambda _: self.calendar.get_cached_events(minutes_ahead=minutes_ahead),
+            callback
+        )
+
+    def request_calendars(self, callback):
+        """Queue a lookup of the user's calendar list.
+
+        Args:
+            callback (callable): Called on the main loop as callback(calendars, error).
+        """
+        self._submit(('calendars',), lambda _: self.calendar.list_calendars(), callback)
+
+    def request_recreate(self, callback):
+        """Queue running the calendar factory again, e.g. to sign in after a revoked token.
+
+        Args:
+            callback (callable): Called on the main loop as callback(None, error).
+        """
+        def recreate(_):
+            calendar = self._calendar_factory()
+            with self._condition:
+                calendar.set_calendar_ids(self._calendar_ids)
+                self.calendar = calendar
+
+        self._submit(('recreate',), recreate, callback)
+
+    def set_calendar_ids(self, calendar_ids):
+        """Change the calendars fetched by subsequent requests."""
+        with self._condition:
+            self._calendar_ids = calendar_ids
+            if self.calendar is not None:
+                self.calendar.set_calendar_ids(calendar_ids)
+
+    def _submit(self, key, function, callback, on_partial=None):
+        """Queue a call, merging it with an identical pending one.
+
+        The function is called on the worker thread with the list of partial
+        result callbacks of all merged requests.
+        """
+        with self._condition:
+            _, callbacks, partial_callbacks = self._pending.setdefault(key, (function, [], []))
+            if callback not in callbacks:
+                callbacks.append(callback)
+            if on_partial is not None and on_partial not in partial_callbacks:
+                partial_callbacks.append(on_partial)
+            self._condition.notify()
+
+    def stop(self):
+        """Stop the worker thread once the current fetch completes."""
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify()
+            calendar = self.calendar
+        # The daemon thread may not get to finish, so save the calendar's state now
+        if calendar is not None:
+            calendar.close()
+
+    def _create_calendar(self):
+        """Run the calendar factory; return False if the worker cannot continue."""
+        error = None
+        try:
+            calendar = self._calendar_factory()
+            with self._condition:
+                calendar.set_calendar_ids(self._calendar_ids)
+                self.calendar = calendar
+        except Exception as e:
+            logger.error(f"Failed to set up calendar access: {e}")
+            error = e
+            with self._condition:
+                self._running = False
+                self._pending.clear()
+        if self._on_ready is not None:
+            GLib.idle_add(self._deliver_ready, error)
+        return error is None
+
+    def _run(self):
+        """Worker loop: take one pending request at a time and run it."""
+        if not self._create_calendar():
+            return
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                # Serve requests in the order they were first made
+                key = next(iter(self._pending))
+                function, callbacks, partial_callbacks = self._pending.pop(key)
+
+            result, error = None, None
+            try:
+                result = function(partial_callbacks)
+            except Exception as e:
+                logger.error(f"Background fetch failed: {e}")
+                error = e
+
+            for callback in callbacks:
+                GLib.idle_add(self._deliver, callback, result, error)
+
+    def _deliver_ready(self, error):
+        """Run the on_ready callback on the main loop."""
+        try:
+            self._on_ready(error)
+        except Exception as e:
+            logger.error(f"Error in calendar ready callback: {e}")
+        return False  # Run once
+
+    def _deliver_partial(self, callback, events):
+        """Run a partial result callback on the main loop."""
+        try:
+            callback(events)
+        except Exception as e:
+            logger.error(f"Error in partial fetch callback: {e}")
+        return False  # Run once
+
+    def _deliver(self, callback, result, error):
+        """Run a callback on the main loop."""
+        try:
+            callback(result, error)
+        except Exception as e:
+            logger.error(f"Error in fetch callback: {e}")
+        return False  # Run once
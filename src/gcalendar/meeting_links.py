@@ -0,0 +1,78 @@
+"""Meeting link detection for calendar events."""
+from collections import OrderedDict
+import html
+import re
+from metrics.registry import CACHE_LOOKUPS
+
+# Number of (event id, etag) results kept in memory
+CACHE_SIZE = 1024
+
+# Characters that end a URL inside plain text or HTML descriptions
+_URL_TAIL = r'[^\s"\'<>]*'
+
+# One alternation with a named group per provider, so a description is scanned once
+_PROVIDERS = [
+    ('zoom', 'Zoom', r'https://(?:[\w-]+\.)*zoom(?:gov)?\.(?:us|com)/(?:j|my|w|s)/' + _URL_TAIL),
+    ('meet', 'Google Meet', r'https://meet\.google\.com/[a-z]{3}-[a-z]{4}-[a-z]{3}'),
+    ('teams', 'Microsoft Teams', r'https://teams\.(?:microsoft|live)\.com/(?:l/meetup-join|meet)/' + _URL_TAIL),
+    ('webex', 'Webex', r'https://[\w-]+\.webex\.com/' + _URL_TAIL),
+    ('jitsi', 'Jitsi Meet', r'https://meet\.jit\.si/' + _URL_TAIL),
+    ('whereby', 'Whereby', r'https://whereby\.com/' + _URL_TAIL),
+    ('goto', 'GoTo Meeting', r'https://(?:global\.gotomeeting\.com/join|meet\.goto\.com)/' + _URL_TAIL),
+    ('chime', 'Amazon Chime', r'https://chime\.aws/\d+'),
+    # Zoom rooms on company vanity domains (the pattern the notification window used to scan for)
+    ('zoom_vanity', 'Zoom', r'https://[\w.-]+/j/\d+(?:\?' + _URL_TAIL + r')?'),
+]
+_PATTERN = re.compile('|'.join(f'(?P<{key}>{pattern})' for key, _, pattern in _PROVIDERS))
+_PROVIDER_NAMES = {key: name for key, name, _ in _PROVIDERS}
+
+_cache = OrderedDict()
+
+def find_meeting_link(text):
+    """Return the first meeting link in a block of text as (url, provider), or (None, None)."""
+    if not text:
+        return None, None
+    match = _PATTERN.search(text)
+    if match is None:
+        return None, None
+    url = html.unescape(match.group()).rstrip('.,;:)]')
+    return url, _PROVIDER_NAMES[match.lastgroup]
+
+def _conference_link(event):
+    """Return the video entry point of the event's conference data as (url, provider)."""
+    conference = event.get('conferenceData', {})
+    for entry in conference.get('entryPoints', []):
+        if entry.get('entryPointType') == 'video' and entry.get('uri'):
+            provider = conference.get('conferenceSolution', {}).get('name')
+            return entry['uri'], provider or find_meeting_link(entry['uri'])[1]
+    if event.get('hangoutLink'):
+        return event['hangoutLink'], 'Google Meet'
+    return None, None
+
+def extract_meeting_link(event):
+    """Return the join link of an event resource as (url, provider), or (None, None).
+
+    Conference data attached to the event is preferred; otherwise the location
+    and then the description are searched. Results are cached per event id and
+    etag, so an unchanged event is never rescanned.
+    """
+    key = (event.get('id'), event.get('etag'))
+    if key[1] is not None:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            CACHE_LOOKUPS.inc(cache='meeting_link', result='hit')
+            return cached
+        CACHE_LOOKUPS.inc(cache='meeting_link', result='miss')
+
+    result = _conference_link(event)
+    if result[0] is None:
+        result = find_meeting_link(event.get('location'))
+    if result[0] is None:
+        result = find_meeting_link(event.get('description'))
+
+    if key[1] is not None:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
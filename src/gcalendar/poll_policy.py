@@ -0,0 +1,73 @@
+"""Choosing when to poll the Calendar API next."""
+from datetime import datetime, timedelta
+
+# Policies selectable in settings
+ADAPTIVE = 'adaptive'
+FIXED = 'fixed'
+
+# Shortest interval between polls, in seconds
+MIN_INTERVAL = 60
+# Poll every minute from this long before a known meeting starts
+IMMINENT_WINDOW = timedelta(minutes=15)
+# Longest interval when nothing is scheduled soon, during the day and at night
+IDLE_INTERVAL = 15 * 60
+QUIET_INTERVAL = 30 * 60
+# Local hours considered night; polls are sparsest then
+QUIET_START_HOUR = 22
+QUIET_END_HOUR = 7
+
+class PollPolicy:
+    """Picks the delay until the next calendar poll from the cached schedule.
+
+    The adaptive policy polls every minute while a meeting is about to start,
+    so late changes and cancellations are picked up before the notification.
+    Otherwise it sleeps until that window opens, but no longer than fifteen
+    minutes (thirty at night), which still catches meetings added at short
+    notice. The fixed policy polls at a constant interval.
+    """
+
+    def __init__(self, policy=ADAPTIVE, interval_minutes=1):
+        """Create a policy; interval_minutes is used by the fixed policy."""
+        self.policy = policy if policy in (ADAPTIVE, FIXED) else ADAPTIVE
+        self.interval = max(MIN_INTERVAL, int(interval_minutes * 60))
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Create the policy configured in the settings store."""
+        return cls(settings['poll_policy'], settings['poll_interval_minutes'])
+
+    def __eq__(self, other):
+        if not isinstance(other, PollPolicy):
+            return NotImplemented
+        return (self.policy, self.interval) == (other.policy, other.interval)
+
+    __hash__ = None
+
+    def next_interval(self, event_cache, synced=True, now=None):
+        """Return (seconds, reason) until the next poll.
+
+        Args:
+            event_cache (EventCache): The current schedule.
+            synced (bool): Whether the schedule was ever synced; until it is,
+                           it says nothing about when meetings are.
+            now (datetime): Timezone-aware current time; defaults to now.
+        """
+        if self.policy == FIXED:
+            return self.interval, "fixed interval"
+        if not synced:
+            return MIN_INTERVAL, "waiting for first sync"
+
+        now = now or datetime.now().astimezone()
+        quiet = now.hour >= QUIET_START_HOUR or now.hour < QUIET_END_HOUR
+        longest = QUIET_INTERVAL if quiet else IDLE_INTERVAL
+        next_start = event_cache.next_start(now)
+        if next_start is None:
+            return longest, "quiet hours" if quiet else "no upcoming meetings"
+
+        until_window = (next_start - IMMINENT_WINDOW - now).total_seconds()
+        if until_window <= 0:
+            return MIN_INTERVAL, "meeting starting soon"
+        if until_window < longest:
+            # Wake up when the next meeting's imminent window opens
+            return max(MIN_INTERVAL, int(until_window)), "waiting for next meeting"
+        return longest, "quiet hours" if quiet else "next meeting is far off"
@@ -0,0 +1,211 @@
+"""Retry, circuit breaker and quota accounting for Calendar API calls."""
+from datetime import datetime
+from googleapiclient.errors import HttpError
+from google.auth.exceptions import TransportError
+import json
+import logging
+import os
+import random
+import threading
+import time
+import pytz
+from storage.atomic_file import write_atomic
+from metrics.registry import get_metrics
+
+logger = logging.getLogger(__name__)
+
+RETRIES = get_metrics().counter(
+    'meeting_notifier_api_retries_total', "Calendar API calls retried after a transient failure"
+)
+CIRCUIT_OPEN = get_metrics().gauge(
+    'meeting_notifier_api_circuit_open', "1 while the circuit breaker refuses Calendar API calls"
+)
+API_CALLS_TODAY = get_metrics().gauge(
+    'meeting_notifier_api_calls_today', "Calendar API calls counted against today's quota"
+)
+
+# Calendar API error reasons that mean "slow down" rather than "this request is wrong"
+RATE_LIMIT_REASONS = (b'rateLimitExceeded', b'userRateLimitExceeded', b'quotaExceeded')
+# API calls per day before QuotaCounter warns; Google resets quotas at midnight Pacific time
+DEFAULT_DAILY_BUDGET = 10000
+QUOTA_TIMEZONE = pytz.timezone('America/Los_Angeles')
+# Seconds between writes of the quota count; it only needs to be roughly right
+QUOTA_SAVE_INTERVAL = 600
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+    def __init__(self, retry_in):
+        super().__init__(f"Calendar API paused after repeated failures; retrying in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+class RetryPolicy:
+    """Retries transient API failures with exponential backoff and jitter.
+
+    Transient means HTTP 429, 5xx, a 403 carrying a rate-limit reason, or a
+    network error. A Retry-After header from the server takes precedence over
+    the computed delay.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=30.0):
+        """Configure the number of attempts and the delay bounds in seconds."""
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, error):
+        """Whether an error is worth retrying later."""
+        if isinstance(error, HttpError):
+            status = error.resp.status
+            if status == 429 or status >= 500:
+                return True
+            return status == 403 and any(reason in (error.content or b'') for reason in RATE_LIMIT_REASONS)
+        return isinstance(error, (TransportError, OSError))
+
+    def delay(self, attempt, error=None):
+        """Seconds to wait before retry number attempt + 1."""
+        if isinstance(error, HttpError):
+            retry_after = error.resp.get('retry-after')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_delay)
+        # Equal jitter: half of the exponential step plus a random share of the other half
+        step = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return step / 2 + random.uniform(0, step / 2)
+
+    def call(self, function):
+        """Call function(), retrying transient failures; re-raises the last error."""
+        for attempt in range(self.max_attempts):
+            try:
+                return function()
+            except Exception as error:
+                if attempt + 1 >= self.max_attempts or not self.is_retryable(error):
+                    raise
+                delay = self.delay(attempt, error)
+                RETRIES.inc()
+                logger.warning(f"Calendar API call failed ({error}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+class CircuitBreaker:
+    """Stops calling the API after repeated transient failures.
+
+    After failure_threshold consecutive failed polls the circuit opens and
+    calls fail fast with CircuitOpenError, so the app serves its cached
+    schedule instead of hammering a rate-limited or unavailable API. The
+    caller records one success or failure per poll, not per API call, since
+    a poll makes several calls. Once the reset timeout passes, one poll is
+    let through; if it fails too, the timeout doubles up to max_reset_timeout.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60, max_reset_timeout=1800):
+        """Configure the breaker; timeouts are in seconds."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._timeout = reset_timeout
+
+    @property
+    def is_open(self):
+        """Whether calls are currently being refused."""
+        return self._opened_at is not None and self.retry_in > 0
+
+    @property
+    def retry_in(self):
+        """Seconds until the next call is allowed through."""
+        if self._opened_at is None:
+            return 0
+        return max(0, self._opened_at + self._timeout - time.monotonic())
+
+    def check(self):
+        """Raise CircuitOpenError if calls are currently refused."""
+        if self.is_open:
+            raise CircuitOpenError(self.retry_in)
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        if self._opened_at is not None:
+            logger.info("Calendar API reachable again, resuming normal polling")
+        self._failures = 0
+        self._opened_at = None
+        self._timeout = self.reset_timeout
+        CIRCUIT_OPEN.set(0)
+
+    def record_failure(self):
+        """Count a transient failure, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._opened_at is not None:
+            # The trial call after the timeout failed as well
+            self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+        elif self._failures < self.failure_threshold:
+            return
+        self._opened_at = time.monotonic()
+        CIRCUIT_OPEN.set(1)
+        logger.warning(f"Calendar API failing repeatedly, pausing calls for {self._timeout}s")
+
+class QuotaCounter:
+    """Counts API calls per quota day and warns when nearing the daily budget.
+
+    The count is persisted, so restarts during the day do not reset it. It is
+    written lazily: when the quota day changes, when a warning threshold is
+    crossed, at most every save_interval seconds otherwise, and on flush().
+    """
+
+    def __init__(self, path=None, daily_budget=DEFAULT_DAILY_BUDGET, warn_ratio=0.8,
+                 save_interval=QUOTA_SAVE_INTERVAL):
+        """Load today's count."""
+        self.path = path or os.path.expanduser('~/.config/meeting-notifier/api_quota.json')
+        self.daily_budget = daily_budget
+        self.warn_ratio = warn_ratio
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._saved_at = time.monotonic()
+        self._dirty = False
+        self.day = None
+        self.calls = 0
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self.day, self.calls = data['day'], data['calls']
+        except Exception as e:
+            logger.error(f"Error loading API quota counter: {e}")
+
+    def add(self, calls=1):
+        """Record API calls made now."""
+        with self._lock:
+            today = datetime.now(QUOTA_TIMEZONE).date().isoformat()
+            save = today != self.day
+            if save:
+                self.day, self.calls = today, 0
+            before = self.calls
+            self.calls += calls
+            self._dirty = True
+            API_CALLS_TODAY.set(self.calls)
+            for limit, message in (
+                (self.daily_budget * self.warn_ratio, "nearing"),
+                (self.daily_budget, "over")
+            ):
+                if before < limit <= self.calls:
+                    save = True
+                    logger.warning(
+                        f"Calendar API usage {message} the daily budget: "
+                        f"{self.calls} of {self.daily_budget} calls today"
+                    )
+            if save or time.monotonic() - self._saved_at >= self.save_interval:
+                self._save()
+
+    def flush(self):
+        """Write the count if it changed since the last write, e.g. on shutdown."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self):
+        """Write the count; called with the lock held."""
+        try:
+            write_atomic(self.path, json.dumps({'day': self.day, 'calls': self.calls}))
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving API quota counter: {e}")
+        self._saved_at = time.monotonic()
@@ -7,11 +7,11 @@ gi.require_version('AyatanaAppIndicator3', '0.1')
 from gi.repository import Gtk, GLib, Notify, AyatanaAppIndicator3 as AppIndicator, Gdk
 import signal
 import sys
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 import logging
 import os
-import json
-import pytz
+import time
 import webbrowser
 from .version import VERSION
 from .update_checker import UpdateChecker
@@ -21,8 +21,19 @@ os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Add the current directory to Python path
 sys.path.insert(0, os.getcwd())
 
-from auth.google_auth import GoogleAuth
-from gcalendar.calendar_sync import CalendarSync
+from gcalendar.event_cache import EventCache
+from gcalendar.event_store import EventStore
+from gcalendar.fetch_worker import CalendarFetchWorker
+from gcalendar.poll_policy import PollPolicy
+from metrics.exporter import MetricsExporter
+from metrics.registry import get_metrics
+from storage.dismissal_store import DismissalStore
+from storage.settings_store import get_settings
+from storage.snooze_store import SnoozeStore
+from notification.resume_monitor import watch_resume
+from notification.scheduler import NotificationScheduler
+from notification.sound import get_sound_player
+from ui.agenda_model import AgendaModel
 from ui.notification_window import NotificationWindow
 from ui.settings_window import SettingsWindow
 
@@ -33,6 +44,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# A single sync covers the next 24 hours; notifications and the agenda both read from it
+SYNC_WINDOW_MINUTES = 1440
+# Build the notification windows this many seconds before they are shown
+PREPARE_AHEAD_SECONDS = 30
+# Opening the meetings window polls unless the last poll is more recent than this
+AGENDA_POLL_MIN_AGE = 30
+
+POLL_INTERVAL = get_metrics().gauge(
+    'meeting_notifier_poll_interval_seconds', "Delay until the next calendar poll chosen by the poll policy"
+)
+SYNCS = get_metrics().counter(
+    'meeting_notifier_syncs_total', "Completed calendar polls by result (ok or error)"
+)
+
+def create_calendar(on_revoked=None):
+    """Authenticate and build the calendar client; runs on the fetch worker thread.
+    
+    on_revoked is called from the token refresh thread if the sign-in stops working.
+    """
+    # Imported here: the Google client libraries are slow to import and not
+    # needed to show the tray icon
+    from gcalendar.calendar_sync import CalendarSync
+    
+    api_endpoint = os.environ.get('MEETING_NOTIFIER_API_ENDPOINT') or get_settings()['api_endpoint']
+    if api_endpoint:
+        # A local stand-in such as tools/fake_calendar_server.py: no sign-in, and its
+        # events are kept apart from the real schedule
+        from google.auth.credentials import AnonymousCredentials
+        logger.info(f"Using Calendar API endpoint {api_endpoint}")
+        store = EventStore(os.path.expanduser('~/.config/meeting-notifier/test_events.db'))
+        return CalendarSync(AnonymousCredentials(), store=store, api_endpoint=api_endpoint)
+    
+    from auth.google_auth import GoogleAuth
+    credentials = GoogleAuth().authenticate(on_revoked)
+    return CalendarSync(credentials, store=EventStore())
+
 class MeetingNotifier:
     """Main application class."""
     
@@ -41,103 +88,89 @@ class MeetingNotifier:
         # Initialize notifications
         Notify.init("Meeting Notifier")
         
-        self.auth = GoogleAuth()
-        try:
-            credentials = self.auth.authenticate()
-            self.calendar = CalendarSync(credentials)
-        except Exception as e:
-            logger.error(f"Failed to authenticate: {e}")
-            sys.exit(1)
-            
+        # Show the tray icon before any slow start-up work
+        self.indicator = AppIndicator.Indicator.new(
+            "meeting-notifier",
+            "appointment-soon",
+            AppIndicator.IndicatorCategory.APPLICATION_STATUS
+        )
+        self.indicator.set_status(AppIndicator.IndicatorStatus.ACTIVE)
+        # Usable right away; the full menu replaces it once start-up is done
+        self.create_startup_menu()
+        self.exit_status = 0
+        
+        # Load settings once, before the worker thread reads them; windows share the
+        # same store and it follows file changes
+        self.settings = get_settings()
+        self.settings.watch()
+        self.settings.connect_changed(self.on_settings_changed)
+        
+        # The worker authenticates, builds the calendar service and runs all API calls on its thread
+        self.fetch_worker = CalendarFetchWorker(
+            lambda: create_calendar(self.on_sign_in_revoked),
+            on_ready=self.on_calendar_ready
+        )
+        
+        self.event_cache = EventCache()
+        self.last_synced = None
+        self.offline = False  # True while syncing fails and the last-known schedule is used
         self.active_notifications = {}
-        self.dismissed_events = set()  # Track dismissed event IDs
+        self.prepared_notifications = {}  # Hidden windows built ahead of their trigger
         self.settings_window = None
+        self.calendars = None  # Calendar list from the last lookup, shown in the settings window
         
-        # Initialize update checker
+        # Initialize update checker; checks run on their own thread
         self.update_checker = UpdateChecker()
-        
-        # Load settings
-        self.settings_file = os.path.expanduser('~/.config/meeting-notifier/settings.json')
-        self.dismissed_events_file = os.path.expanduser('~/.config/meeting-notifier/dismissed_events.json')
-        self.load_settings()
-        self.load_dismissed_events()
+        self.update_thread = None
+        
+        # Dismissed event ids with their dismissal time; expire after 24 hours
+        self.dismissed_events = DismissalStore()
+        self.calendar_ids = self.settings['calendar_ids']
+        self.fetch_worker.set_calendar_ids(self.calendar_ids)
+        # metrics.prom and metrics.json for monitoring agents, if metrics_dir is set
+        self.metrics_exporter = MetricsExporter(get_metrics(), self.settings['metrics_dir'])
+        self.metrics_exporter.start()
+        # Polls are one-shot timers rescheduled from the cached schedule after each sync
+        self.poll_policy = PollPolicy.from_settings(self.settings)
+        self.poll_source = None
+        self.poll_interval = None
+        self.last_poll = 0
+        
+        # Detect the sound backend and decode the notification sound once the tray is up
+        GLib.idle_add(self.preload_sound)
+        
+        # Fire notifications at each meeting's start time minus the configured lead time
+        self.scheduler = NotificationScheduler(
+            self.show_notification,
+            lead_time=self.settings['notification_lead_minutes'] * 60,
+            prepare_callback=self.prepare_notification,
+            prepare_ahead=PREPARE_AHEAD_SECONDS,
+            snooze_store=SnoozeStore()
+        )
+        # Timers stop during suspend; re-arm them and sync once the system wakes up
+        watch_resume(self.on_resume)
         
         # Create today's meetings window
         self.create_meetings_window()
         
-        # Create app indicator
-        self.indicator = AppIndicator.Indicator.new(
-            "meeting-notifier",
-            "appointment-soon",
-            AppIndicator.IndicatorCategory.APPLICATION_STATUS
-        )
-        self.indicator.set_status(AppIndicator.IndicatorStatus.ACTIVE)
-        
-        # Create menu
-        self.create_indicator_menu()
+        # Create the full menu once the main loop runs
+        GLib.idle_add(self.create_indicator_menu)
         
-        # Check for updates on startup
-        GLib.timeout_add_seconds(5, self.check_updates)
+        # Check for updates on startup (once; the timeout would otherwise repeat)
+        GLib.timeout_add_seconds(5, lambda: self.check_updates() and False)
         # Schedule periodic update checks (daily)
         GLib.timeout_add_seconds(24 * 60 * 60, self.check_updates)
         
-        # Start checking for meetings every minute
-        GLib.timeout_add_seconds(60, self.check_meetings)
-        # Do initial check
+        # Load the last-known schedule from disk so notifications work before (or without) a sync
+        self.fetch_worker.request_cached_events(SYNC_WINDOW_MINUTES, self.on_cached_events)
+        
+        # Do initial check; it schedules the following ones
         self.check_meetings()
         
         # Show meetings window on startup if launched from applications menu
         if os.environ.get('DESKTOP_STARTUP_ID'):
             self.show_meetings_window()
 
-    def load_settings(self):
-        """Load settings from file."""
-        self.settings = {
-            'background_color': 'rgba(0, 0, 0, 0.9)',
-            'background_image': '',
-            'notification_sound': '/usr/share/sounds/freedesktop/stereo/message.oga',  # Default system notification sound
-            'sound_enabled': True,  # Enable sound by default
-            'text_color': '#ffffff',
-            'button_color': '#4a4a4a',
-            'button_text_color': '#ffffff',
-            'opacity': 0.85
-        }
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    self.settings.update(json.load(f))
-        except Exception as e:
-            logger.error(f"Error loading settings: {e}")
-
-    def load_dismissed_events(self):
-        """Load dismissed events from file."""
-        try:
-            if os.path.exists(self.dismissed_events_file):
-                with open(self.dismissed_events_file, 'r') as f:
-                    data = json.load(f)
-                    # Filter out events older than 24 hours
-                    current_time = datetime.now().timestamp()
-                    self.dismissed_events = set(
-                        event_id for event_id, timestamp in data.items()
-                        if current_time - timestamp < 24 * 3600  # 24 hours in seconds
-                    )
-        except Exception as e:
-            logger.error(f"Error loading dismissed events: {e}")
-            self.dismissed_events = set()
-
-    def save_dismissed_events(self):
-        """Save dismissed events to file."""
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.dismissed_events_file), exist_ok=True)
-            # Save events with current timestamp
-            current_time = datetime.now().timestamp()
-            data = {event_id: current_time for event_id in self.dismissed_events}
-            with open(self.dismissed_events_file, 'w') as f:
-                json.dump(data, f)
-        except Exception as e:
-            logger.error(f"Error saving dismissed events: {e}")
-
     def create_meetings_window(self):
         """Create the window to display today's meetings."""
         self.meetings_window = Gtk.Window(title="Meeting Notifier")
@@ -327,17 +360,51 @@ class MeetingNotifier:
         self.meetings_list.set_vexpand(True)  # Allow vertical expansion
         self.meetings_list.set_hexpand(True)  # Allow horizontal expansion
         
+        # Rows are created per item and only touched when their event changes
+        self.agenda_model = AgendaModel()
+        self.meetings_list.bind_model(self.agenda_model.store, self.create_meeting_row)
+        
+        # Shown by the list box whenever the model is empty
+        placeholder = Gtk.Label()
+        placeholder.get_style_context().add_class('meeting-title')
+        placeholder.set_markup("No meetings today")
+        placeholder.set_margin_top(10)
+        placeholder.set_margin_bottom(10)
+        placeholder.show()
+        self.meetings_list.set_placeholder(placeholder)
+        
         scrolled.add(self.meetings_list)
         main_box.pack_start(scrolled, True, True, 0)
         
         # Add status label
         self.status_label = Gtk.Label()
         self.status_label.get_style_context().add_class('status-label')
-        self.status_label.set_markup("Checking for meetings every minute")
+        self.status_label.set_markup("Waiting for first sync")
         main_box.pack_start(self.status_label, False, False, 0)
         
         self.meetings_window.add(main_box)
         
+    def create_startup_menu(self):
+        """Attach a minimal menu to the tray icon while the application starts."""
+        menu = Gtk.Menu()
+        
+        settings_item = Gtk.MenuItem(label="Settings")
+        settings_item.connect("activate", self.show_settings)
+        menu.append(settings_item)
+        
+        self.sync_status_item = Gtk.MenuItem(label="Starting...")
+        self.sync_status_item.set_sensitive(False)
+        menu.append(self.sync_status_item)
+        
+        menu.append(Gtk.SeparatorMenuItem())
+        
+        quit_item = Gtk.MenuItem(label="Quit")
+        quit_item.connect("activate", self.quit_application)
+        menu.append(quit_item)
+        
+        menu.show_all()
+        self.indicator.set_menu(menu)
+        
     def create_indicator_menu(self):
         """Create the indicator menu."""
         menu = Gtk.Menu()
@@ -362,6 +429,11 @@ class MeetingNotifier:
         update_item.connect("activate", lambda _: self.check_updates(force=True))
         menu.append(update_item)
         
+        # Sync status item
+        self.sync_status_item = Gtk.MenuItem(label=self.sync_status_item.get_label())
+        self.sync_status_item.set_sensitive(False)  # Make it non-clickable
+        menu.append(self.sync_status_item)
+        
         # Version info item
         version_item = Gtk.MenuItem(label=f"Version: {VERSION}")
         version_item.set_sensitive(False)  # Make it non-clickable
@@ -376,86 +448,71 @@ class MeetingNotifier:
         
         menu.show_all()
         self.indicator.set_menu(menu)
+        return False  # Run once when scheduled with idle_add
         
     def show_meetings_window(self):
         """Show and update the meetings window."""
         self.update_meetings_list()
+        # The user is looking at the schedule; make sure it is current
+        if time.monotonic() - self.last_poll > AGENDA_POLL_MIN_AGE:
+            self.check_meetings()
         self.meetings_window.show_all()
         self.meetings_window.present()
         
     def update_meetings_list(self):
-        """Update the list of today's meetings."""
-        # Remove existing items
-        for child in self.meetings_list.get_children():
-            self.meetings_list.remove(child)
-            
+        """Bring the list of today's meetings in line with the event cache."""
         try:
-            # Get today's meetings (24 hours ahead)
-            events = self.calendar.get_upcoming_events(minutes_ahead=1440)  # 24 hours
-            
-            if not events:
-                # Show "No meetings today" message
-                row = Gtk.ListBoxRow()
-                box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-                box.set_margin_top(10)
-                box.set_margin_bottom(10)
-                box.set_margin_start(10)
-                box.set_margin_end(10)
-                
-                label = Gtk.Label()
-                label.get_style_context().add_class('meeting-title')
-                label.set_markup("No meetings today")
-                box.pack_start(label, True, True, 0)
-                
-                row.add(box)
-                self.meetings_list.add(row)
-            else:
-                # Add each meeting to the list
-                for event in events:
-                    row = Gtk.ListBoxRow()
-                    box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-                    box.set_margin_top(10)
-                    box.set_margin_bottom(10)
-                    box.set_margin_start(10)
-                    box.set_margin_end(10)
-                    
-                    # Meeting title
-                    title = Gtk.Label()
-                    title.get_style_context().add_class('meeting-title')
-                    title.set_markup(event['summary'])
-                    title.set_halign(Gtk.Align.START)
-                    box.pack_start(title, True, True, 0)
-                    
-                    # Meeting time
-                    time_str = event['start_time'].strftime("%I:%M %p")
-                    time_label = Gtk.Label()
-                    time_label.get_style_context().add_class('meeting-time')
-                    time_label.set_markup(f"Time: {time_str}")
-                    time_label.set_halign(Gtk.Align.START)
-                    box.pack_start(time_label, True, True, 0)
-                    
-                    # Meeting link if available
-                    if event.get('meeting_link'):
-                        link_button = Gtk.LinkButton.new_with_label(
-                            event['meeting_link'],
-                            "Join Meeting"
-                        )
-                        link_button.get_style_context().add_class('join-meeting')
-                        link_button.set_halign(Gtk.Align.START)
-                        box.pack_start(link_button, True, True, 0)
-                    
-                    row.add(box)
-                    self.meetings_list.add(row)
-            
-            self.meetings_list.show_all()
+            now = datetime.now().astimezone()
+            events = self.event_cache.overlapping(now, now + timedelta(minutes=SYNC_WINDOW_MINUTES))
+            self.agenda_model.update(events)
             
             # Update last checked time
-            now = datetime.now().strftime("%I:%M %p")
-            self.status_label.set_markup(f"Last checked: {now}")
+            self.update_sync_status()
             
         except Exception as e:
             logger.error(f"Failed to update meetings list: {e}")
-            self.status_label.set_markup("Failed to fetch meetings")
+            self.status_label.set_markup("Failed to display meetings")
+            
+    def create_meeting_row(self, item):
+        """Build the list row of one meeting; called by the list box for new items."""
+        event = item.event
+        row = Gtk.ListBoxRow()
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        box.set_margin_top(10)
+        box.set_margin_bottom(10)
+        box.set_margin_start(10)
+        box.set_margin_end(10)
+        
+        # Meeting title
+        title = Gtk.Label()
+        title.get_style_context().add_class('meeting-title')
+        title.set_text(event.summary)
+        title.set_halign(Gtk.Align.START)
+        box.pack_start(title, True, True, 0)
+        
+        # Meeting time
+        time_str = event.start_time.strftime("%I:%M %p")
+        time_label = Gtk.Label()
+        time_label.get_style_context().add_class('meeting-time')
+        time_label.set_markup(f"Time: {time_str}")
+        time_label.set_halign(Gtk.Align.START)
+        box.pack_start(time_label, True, True, 0)
+        
+        # Meeting link if available
+        if event.meeting_link:
+            link_button = Gtk.LinkButton.new_with_label(
+                event.meeting_link,
+                "Join Meeting"
+            )
+            link_button.get_style_context().add_class('join-meeting')
+            if event.meeting_provider:
+                link_button.set_tooltip_text(event.meeting_provider)
+            link_button.set_halign(Gtk.Align.START)
+            box.pack_start(link_button, True, True, 0)
+        
+        row.add(box)
+        row.show_all()
+        return row
         
     def on_window_delete(self, window, event):
         """Handle window close."""
@@ -463,70 +520,280 @@ class MeetingNotifier:
         return True
         
     def check_meetings(self, *args):
-        """Check for upcoming meetings and show notifications."""
+        """Sync the calendar; notifications are shown when the sync completes."""
+        self.last_poll = time.monotonic()
+        self.update_sync_status()
+        self.fetch_worker.request_events(
+            SYNC_WINDOW_MINUTES,
+            self.on_events_synced,
+            on_partial=self.on_events_partial
+        )
+        # Fallback in case the sync never reports back; replaced when it does
+        self.schedule_poll()
+        
+    def schedule_poll(self):
+        """(Re)arm the one-shot timer for the next poll according to the poll policy."""
+        if self.poll_source is not None:
+            GLib.source_remove(self.poll_source)
+        interval, reason = self.poll_policy.next_interval(self.event_cache, synced=self.last_synced is not None)
+        if interval != self.poll_interval:
+            logger.info(f"Polling the calendar every {interval}s ({reason})")
+        self.poll_interval = interval
+        POLL_INTERVAL.set(interval)
+        self.poll_source = GLib.timeout_add_seconds(interval, self.on_poll_timer)
+        
+    def on_poll_timer(self):
+        """Run a scheduled poll."""
+        self.poll_source = None
+        self.check_meetings()
+        return False  # check_meetings schedules the next poll
+        
+    def on_events_partial(self, events):
+        """Show the first pages of a long sync in the meetings window."""
+        # Partial results never shrink the cache; the scheduler waits for the full sync
+        if len(events) > len(self.event_cache):
+            self.event_cache.replace(events)
+            if self.meetings_window.get_visible():
+                self.update_meetings_list()
+        
+    def on_events_synced(self, events, error):
+        """Refresh the event cache and everything that reads from it."""
+        if error is not None:
+            logger.error(f"Error checking meetings: {error}")
+            SYNCS.inc(result='error')
+            # Keep the cached schedule (and its armed notifications) while offline, moving
+            # its window forward from the store so later meetings still get armed
+            self.offline = True
+            self.fetch_worker.request_cached_events(SYNC_WINDOW_MINUTES, self.on_offline_events)
+            self.update_sync_status()
+            self.schedule_poll()
+            return
+            
+        self.offline = False
+        SYNCS.inc(result='ok')
+        self.event_cache.replace(events)
+        self.last_synced = datetime.now()
+        self.scheduler.update(self.event_cache)
+        self.discard_stale_prepared()
+        self.update_sync_status()
+        self.schedule_poll()
+        
+        # Update meetings window if it exists and is visible
+        if self.meetings_window.get_visible():
+            self.update_meetings_list()
+            
+    def on_cached_events(self, result, error):
+        """Fill the cache from the last-known schedule stored on disk."""
+        if error is not None:
+            logger.error(f"Error loading cached meetings: {error}")
+            return
+        events, last_synced = result
+        if self.last_synced is not None:
+            return  # A live sync already finished; it is newer than the disk cache
+            
+        logger.info(f"Loaded {len(events)} cached meetings")
+        self.event_cache.replace(events)
+        self.last_synced = last_synced
+        self.scheduler.update(self.event_cache)
+        self.update_sync_status()
+        if self.meetings_window.get_visible():
+            self.update_meetings_list()
+            
+    def on_offline_events(self, result, error):
+        """Refresh the cache from the store after a failed sync."""
+        if error is not None:
+            logger.error(f"Error loading cached meetings: {error}")
+            return
+        if not self.offline:
+            return  # A live sync succeeded in the meantime
+        events, _ = result
+        self.event_cache.replace(events)
+        self.scheduler.update(self.event_cache)
+        self.discard_stale_prepared()
+        if self.meetings_window.get_visible():
+            self.update_meetings_list()
+            
+    def update_sync_status(self):
+        """Show when the schedule was last synced and whether it is stale."""
+        if self.last_synced is None:
+            text = "Failed to fetch meetings" if self.offline else "Waiting for first sync"
+        else:
+            last_checked = self.last_synced.strftime("%I:%M %p")
+            if self.offline:
+                age_minutes = int((datetime.now() - self.last_synced).total_seconds() // 60)
+                text = f"Offline: showing meetings synced at {last_checked} ({age_minutes} min ago)"
+            else:
+                text = f"Last checked: {last_checked}"
+        self.status_label.set_markup(text)
+        self.sync_status_item.set_label(text)
+        
+    def prepare_notification(self, event):
+        """Build hidden notification windows shortly before they are due."""
+        event_id = event.id
+        if (event_id in self.dismissed_events or event_id in self.active_notifications
+                or event_id in self.prepared_notifications):
+            return
         try:
-            upcoming = self.calendar.get_upcoming_events()
-            for event in upcoming:
-                event_id = event['id']
-                # Skip if event was dismissed or if notification is already active
-                if event_id in self.dismissed_events or event_id in self.active_notifications:
-                    continue
-                notification = NotificationWindow(event, is_primary=True)
-                self.active_notifications[event_id] = notification
-                
-                def on_notification_closed(window, event_id=event_id):
-                    """Handle notification window closure."""
-                    if event_id in self.active_notifications:
-                        del self.active_notifications[event_id]
-                        # Add to dismissed events when explicitly dismissed
-                        if hasattr(window, 'was_dismissed') and window.was_dismissed:
-                            self.dismissed_events.add(event_id)
-                            self.save_dismissed_events()  # Save to disk when dismissing
+            self.prepared_notifications[event_id] = NotificationWindow(event, is_primary=True)
+        except Exception as e:
+            logger.error(f"Error preparing notification: {e}")
+            
+    def discard_stale_prepared(self):
+        """Destroy prepared windows of meetings that were cancelled or changed."""
+        for event_id, notification in list(self.prepared_notifications.items()):
+            if self.event_cache.get(event_id) != notification.event_data:
+                del self.prepared_notifications[event_id]
+                self.destroy_notification(notification)
                 
-                notification.connect("destroy", on_notification_closed)
-                notification.show_all()
+    def destroy_notification(self, notification):
+        """Destroy a notification window and its windows on other monitors."""
+        for window in notification.windows.copy():
+            if window is not notification:
+                window.destroy()
+        notification.destroy()
+        
+    def show_notification(self, event, trigger_ts=None):
+        """Show the full-screen notification for a meeting; called by the scheduler."""
+        event_id = event.id
+        prepared = self.prepared_notifications.pop(event_id, None)
+        if prepared is not None and prepared.event_data != event:
+            self.destroy_notification(prepared)
+            prepared = None
+        # Skip if event was dismissed or if notification is already active
+        if event_id in self.dismissed_events or event_id in self.active_notifications:
+            if prepared is not None:
+                self.destroy_notification(prepared)
+            return
+        try:
+            notification = prepared
+            if notification is None:
+                notification = NotificationWindow(event, is_primary=True)
+            self.active_notifications[event_id] = notification
             
-            # Update meetings window if it exists and is visible
-            if hasattr(self, 'meetings_window') and self.meetings_window.get_visible():
-                self.update_meetings_list()
+            def on_notification_closed(window, event_id=event_id):
+                """Handle notification window closure."""
+                if event_id in self.active_notifications:
+                    del self.active_notifications[event_id]
+                    # Add to dismissed events when explicitly dismissed
+                    if hasattr(window, 'was_dismissed') and window.was_dismissed:
+                        self.dismissed_events.add(event_id)  # Written to disk in batches
             
-            return True  # Continue checking
+            notification.connect("destroy", on_notification_closed)
+            notification.connect("snoozed", self.on_notification_snoozed)
+            notification.present_all(trigger_ts)
         except Exception as e:
-            logger.error(f"Error checking meetings: {e}")
-            return True  # Continue checking despite error
+            logger.error(f"Error showing notification: {e}")
+        
+    def on_notification_snoozed(self, notification, minutes):
+        """Schedule the notification to reappear after the chosen snooze."""
+        self.scheduler.snooze(notification.event_data, time.time() + minutes * 60)
+        
+    def on_resume(self):
+        """Re-arm notification timers and refresh the schedule after a suspend."""
+        self.scheduler.rearm()
+        self.check_meetings()
         
     def show_settings(self, _):
         """Show the settings window."""
         if self.settings_window is None:
-            self.settings_window = SettingsWindow(parent_settings=self.settings)
+            # Open right away with the last-known calendar list; the worker may be
+            # busy with a slow sync or backing off, so the tab is filled when it replies
+            self.settings_window = SettingsWindow(calendars=self.calendars)
             self.settings_window.connect("destroy", self.on_settings_closed)
+            self.fetch_worker.request_calendars(self.on_calendars_loaded)
         self.settings_window.present()
+            
+    def on_calendars_loaded(self, calendars, error):
+        """Show the fetched calendar list in the settings window."""
+        if error is not None:
+            logger.warning(f"Could not load calendar list: {error}")
+            return
+        self.calendars = calendars
+        if self.settings_window is not None:
+            self.settings_window.set_calendars(calendars)
     
     def on_settings_closed(self, window):
         """Handle settings window closure."""
         self.settings_window = None
-        # Reload settings
-        self.load_settings()
+        
+    def on_calendar_ready(self, error):
+        """Quit if calendar access could not be set up on the worker thread."""
+        if error is not None:
+            logger.error(f"Failed to authenticate: {error}")
+            self.exit_status = 1
+            self.quit_application()
+            
+    def on_sign_in_revoked(self, error):
+        """Called on the token refresh thread when the Google sign-in was revoked."""
+        GLib.idle_add(self.reauthenticate, error)
+        
+    def reauthenticate(self, error):
+        """Sign in again on the fetch worker; the cached schedule is used meanwhile."""
+        logger.error(f"Google sign-in is no longer valid, signing in again: {error}")
+        self.fetch_worker.request_recreate(self.on_reauthenticated)
+        return False  # Run once when scheduled with idle_add
+        
+    def on_reauthenticated(self, result, error):
+        """Sync with the new sign-in."""
+        if error is not None:
+            logger.error(f"Failed to sign in again: {error}")
+            return
+        self.check_meetings()
+        
+    def preload_sound(self):
+        """Prepare the configured notification sound for instant playback."""
+        get_sound_player().preload(self.settings['notification_sound'])
+        return False  # Run once when scheduled with idle_add
+        
+    def on_settings_changed(self, settings):
+        """Apply settings saved from the settings window or edited on disk."""
+        self.scheduler.set_lead_time(settings['notification_lead_minutes'] * 60)
+        self.preload_sound()
+        self.metrics_exporter.set_directory(settings['metrics_dir'])
+        poll_policy = PollPolicy.from_settings(settings)
+        if poll_policy != self.poll_policy:
+            self.poll_policy = poll_policy
+            self.schedule_poll()
+        if settings['calendar_ids'] != self.calendar_ids:
+            self.calendar_ids = settings['calendar_ids']
+            self.fetch_worker.set_calendar_ids(self.calendar_ids)
+            # Pick up changes to the calendar selection right away
+            self.check_meetings()
         
     def quit_application(self, *args):
         """Quit the application."""
+        self.scheduler.stop()
+        self.fetch_worker.stop()
+        self.dismissed_events.close()
+        self.metrics_exporter.stop()
         Notify.uninit()
         Gtk.main_quit()
         
     def check_updates(self, *args, force=False):
-        """Check for application updates."""
+        """Check for application updates on a background thread."""
+        if self.update_thread is not None and self.update_thread.is_alive():
+            return True  # A check is already running
         if force:
-            # Reset last check time to force an update check
-            if os.path.exists(self.update_checker.last_check_file):
-                os.remove(self.update_checker.last_check_file)
+            # Reset last check time to force an update check; the release ETag is kept
+            self.update_checker.clear_last_check_time()
+        
+        # The release check is an HTTP request; keep it off the GTK main loop
+        self.update_thread = threading.Thread(target=self.run_update_check, name='update-check', daemon=True)
+        self.update_thread.start()
+        return True  # Continue periodic checks
         
+    def run_update_check(self):
+        """Fetch the latest release; runs on the update check thread."""
         update_info = self.update_checker.check_for_updates()
         if update_info:
-            has_update, latest_version, changelog_url = update_info
-            if has_update:
-                self.show_update_notification(latest_version, changelog_url)
-        
-        return True  # Continue periodic checks
+            GLib.idle_add(self.on_update_checked, update_info)
+            
+    def on_update_checked(self, update_info):
+        """Offer an available update on the main loop."""
+        has_update, latest_version, changelog_url = update_info
+        if has_update:
+            self.show_update_notification(latest_version, changelog_url)
+        return False  # Run once
     
     def show_update_notification(self, latest_version, changelog_url):
         """Show a notification about available updates."""
@@ -560,15 +827,18 @@ class MeetingNotifier:
 def main():
     """Main application entry point."""
     try:
-        # Set up signal handling
-        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGINT, Gtk.main_quit)
-        
         # Create and initialize the application
         app = MeetingNotifier()
         
+        # Quit through the app so pending dismissals and the quota count are saved
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, app.quit_application)
+        
         # Run the GTK main loop
         print("Starting GTK main loop...")
         Gtk.main()
+        if app.exit_status:
+            sys.exit(app.exit_status)
         
     except KeyboardInterrupt:
         print("\nReceived keyboard interrupt, shutting down...")
@@ -0,0 +1,72 @@
+"""Periodic export of the metrics registry to files."""
+from gi.repository import GLib
+import json
+import logging
+import os
+from storage.atomic_file import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Seconds between exports; nothing is written if no metric changed
+EXPORT_INTERVAL = 300
+
+class MetricsExporter:
+    """Writes the registry as a Prometheus textfile and a JSON stats file.
+
+    Export is opt-in: nothing is written until a directory is set (the
+    'metrics_dir' setting). metrics.prom can be picked up by node_exporter's
+    textfile collector (point the setting at its directory) and metrics.json
+    by any agent that reads JSON. Both files are replaced atomically, and
+    only when a metric changed since the last export, so a scraper never
+    reads a half-written file and an idle app does not touch the disk.
+    """
+
+    def __init__(self, registry, directory=None, interval=EXPORT_INTERVAL):
+        """Create the exporter; call start() to export periodically."""
+        self.registry = registry
+        self.directory = os.path.expanduser(directory) if directory else None
+        self.interval = interval
+        self._source = None
+        self._exported_generation = None
+
+    def start(self):
+        """Export now and then every interval seconds; does nothing without a directory."""
+        if self._source is None and self.directory:
+            self.export()
+            self._source = GLib.timeout_add_seconds(self.interval, self._on_timer)
+
+    def stop(self):
+        """Stop exporting, writing the final values first."""
+        if self._source is not None:
+            GLib.source_remove(self._source)
+            self._source = None
+            self.export()
+
+    def set_directory(self, directory):
+        """Export to another directory from now on; None stops exporting."""
+        directory = os.path.expanduser(directory) if directory else None
+        if directory == self.directory:
+            return
+        self.stop()
+        self.directory = directory
+        self._exported_generation = None
+        self.start()
+
+    def export(self):
+        """Write both files with the current values, unless nothing changed."""
+        generation = self.registry.generation
+        if generation == self._exported_generation:
+            return
+        try:
+            write_atomic(os.path.join(self.directory, 'metrics.prom'), self.registry.to_prometheus())
+            write_atomic(
+                os.path.join(self.directory, 'metrics.json'),
+                json.dumps(self.registry.to_dict(), indent=2)
+            )
+            self._exported_generation = generation
+        except Exception as e:
+            logger.error(f"Error exporting metrics: {e}")
+
+    def _on_timer(self):
+        self.export()
+        return True  # Keep exporting
@@ -0,0 +1,194 @@
+"""Process-wide counters, gauges and histograms."""
+from bisect import bisect_left
+import threading
+
+# Histogram buckets in seconds, from a millisecond to a minute
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Metric:
+    """A named metric holding one value per combination of label values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, registry):
+        """Create the metric; it shares the registry's lock and change counter."""
+        self.name = name
+        self.documentation = documentation
+        self._registry = registry
+        self._lock = registry._lock
+        self._values = {}  # Sorted (label, value) tuples -> value
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def samples(self):
+        """Return [(labels dict, value)] for every label combination."""
+        with self._lock:
+            return [(dict(key), self._copy(value)) for key, value in self._values.items()]
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Add amount to the counter for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+            self._registry.generation += 1
+
+class Gauge(Metric):
+    """A value that is set to the current reading."""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        """Set the gauge for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            if self._values.get(key) != value:
+                self._values[key] = value
+                self._registry.generation += 1
+
+class Histogram(Metric):
+    """Observations counted into buckets, with their sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, registry, buckets=DEFAULT_BUCKETS):
+        """Create the histogram with ascending bucket upper bounds."""
+        super().__init__(name, documentation, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Record one observation for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # One count per bucket plus +Inf, then the sum
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+            self._registry.generation += 1
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+class MetricsRegistry:
+    """Collects the application's metrics and renders them for export.
+
+    Metrics are created once, usually at module level, and updated from any
+    thread. Rendering takes a consistent snapshot of each metric. generation
+    goes up with every change, so exporters can skip unchanged snapshots.
+    """
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self.generation = 0
+
+    def counter(self, name, documentation):
+        """Return the counter called name, creating it if needed."""
+        return self._get(Counter, name, documentation)
+
+    def gauge(self, name, documentation):
+        """Return the gauge called name, creating it if needed."""
+        return self._get(Gauge, name, documentation)
+
+    def histogram(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        """Return the histogram called name, creating it if needed."""
+        return self._get(Histogram, name, documentation, buckets=buckets)
+
+    def _get(self, cls, name, documentation, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, self, **kwargs)
+                self.generation += 1
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def to_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, value in metric.samples():
+                if metric.kind != 'histogram':
+                    lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + ('+Inf',), value[:-1]):
+                    cumulative += count
+                    bucket_labels = dict(labels, le=bound if bound == '+Inf' else _format_value(float(bound)))
+                    lines.append(f"{metric.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(value[-1])}")
+                lines.append(f"{metric.name}_count{_format_labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self):
+        """Return all metrics as JSON-serializable data.
+
+        Histograms are summarized as count, sum, mean and approximate
+        50th/90th/99th percentiles (the upper bound of the bucket they fall in).
+        """
+        data = {}
+        for metric in list(self._metrics.values()):
+            samples = []
+            for labels, value in metric.samples():
+                if metric.kind == 'histogram':
+                    value = _summarize(metric.buckets, value)
+                samples.append({'labels': labels, 'value': value})
+            data[metric.name] = {'type': metric.kind, 'help': metric.documentation, 'samples': samples}
+        return data
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return '{' + pairs + '}'
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _summarize(buckets, counts):
+    total = sum(counts[:-1])
+    summary = {'count': total, 'sum': counts[-1], 'mean': counts[-1] / total if total else None}
+    for quantile in (0.5, 0.9, 0.99):
+        summary[f'p{int(quantile * 100)}'] = _bucket_quantile(buckets, counts, total, quantile)
+    return summary
+
+def _bucket_quantile(buckets, counts, total, quantile):
+    """Upper bound of the bucket holding the quantile; None if unknown or above all buckets."""
+    cumulative = 0
+    for bound, count in zip(buckets, counts):
+        cumulative += count
+        if total and cumulative >= quantile * total:
+            return bound
+    return None
+
+# Created on import: metrics are registered from the worker thread as well
+_registry = MetricsRegistry()
+
+def get_metrics():
+    """Return the metrics registry shared by the whole process."""
+    return _registry
+
+# Shared by all caches, which are told apart by the 'cache' label
+CACHE_LOOKUPS = _registry.counter(
+    'meeting_notifier_cache_lookups_total', "Cache lookups by cache and result (hit or miss)"
+)
@@ -0,0 +1,38 @@
+"""Notification of system resume from suspend."""
+from gi.repository import Gio, GLib
+import logging
+
+logger = logging.getLogger(__name__)
+
+def watch_resume(callback):
+    """Call callback() on the main loop whenever the system wakes from suspend.
+
+    GLib timers run on the monotonic clock, which stops while the machine is
+    suspended, so timers armed before a suspend fire late. Listening for
+    logind's PrepareForSleep signal lets them be re-armed on resume.
+
+    Returns:
+        int: The D-Bus subscription id, or None if the system bus is unavailable.
+    """
+    try:
+        bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+    except GLib.Error as e:
+        logger.warning(f"Cannot watch for resume from suspend: {e.message}")
+        return None
+
+    def on_prepare_for_sleep(connection, sender, path, interface, signal, parameters):
+        """Run the callback when logind reports the end of a sleep."""
+        (going_to_sleep,) = parameters.unpack()
+        if not going_to_sleep:
+            logger.info("Resumed from suspend")
+            callback()
+
+    return bus.signal_subscribe(
+        'org.freedesktop.login1',
+        'org.freedesktop.login1.Manager',
+        'PrepareForSleep',
+        '/org/freedesktop/login1',
+        None,
+        Gio.DBusSignalFlags.NONE,
+        on_prepare_for_sleep
+    )
@@ -0,0 +1,222 @@
+"""Exact-time notification scheduler."""
+from gi.repository import GLib
+import heapq
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Kinds of queue entries
+PREPARE = 'prepare'
+FIRE = 'fire'
+SNOOZE = 'snooze'
+
+class NotificationScheduler:
+    """Fires a callback at each event's start time minus a lead time.
+
+    Pending triggers live in a priority queue ordered by trigger time and only
+    the earliest one has a GLib timer armed, so there are no wakeups between
+    meetings. Updating the event set re-arms incrementally: unchanged events
+    keep their queue entry, removed or rescheduled ones are invalidated lazily.
+    An optional prepare callback runs shortly before each trigger so the
+    notification can be built ahead of time. Snoozed notifications are queue
+    entries too; with a snooze store they are persisted and re-armed from it
+    by the first update() after a restart.
+    """
+
+    def __init__(self, callback, lead_time=60, prepare_callback=None, prepare_ahead=30,
+                 snooze_store=None):
+        """Create the scheduler.
+
+        Args:
+            callback (callable): Called on the main loop with the Event and the
+                                 timestamp it was due at, when due.
+            lead_time (int): Seconds before the start time to fire.
+            prepare_callback (callable): Optional. Called with the Event
+                                         prepare_ahead seconds before the trigger.
+            prepare_ahead (int): Seconds before the trigger to call prepare_callback.
+            snooze_store (SnoozeStore): Optional. Where snoozes are persisted.
+        """
+        self.callback = callback
+        self.lead_time = lead_time
+        self.prepare_callback = prepare_callback
+        self.prepare_ahead = prepare_ahead
+        self.snooze_store = snooze_store
+        self._heap = []  # (due_ts, seq, event_id, kind)
+        self._entries = {}  # event_id -> (trigger_ts, event)
+        self._fired = {}  # event_id -> trigger_ts, so a sync does not re-fire an event
+        self._snoozed = {}  # event_id -> (wake_ts, event)
+        self._events = []  # Last event set passed to update()
+        self._counter = itertools.count()
+        self._timer_id = None
+        self._armed_ts = None
+
+    def set_lead_time(self, lead_time):
+        """Change the lead time and reschedule all pending events."""
+        if lead_time == self.lead_time:
+            return
+        delta = lead_time - self.lead_time
+        self.lead_time = lead_time
+        # Keep already fired events from firing again at the new offset
+        self._fired = {event_id: ts - delta for event_id, ts in self._fired.items()}
+        self._entries.clear()
+        self._heap = [entry for entry in self._heap if entry[3] == SNOOZE]
+        heapq.heapify(self._heap)
+        self.update(self._events)
+
+    def update(self, events):
+        """Reconcile the schedule with the current set of upcoming events."""
+        self._events = list(events)
+        now = time.time()
+        seen = set()
+        for event in self._events:
+            event_id = event.id
+            start_ts = event.start_time.timestamp()
+            if start_ts <= now:
+                continue  # Already started; nothing to announce
+            seen.add(event_id)
+            trigger_ts = start_ts - self.lead_time
+            if self._fired.get(event_id) == trigger_ts:
+                continue
+            current = self._entries.get(event_id)
+            if current is None or current[0] != trigger_ts:
+                heapq.heappush(self._heap, (trigger_ts, next(self._counter), event_id, FIRE))
+                if self.prepare_callback is not None:
+                    prepare_ts = trigger_ts - self.prepare_ahead
+                    heapq.heappush(self._heap, (prepare_ts, next(self._counter), event_id, PREPARE))
+            self._entries[event_id] = (trigger_ts, event)
+
+        # Events that disappeared are dropped; their heap entries become stale
+        for event_id in list(self._entries):
+            if event_id not in seen:
+                del self._entries[event_id]
+        for event_id in list(self._fired):
+            if event_id not in seen:
+                del self._fired[event_id]
+
+        self._update_snoozes()
+        self._arm()
+
+    def _update_snoozes(self):
+        """Refresh snoozed events, drop snoozes of ended or cancelled meetings."""
+        # In-progress meetings are kept: a snooze usually wakes after the start time
+        by_id = {event.id: event for event in self._events}
+        for event_id in list(self._snoozed):
+            event = by_id.get(event_id)
+            if event is None:
+                del self._snoozed[event_id]
+            else:
+                self._snoozed[event_id] = (self._snoozed[event_id][0], event)
+
+        if self.snooze_store is None:
+            return
+        self.snooze_store.retain(by_id)
+        # Re-arm snoozes saved before a restart
+        for event_id, wake_ts in self.snooze_store.items():
+            if event_id not in self._snoozed:
+                self._snoozed[event_id] = (wake_ts, by_id[event_id])
+                heapq.heappush(self._heap, (wake_ts, next(self._counter), event_id, SNOOZE))
+
+    def snooze(self, event, wake_ts):
+        """Show an event's notification again at wake_ts."""
+        event_id = event.id
+        self._snoozed[event_id] = (wake_ts, event)
+        if self.snooze_store is not None:
+            self.snooze_store.add(event_id, wake_ts)
+        heapq.heappush(self._heap, (wake_ts, next(self._counter), event_id, SNOOZE))
+        self._arm()
+
+    def rearm(self):
+        """Re-arm the timer from the wall clock, e.g. after resuming from suspend."""
+        self._disarm()
+        self._arm()
+
+    def cancel(self, event_id):
+        """Stop a pending trigger for an event."""
+        if self._entries.pop(event_id, None) is not None:
+            self._arm()
+
+    def cancel_snooze(self, event_id):
+        """Drop a pending snooze for an event."""
+        if self._snoozed.pop(event_id, None) is not None:
+            if self.snooze_store is not None:
+                self.snooze_store.remove(event_id)
+            self._arm()
+
+    def stop(self):
+        """Disarm the timer."""
+        self._disarm()
+
+    def _is_current(self, due_ts, event_id, kind):
+        """Whether a heap entry still matches the scheduled trigger of its event."""
+        if kind == SNOOZE:
+            snoozed = self._snoozed.get(event_id)
+            return snoozed is not None and snoozed[0] == due_ts
+        entry = self._entries.get(event_id)
+        if entry is None:
+            return False
+        if kind == PREPARE:
+            return entry[0] - self.prepare_ahead == due_ts
+        return entry[0] == due_ts
+
+    def _arm(self):
+        """Arm a one-shot timer for the earliest valid trigger."""
+        while self._heap:
+            due_ts, _, event_id, kind = self._heap[0]
+            if self._is_current(due_ts, event_id, kind):
+                break
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._disarm()
+            return
+
+        trigger_ts = self._heap[0][0]
+        if self._timer_id is not None and self._armed_ts == trigger_ts:
+            return  # Already armed for this trigger
+
+        self._disarm()
+        delay_ms = max(0, int((trigger_ts - time.time()) * 1000))
+        self._timer_id = GLib.timeout_add(delay_ms, self._on_timer)
+        self._armed_ts = trigger_ts
+        logger.debug(f"Next notification armed in {delay_ms / 1000:.1f}s")
+
+    def _disarm(self):
+        """Remove the armed timer, if any."""
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+            self._armed_ts = None
+
+    def _on_timer(self):
+        """Fire every trigger that is due, then arm the next one."""
+        self._timer_id = None
+        self._armed_ts = None
+        now = time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_ts, _, event_id, kind = heapq.heappop(self._heap)
+            if not self._is_current(due_ts, event_id, kind):
+                continue
+            if kind == PREPARE:
+                due.append((self.prepare_callback, self._entries[event_id][1], ()))
+                continue
+            if kind == SNOOZE:
+                _, event = self._snoozed.pop(event_id)
+                if self.snooze_store is not None:
+                    self.snooze_store.remove(event_id)
+                due.append((self.callback, event, (due_ts,)))
+                continue
+            _, event = self._entries.pop(event_id)
+            self._fired[event_id] = due_ts
+            due.append((self.callback, event, (due_ts,)))
+
+        for callback, event, args in due:
+            try:
+                callback(event, *args)
+            except Exception as e:
+                logger.error(f"Error running scheduled callback for {event.id}: {e}")
+
+        self._arm()
+        return False  # One-shot
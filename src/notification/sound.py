@@ -0,0 +1,172 @@
+"""In-process notification sound playback."""
+import gi
+from gi.repository import GLib
+import logging
+import os
+import shutil
+import subprocess
+import time
+from metrics.registry import get_metrics
+
+logger = logging.getLogger(__name__)
+
+SOUND_START_SECONDS = get_metrics().histogram(
+    'meeting_notifier_sound_start_seconds', "Time from requesting the notification sound until playback starts, by backend"
+)
+
+# Playback volume (0 to 1) used by every backend except aplay
+VOLUME = 0.75
+
+# External players used when GStreamer is not available, in order of preference.
+# The sound file is appended to each command.
+FALLBACK_PLAYERS = [
+    # paplay takes the volume on PulseAudio's linear scale, where 65536 is 100%
+    ('paplay', ['paplay', f'--volume={int(VOLUME * 65536)}']),
+    ('ffplay', ['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', '-af', f'volume={VOLUME}']),
+    # from sox package; -v scales the input file that follows it
+    ('play', ['play', '-q', '-v', str(VOLUME)]),
+    # Last resort: aplay has no volume control and plays at the mixer level
+    ('aplay', ['aplay', '-q']),
+]
+
+class SoundPlayer:
+    """Plays the notification sound without blocking the GTK main loop.
+
+    The backend is detected once. With GStreamer the configured sound is
+    decoded into a paused playbin ahead of time, so playing it is a seek and
+    a state change. Without GStreamer the first available external player is
+    started directly (no shell, no lookup per alert).
+    """
+
+    def __init__(self):
+        """Detect the playback backend."""
+        self.Gst = None
+        self.playbin = None
+        self.command = None
+        self.loaded_path = None
+        self.process = None
+        self._play_requested = None  # When play() last started the playbin
+        self._detect_backend()
+
+    @property
+    def available(self):
+        """Whether any backend can play sounds."""
+        return self.playbin is not None or self.command is not None
+
+    def _detect_backend(self):
+        """Prefer an in-process GStreamer playbin, fall back to an external player."""
+        try:
+            gi.require_version('Gst', '1.0')
+            from gi.repository import Gst
+            Gst.init(None)
+            playbin = Gst.ElementFactory.make('playbin', 'notification-sound')
+            if playbin is not None:
+                playbin.set_property('volume', VOLUME)
+                # Audio only; never open a video sink
+                fakesink = Gst.ElementFactory.make('fakesink', None)
+                if fakesink is not None:
+                    playbin.set_property('video-sink', fakesink)
+                bus = playbin.get_bus()
+                bus.add_signal_watch()
+                bus.connect('message::eos', self.on_eos)
+                bus.connect('message::error', self.on_error)
+                bus.connect('message::state-changed', self.on_state_changed)
+                self.Gst = Gst
+                self.playbin = playbin
+                logger.info("Using GStreamer for notification sounds")
+                return
+        except (ValueError, ImportError) as e:
+            logger.info(f"GStreamer not available: {e}")
+
+        for name, command in FALLBACK_PLAYERS:
+            if shutil.which(name):
+                self.command = command
+                logger.info(f"Using {name} for notification sounds")
+                return
+        logger.warning("No sound backend found. Install GStreamer (gir1.2-gstreamer-1.0) or ffmpeg")
+
+    def preload(self, sound_file):
+        """Decode a sound ahead of time so play() can start it immediately."""
+        if self.playbin is None or not sound_file or not os.path.exists(sound_file):
+            return
+        if sound_file == self.loaded_path:
+            return
+        self.playbin.set_state(self.Gst.State.NULL)
+        self.playbin.set_property('uri', GLib.filename_to_uri(os.path.abspath(sound_file), None))
+        # PAUSED prerolls the pipeline: the file is opened and the first buffers decoded
+        self.playbin.set_state(self.Gst.State.PAUSED)
+        self.loaded_path = sound_file
+
+    def play(self, sound_file):
+        """Start playing a sound and return immediately.
+
+        Returns:
+            bool: False if the file is missing or no backend is available.
+        """
+        if not sound_file or not os.path.exists(sound_file):
+            logger.error(f"Sound file not found: {sound_file}")
+            return False
+
+        if self.playbin is not None:
+            self.preload(sound_file)
+            self.playbin.seek_simple(
+                self.Gst.Format.TIME,
+                self.Gst.SeekFlags.FLUSH | self.Gst.SeekFlags.KEY_UNIT,
+                0
+            )
+            self._play_requested = time.monotonic()
+            self.playbin.set_state(self.Gst.State.PLAYING)
+            return True
+
+        if self.command is not None:
+            # Reap the previous player if it has finished
+            if self.process is not None:
+                self.process.poll()
+            try:
+                started = time.monotonic()
+                self.process = subprocess.Popen(
+                    self.command + [sound_file],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                # Only the process start is visible; the player's own start-up is not included
+                SOUND_START_SECONDS.observe(time.monotonic() - started, backend=self.command[0])
+                return True
+            except OSError as e:
+                logger.error(f"Error playing sound with {self.command[0]}: {e}")
+        return False
+
+    def on_eos(self, bus, message):
+        """Rewind and pause at the end so the sound stays ready for the next alert."""
+        self.playbin.set_state(self.Gst.State.PAUSED)
+        self.playbin.seek_simple(
+            self.Gst.Format.TIME,
+            self.Gst.SeekFlags.FLUSH | self.Gst.SeekFlags.KEY_UNIT,
+            0
+        )
+
+    def on_state_changed(self, bus, message):
+        """Record how long the playbin took to start playing after play()."""
+        if message.src is not self.playbin or self._play_requested is None:
+            return
+        _, new_state, _ = message.parse_state_changed()
+        if new_state == self.Gst.State.PLAYING:
+            SOUND_START_SECONDS.observe(time.monotonic() - self._play_requested, backend='gstreamer')
+            self._play_requested = None
+
+    def on_error(self, bus, message):
+        """Reset the pipeline after a playback error."""
+        error, debug = message.parse_error()
+        logger.error(f"Error playing notification sound: {error.message}")
+        self.playbin.set_state(self.Gst.State.NULL)
+        self.loaded_path = None
+
+_player = None
+
+def get_sound_player():
+    """Return the sound player shared by the whole process."""
+    global _player
+    if _player is None:
+        _player = SoundPlayer()
+    return _player
@@ -0,0 +1,23 @@
+"""Crash-safe file replacement."""
+import os
+import tempfile
+
+def write_atomic(path, text):
+    """Replace a file with new contents via a temporary file and a rename.
+
+    Readers see either the old or the new contents, never a partial write.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # The temporary name must not match globs like *.prom that scrapers read
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,162 @@
+"""Persistent record of dismissed notifications."""
+from gi.repository import GLib
+import json
+import logging
+import os
+import threading
+import time
+from .atomic_file import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# How long a dismissal suppresses notifications for its event
+DISMISSAL_MAX_AGE = 24 * 3600
+# Seconds to batch dismissals before appending them to the log
+FLUSH_DELAY = 2
+# Log size (in lines) below which the log is never compacted
+COMPACT_MIN_LINES = 200
+
+class DismissalStore:
+    """Dismissed event ids with the time each was dismissed.
+
+    Lookups are answered from an in-memory dict. Dismissals are appended to a
+    JSON-lines log in batches, so a write costs one short append regardless
+    of how many dismissals are stored. Expired and superseded lines are
+    dropped by rewriting the log on a background thread once it has grown to
+    twice its live size.
+    """
+
+    def __init__(self, path=None, legacy_path=None, max_age=DISMISSAL_MAX_AGE):
+        """Load the dismissal log, migrating the old dismissed_events.json if present."""
+        config_dir = os.path.expanduser('~/.config/meeting-notifier')
+        self.path = path or os.path.join(config_dir, 'dismissed_events.log')
+        self.legacy_path = legacy_path or os.path.join(config_dir, 'dismissed_events.json')
+        self.max_age = max_age
+        self._entries = {}  # event_id -> dismissed_at
+        self._pending = []  # (event_id, dismissed_at) not yet written
+        self._log_lines = 0
+        self._flush_id = None
+        self._compacting = False
+        self._lock = threading.Lock()  # Serialises log appends with compaction
+        self._load()
+
+    def __contains__(self, event_id):
+        dismissed_at = self._entries.get(event_id)
+        return dismissed_at is not None and time.time() - dismissed_at < self.max_age
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, event_id):
+        """Record that an event's notification was dismissed now."""
+        dismissed_at = time.time()
+        self._entries[event_id] = dismissed_at
+        self._pending.append((event_id, dismissed_at))
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add_seconds(FLUSH_DELAY, self._on_flush_timeout)
+
+    def flush(self):
+        """Append pending dismissals to the log."""
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        lines = ''.join(
+            json.dumps({'id': event_id, 'dismissed_at': dismissed_at}) + '\n'
+            for event_id, dismissed_at in pending
+        )
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'a') as f:
+                    f.write(lines)
+                self._log_lines += len(pending)
+        except Exception as e:
+            logger.error(f"Error saving dismissed events: {e}")
+            return
+        self._maybe_compact()
+
+    def close(self):
+        """Write everything still pending; call before the process exits."""
+        self.flush()
+
+    def _on_flush_timeout(self):
+        """Flush the batched dismissals."""
+        self._flush_id = None
+        self.flush()
+        return False  # One-shot
+
+    def _load(self):
+        """Read the log (or the legacy JSON file), keeping unexpired dismissals."""
+        now = time.time()
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        self._log_lines += 1
+                        try:
+                            record = json.loads(line)
+                            event_id, dismissed_at = record['id'], record['dismissed_at']
+                            expired = now - dismissed_at >= self.max_age
+                        except (ValueError, KeyError, TypeError):
+                            continue  # Torn last line after a crash, or a malformed record
+                        if not expired:
+                            self._entries[event_id] = dismissed_at
+            elif os.path.exists(self.legacy_path):
+                self._migrate_legacy(now)
+        except Exception as e:
+            logger.error(f"Error loading dismissed events: {e}")
+        self._maybe_compact()
+
+    def _migrate_legacy(self, now):
+        """Import dismissed_events.json ({event_id: timestamp}) into the log."""
+        with open(self.legacy_path, 'r') as f:
+            data = json.load(f)
+        for event_id, dismissed_at in data.items():
+            if now - dismissed_at < self.max_age:
+                self._entries[event_id] = dismissed_at
+        self._write_log(dict(self._entries))
+        self._log_lines = len(self._entries)
+        os.remove(self.legacy_path)
+        logger.info(f"Migrated {len(self._entries)} dismissed events to {self.path}")
+
+    def _maybe_compact(self):
+        """Start a background compaction once the log holds mostly dead lines."""
+        if self._compacting:
+            return
+        if self._log_lines <= max(COMPACT_MIN_LINES, 2 * len(self._entries)):
+            return
+        now = time.time()
+        self._entries = {
+            event_id: dismissed_at for event_id, dismissed_at in self._entries.items()
+            if now - dismissed_at < self.max_age
+        }
+        self._compacting = True
+        thread = threading.Thread(
+            target=self._compact,
+            name="dismissal-compaction",
+            daemon=True
+        )
+        thread.start()
+
+    def _compact(self):
+        """Rewrite the log with only live entries; runs on a background thread."""
+        try:
+            with self._lock:
+                # Taken under the lock so no append can land between snapshot and rename
+                entries = dict(self._entries)
+                self._write_log(entries)
+                self._log_lines = len(entries)
+        except Exception as e:
+            logger.error(f"Error compacting dismissed events: {e}")
+        finally:
+            self._compacting = False
+
+    def _write_log(self, entries):
+        """Atomically replace the log with the given entries."""
+        write_atomic(self.path, ''.join(
+            json.dumps({'id': event_id, 'dismissed_at': dismissed_at}) + '\n'
+            for event_id, dismissed_at in entries.items()
+        ))
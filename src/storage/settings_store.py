@@ -0,0 +1,125 @@
+"""Process-wide settings store shared by all windows."""
+from gi.repository import Gio
+import json
+import logging
+import os
+import threading
+from .atomic_file import write_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'background_color': 'rgba(0, 0, 0, 0.9)',
+    'background_image': '',
+    'notification_sound': '/usr/share/sounds/freedesktop/stereo/message.oga',  # Default system notification sound
+    'sound_enabled': True,  # Enable sound by default
+    'text_color': '#ffffff',
+    'button_color': '#4a4a4a',
+    'button_text_color': '#ffffff',
+    'opacity': 0.85,
+    'notification_lead_minutes': 1,  # Minutes before the start time to notify
+    'snooze_minutes': [5, 10, 15],  # Snooze durations offered on the notification
+    'poll_policy': 'adaptive',  # 'adaptive' follows the schedule, 'fixed' uses poll_interval_minutes
+    'poll_interval_minutes': 1,
+    'api_endpoint': None,  # Calendar API root URL for testing, e.g. http://127.0.0.1:8080/
+    'metrics_dir': None,  # Where metrics.prom/metrics.json are written; None disables the export
+    'calendar_ids': None  # None follows the calendars selected in Google Calendar
+}
+
+class SettingsStore:
+    """Settings loaded once per process, kept current by a file monitor.
+
+    Readers get values from memory, so the notification hot path never touches
+    the disk. Writes go to a temporary file that is renamed over settings.json,
+    so a crash never leaves a half-written file behind.
+    """
+
+    def __init__(self, path=None):
+        """Load the settings file, falling back to defaults."""
+        self.path = path or os.path.expanduser('~/.config/meeting-notifier/settings.json')
+        self._values = dict(DEFAULT_SETTINGS)
+        self._callbacks = []
+        self._monitor = None
+        self._read()
+
+    def get(self, key, default=None):
+        """Return a setting, or default if it is not set."""
+        return self._values.get(key, default)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def as_dict(self):
+        """Return a copy of all settings."""
+        return dict(self._values)
+
+    def connect_changed(self, callback):
+        """Call callback(store) whenever the settings change."""
+        self._callbacks.append(callback)
+
+    def update(self, values):
+        """Change settings in memory and notify listeners; call save() to persist."""
+        changed = {key: value for key, value in values.items() if self._values.get(key) != value}
+        if changed:
+            self._values.update(changed)
+            self._notify()
+
+    def save(self):
+        """Write the settings atomically (temporary file plus rename)."""
+        write_atomic(self.path, json.dumps(self._values))
+
+    def watch(self):
+        """Reload the settings whenever settings.json changes on disk."""
+        if self._monitor is not None:
+            return
+        settings_file = Gio.File.new_for_path(self.path)
+        self._monitor = settings_file.monitor_file(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        self._monitor.connect("changed", self.on_file_changed)
+
+    def on_file_changed(self, monitor, file, other_file, event_type):
+        """Reload after the file was rewritten, created or renamed into place."""
+        if event_type in (
+            Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+            Gio.FileMonitorEvent.CREATED,
+            Gio.FileMonitorEvent.MOVED_IN,
+            Gio.FileMonitorEvent.RENAMED
+        ):
+            if self._read():
+                self._notify()
+
+    def _read(self):
+        """Read settings from disk; return True if any value changed."""
+        values = dict(DEFAULT_SETTINGS)
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    values.update(json.load(f))
+        except Exception as e:
+            logger.error(f"Error loading settings: {e}")
+            return False
+        if values == self._values:
+            return False
+        self._values = values
+        return True
+
+    def _notify(self):
+        """Run the change callbacks."""
+        for callback in self._callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Error in settings change callback: {e}")
+
+_settings = None
+_settings_lock = threading.Lock()
+
+def get_settings():
+    """Return the settings store shared by the whole process."""
+    global _settings
+    with _settings_lock:  # The fetch worker thread may ask for it first
+        if _settings is None:
+            _settings = SettingsStore()
+        return _settings
@@ -0,0 +1,55 @@
+"""Persistent record of snoozed notifications."""
+import json
+import logging
+import os
+from .atomic_file import write_atomic
+
+logger = logging.getLogger(__name__)
+
+class SnoozeStore:
+    """Snoozed event ids with the time each notification should reappear.
+
+    The file is small (one entry per snoozed meeting) and only written when a
+    snooze is added, fires or is dropped, so it is rewritten atomically on
+    every change.
+    """
+
+    def __init__(self, path=None):
+        """Load the snoozes saved by a previous run."""
+        self.path = path or os.path.expanduser('~/.config/meeting-notifier/snoozes.json')
+        self._wake_times = {}  # event_id -> wake timestamp
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    self._wake_times = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading snoozes: {e}")
+
+    def items(self):
+        """Return (event_id, wake timestamp) pairs."""
+        return list(self._wake_times.items())
+
+    def add(self, event_id, wake_ts):
+        """Remember a snooze."""
+        self._wake_times[event_id] = wake_ts
+        self._save()
+
+    def remove(self, event_id):
+        """Forget a snooze that fired or was cancelled."""
+        if self._wake_times.pop(event_id, None) is not None:
+            self._save()
+
+    def retain(self, event_ids):
+        """Forget the snoozes of every event not in event_ids."""
+        stale = [event_id for event_id in self._wake_times if event_id not in event_ids]
+        if stale:
+            for event_id in stale:
+                del self._wake_times[event_id]
+            self._save()
+
+    def _save(self):
+        """Write the snoozes to disk."""
+        try:
+            write_atomic(self.path, json.dumps(self._wake_times))
+        except Exception as e:
+            logger.error(f"Error saving snoozes: {e}")
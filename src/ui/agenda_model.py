@@ -0,0 +1,71 @@
+"""List model behind the "Today's Meetings" window."""
+from gi.repository import Gio, GObject
+
+def _signature(event):
+    """The event fields a meetings list row displays."""
+    return (
+        event.summary,
+        event.start_time,
+        event.meeting_link,
+        event.meeting_provider,
+    )
+
+class AgendaItem(GObject.Object):
+    """One meeting in the agenda list store."""
+
+    event_id = GObject.Property(type=str)
+
+    def __init__(self, event):
+        """Wrap an Event."""
+        super().__init__(event_id=event.id)
+        self.event = event
+        self.signature = _signature(event)
+
+class AgendaModel:
+    """A Gio.ListStore of AgendaItems kept in sync with the event cache by keyed diffs.
+
+    Bind the store to a Gtk.ListBox with bind_model(). update() only removes
+    rows whose event disappeared or changed and inserts rows for new events, in
+    contiguous splices, so unchanged rows keep their widgets and the list keeps
+    its scroll position.
+    """
+
+    def __init__(self):
+        """Create an empty model."""
+        self.store = Gio.ListStore(item_type=AgendaItem)
+
+    def update(self, events):
+        """Make the store show the given events, ordered by start time."""
+        wanted = {event.id: event for event in events}
+        ordered = sorted(wanted.values(), key=lambda event: (event.start_time, event.id))
+
+        # Drop rows of removed or changed events, one contiguous run at a time
+        run_end = None
+        for position in range(self.store.get_n_items() - 1, -1, -1):
+            item = self.store.get_item(position)
+            event = wanted.get(item.event_id)
+            if event is not None and item.signature == _signature(event):
+                item.event = event
+                if run_end is not None:
+                    self.store.splice(position + 1, run_end - position - 1, [])
+                    run_end = None
+            elif run_end is None:
+                run_end = position + 1
+        if run_end is not None:
+            self.store.splice(0, run_end, [])
+
+        # The remaining rows keep the (start time, id) order, so new rows are merged in
+        position = 0
+        additions = []
+        for event in ordered:
+            if (position < self.store.get_n_items()
+                    and self.store.get_item(position).event_id == event.id):
+                if additions:
+                    self.store.splice(position, 0, additions)
+                    position += len(additions)
+                    additions = []
+                position += 1
+            else:
+                additions.append(AgendaItem(event))
+        if additions:
+            self.store.splice(position, 0, additions)
@@ -1,17 +1,49 @@
 """Full-screen notification window module."""
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GLib, GdkPixbuf, Pango
+from gi.repository import Gtk, Gdk, GObject, Pango
+import cairo
 import html
+import logging
 import re
 import os
-import json
+import time
+from datetime import datetime, timezone
+from notification.sound import get_sound_player
+from storage.settings_store import get_settings
+from metrics.registry import get_metrics
+from .render_cache import get_render_cache
+
+logger = logging.getLogger(__name__)
+
+WINDOW_BUILD_SECONDS = get_metrics().histogram(
+    'meeting_notifier_window_build_seconds', "Time to build a notification window, by window (primary or secondary)"
+)
+MAP_SECONDS = get_metrics().histogram(
+    'meeting_notifier_window_map_seconds', "Time from presenting a notification until it is mapped on every monitor"
+)
+NOTIFICATION_LAG = get_metrics().histogram(
+    'meeting_notifier_notification_lag_seconds', "Time from a notification's scheduled trigger until it is mapped on every monitor"
+)
 
 class NotificationWindow(Gtk.Window):
-    """Full-screen notification window that appears on all monitors."""
+    """Full-screen notification window that appears on all monitors.
+    
+    Constructing the primary window builds a hidden, fully laid-out window for
+    every monitor; nothing is mapped until present_all() is called, so the
+    windows can be prepared ahead of the meeting and shown instantly.
+    
+    The primary window emits "snoozed" with the chosen number of minutes
+    before it closes; scheduling the reminder is up to the application.
+    """
+    
+    __gsignals__ = {
+        'snoozed': (GObject.SignalFlags.RUN_FIRST, None, (int,))
+    }
     
     def __init__(self, event_data, is_primary=True, primary_window=None):
         """Initialize the notification window."""
+        build_started = time.monotonic()
         print(f"Initializing {'primary' if is_primary else 'secondary'} notification window...")
         print(f"Event data: {event_data}")
         try:
@@ -21,12 +53,10 @@ class NotificationWindow(Gtk.Window):
             self.primary_window = primary_window
             self.windows = [self] if is_primary else (primary_window.windows if primary_window else [])
             self.was_dismissed = False  # Track if window was explicitly dismissed
+            self.map_handlers = {}  # Window -> "map-event" handler id, until it maps
             
-            # Load settings
-            self.settings_file = os.path.expanduser('~/.config/meeting-notifier/settings.json')
-            print(f"Loading settings from {self.settings_file}")
-            self.load_settings()
-            print(f"Settings loaded: {self.settings}")
+            # Settings are shared in memory; no disk access on the notification path
+            self.settings = get_settings()
             
             # Set window properties
             print("Setting window properties...")
@@ -51,13 +81,10 @@ class NotificationWindow(Gtk.Window):
             if self.is_primary:
                 print("Creating monitor windows...")
                 self.create_monitor_windows()
-                
-                # Play notification sound if enabled
-                if self.settings.get('sound_enabled', True):
-                    print("Playing notification sound...")
-                    self.play_notification_sound()
             
-            print(f"{'Primary' if is_primary else 'Secondary'} window initialization complete.")
+            build_ms = (time.monotonic() - build_started) * 1000
+            WINDOW_BUILD_SECONDS.observe(build_ms / 1000, window='primary' if is_primary else 'secondary')
+            logger.debug(f"{'Primary' if is_primary else 'Secondary'} window built in {build_ms:.1f} ms")
             
         except Exception as e:
             print(f"Error initializing notification window: {e}")
@@ -70,31 +97,12 @@ class NotificationWindow(Gtk.Window):
         # Remove this method as positioning is now handled in create_monitor_windows
         return False
     
-    def load_settings(self):
-        """Load settings from file."""
-        self.settings = {
-            'background_color': 'rgba(0, 0, 0, 0.9)',
-            'background_image': '',
-            'notification_sound': '/usr/share/sounds/freedesktop/stereo/message.oga',
-            'sound_enabled': True,
-            'text_color': '#ffffff',
-            'button_color': '#4a4a4a',
-            'button_text_color': '#ffffff',
-            'opacity': 0.85
-        }
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    self.settings.update(json.load(f))
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-    
     def play_notification_sound(self):
         """Play the notification sound."""
         if self.settings.get('sound_enabled', True):  # Only play if sound is enabled
             sound_file = self.settings.get('notification_sound')
             if sound_file and os.path.exists(sound_file):
-                os.system(f'ffplay -nodisp -autoexit -loglevel quiet -af "volume=0.75" "{sound_file}" &')  # Run in background
+                get_sound_player().play(sound_file)  # Returns immediately
     
     def create_window_content(self):
         """Create the content for a notification window."""
@@ -120,32 +128,31 @@ class NotificationWindow(Gtk.Window):
         # Add meeting information
         title_label = Gtk.Label()
         title_label.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(1, 1, 1, 1))
-        title_label.set_text(self.event_data['summary'])
+        title_label.set_text(self.event_data.summary)
         content_box.pack_start(title_label, False, False, 10)
         
-        time_str = self.event_data['start_time'].strftime("%I:%M %p")
-        time_label = Gtk.Label()
-        time_label.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(1, 1, 1, 1))
-        time_label.set_text(f"Starting now: {time_str}")
-        content_box.pack_start(time_label, False, False, 5)
+        # The text is refreshed in present_all(); windows are built ahead of time
+        self.time_label = Gtk.Label()
+        self.time_label.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(1, 1, 1, 1))
+        self.update_start_text()
+        content_box.pack_start(self.time_label, False, False, 5)
         
-        # Extract and display meeting URL if present
-        zoom_urls = []
-        if self.event_data.get('description'):
-            # Look for Zoom URL in the description
-            zoom_urls = re.findall(r'https://[\w.-]+/j/\d+(?:\?[^\s\n]*)?', self.event_data['description'])
-            if zoom_urls:
-                url_label = Gtk.Label()
-                url_label.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(0.4, 0.7, 1, 1))
-                url_label.set_markup(f'<a href="{zoom_urls[0]}">{zoom_urls[0]}</a>')
-                url_label.set_use_markup(True)
-                url_label.set_track_visited_links(False)
-                content_box.pack_start(url_label, False, False, 10)
-            
+        # Display the meeting URL detected when the event was synced
+        meeting_link = self.event_data.meeting_link
+        if meeting_link:
+            url_label = Gtk.Label()
+            url_label.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(0.4, 0.7, 1, 1))
+            escaped_link = html.escape(meeting_link)
+            url_label.set_markup(f'<a href="{escaped_link}">{escaped_link}</a>')
+            url_label.set_use_markup(True)
+            url_label.set_track_visited_links(False)
+            content_box.pack_start(url_label, False, False, 10)
+        
+        if self.event_data.description:
             # Display the rest of the description
             desc_label = Gtk.Label()
             desc_label.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(1, 1, 1, 1))
-            desc_label.set_text(self.event_data['description'])
+            desc_label.set_text(self.event_data.description)
             desc_label.set_line_wrap(True)
             desc_label.set_line_wrap_mode(Pango.WrapMode.WORD_CHAR)
             desc_label.set_justify(Gtk.Justification.LEFT)
@@ -160,12 +167,13 @@ class NotificationWindow(Gtk.Window):
         button_box.set_margin_bottom(10)
         
         # Add Join Meeting button if URL is present
-        if zoom_urls:
-            join_btn = Gtk.Button.new_with_label("Join Meeting")
+        if meeting_link:
+            provider = self.event_data.meeting_provider
+            join_btn = Gtk.Button.new_with_label(f"Join {provider}" if provider else "Join Meeting")
             join_btn.get_style_context().add_class("suggested-action")  # Makes it stand out
             join_btn.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(1, 1, 1, 1))
             join_btn.override_background_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(0.2, 0.6, 0.9, 1))
-            join_btn.connect("clicked", self.on_join_clicked, zoom_urls[0])
+            join_btn.connect("clicked", self.on_join_clicked, meeting_link)
             button_box.pack_start(join_btn, False, False, 0)
         
         dismiss_btn = Gtk.Button.new_with_label("Dismiss")
@@ -174,14 +182,30 @@ class NotificationWindow(Gtk.Window):
         dismiss_btn.connect("clicked", self.on_dismiss_clicked)
         button_box.pack_start(dismiss_btn, False, False, 0)
         
-        snooze_btn = Gtk.Button.new_with_label("Snooze (5 min)")
-        snooze_btn.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(1, 1, 1, 1))
-        snooze_btn.override_background_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(0.4, 0.4, 0.4, 1))
-        snooze_btn.connect("clicked", self.on_snooze_clicked)
-        button_box.pack_start(snooze_btn, False, False, 0)
+        # One snooze button per configured duration
+        for minutes in self.settings.get('snooze_minutes', [5]):
+            snooze_btn = Gtk.Button.new_with_label(f"Snooze ({minutes} min)")
+            snooze_btn.override_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(1, 1, 1, 1))
+            snooze_btn.override_background_color(Gtk.StateFlags.NORMAL, Gdk.RGBA(0.4, 0.4, 0.4, 1))
+            snooze_btn.connect("clicked", self.on_snooze_clicked, minutes)
+            button_box.pack_start(snooze_btn, False, False, 0)
         
         self.main_box.pack_end(button_box, False, False, 0)
     
+    def update_start_text(self):
+        """Show how long until the meeting starts, as of now."""
+        time_str = self.event_data.start_time.strftime("%I:%M %p")
+        self.time_label.set_text(self.format_start_text(time_str))
+    
+    def format_start_text(self, time_str):
+        """Describe when the meeting starts relative to now."""
+        seconds_left = (self.event_data.start_time - datetime.now(timezone.utc)).total_seconds()
+        minutes_left = int(round(seconds_left / 60))
+        if minutes_left <= 0:
+            return f"Starting now: {time_str}"
+        unit = "minute" if minutes_left == 1 else "minutes"
+        return f"Starting in {minutes_left} {unit}: {time_str}"
+    
     def format_description(self, description):
         """Format HTML description into Pango markup."""
         # Escape special characters
@@ -209,66 +233,74 @@ class NotificationWindow(Gtk.Window):
         return f'<span color="white">{text}</span>'
     
     def create_monitor_windows(self):
-        """Create a window for each monitor."""
+        """Create a hidden, positioned window for each monitor."""
         display = Gdk.Display.get_default()
         n_monitors = display.get_n_monitors()
         print(f"Creating windows for {n_monitors} monitors")
         
-        # If there's only one monitor, just position the primary window
-        if n_monitors <= 1:
-            monitor = display.get_monitor(0)
-            geometry = monitor.get_geometry()
-            self.move(geometry.x, geometry.y)
-            self.fullscreen()
-            self.show_all()
-            return
-            
-        # For multiple monitors, create a window for each one
-        # First, position the primary window on the primary monitor
+        # Position the primary window on the primary monitor, falling back to the first one
         primary_monitor = display.get_primary_monitor()
-        if primary_monitor:
-            print("Using primary monitor for primary window")
-            geometry = primary_monitor.get_geometry()
-            self.move(geometry.x, geometry.y)
-            self.fullscreen()
-            self.show_all()
-            
-            # Create windows for non-primary monitors
-            for i in range(n_monitors):
-                monitor = display.get_monitor(i)
-                if monitor == primary_monitor:
-                    print(f"Skipping monitor {i} (primary)")
-                    continue  # Skip primary monitor as it's already handled
-                    
-                print(f"Creating secondary window for monitor {i}")
-                # Create secondary window with reference to primary
-                window = NotificationWindow(self.event_data, is_primary=False, primary_window=self)
-                geometry = monitor.get_geometry()
-                window.move(geometry.x, geometry.y)
-                window.fullscreen()
-                window.show_all()
-                self.windows.append(window)
-                window.connect("destroy", self.on_window_destroyed)
-        else:
+        if primary_monitor is None:
             print("No primary monitor found, using first monitor")
-            # Fallback if no primary monitor is set
-            # Use the first monitor for primary window
-            geometry = display.get_monitor(0).get_geometry()
-            self.move(geometry.x, geometry.y)
-            self.fullscreen()
-            self.show_all()
-            
-            # Create windows for additional monitors
-            for i in range(1, n_monitors):
-                print(f"Creating secondary window for monitor {i}")
-                monitor = display.get_monitor(i)
-                window = NotificationWindow(self.event_data, is_primary=False, primary_window=self)
-                geometry = monitor.get_geometry()
-                window.move(geometry.x, geometry.y)
-                window.fullscreen()
-                window.show_all()
-                self.windows.append(window)
-                window.connect("destroy", self.on_window_destroyed)
+            primary_monitor = display.get_monitor(0)
+        self.place_on_monitor(primary_monitor)
+        
+        # Create windows for the other monitors
+        for i in range(n_monitors):
+            monitor = display.get_monitor(i)
+            if monitor == primary_monitor:
+                continue  # Skip primary monitor as it's already handled
+                
+            print(f"Creating secondary window for monitor {i}")
+            # Create secondary window with reference to primary
+            window = NotificationWindow(self.event_data, is_primary=False, primary_window=self)
+            window.place_on_monitor(monitor)
+            self.windows.append(window)
+            window.connect("destroy", self.on_window_destroyed)
+    
+    def place_on_monitor(self, monitor):
+        """Lay out the window full-screen on a monitor without mapping it."""
+        geometry = monitor.get_geometry()
+        self.move(geometry.x, geometry.y)
+        self.fullscreen()
+        # Children are shown and the window realized now, so mapping it later is cheap
+        self.main_box.show_all()
+        self.realize()
+    
+    def present_all(self, trigger_ts=None):
+        """Map the prepared windows on every monitor; the sound starts when they map.
+        
+        Args:
+            trigger_ts (float): Optional. Epoch time the notification was due,
+                                used to measure how late it appeared.
+        """
+        self.present_started = time.monotonic()
+        self.trigger_ts = trigger_ts
+        self.mapped_windows = set()
+        for window in self.windows:
+            # One handler per window, even if the notification is presented again
+            if window not in self.map_handlers:
+                self.map_handlers[window] = window.connect("map-event", self.on_window_mapped)
+            window.update_start_text()
+            window.show()
+            window.present()
+    
+    def on_window_mapped(self, window, event):
+        """Start the sound with the first mapped window and log the mapping latency."""
+        window.disconnect(self.map_handlers.pop(window))
+        if not self.mapped_windows:
+            # Play notification sound if enabled
+            self.play_notification_sound()
+        self.mapped_windows.add(window)
+        if len(self.mapped_windows) == len(self.windows):
+            latency_ms = (time.monotonic() - self.present_started) * 1000
+            MAP_SECONDS.observe(latency_ms / 1000)
+            logger.info(f"Notification mapped on {len(self.windows)} monitor(s) {latency_ms:.1f} ms after present")
+            if self.trigger_ts is not None:
+                lag = max(0, time.time() - self.trigger_ts)
+                NOTIFICATION_LAG.observe(lag)
+                logger.info(f"Notification shown {lag * 1000:.1f} ms after its trigger time")
+        return False
     
     def on_window_destroyed(self, window):
         """Handle window destruction."""
@@ -301,16 +333,16 @@ class NotificationWindow(Gtk.Window):
                 print("No primary window found, destroying self")
                 self.destroy()
     
-    def on_snooze_clicked(self, button):
+    def on_snooze_clicked(self, button, minutes):
         """Handle snooze button click."""
         if self.is_primary:
-            # Primary window: close all and set snooze
+            # Primary window: ask for the reminder, then close all windows
+            self.emit('snoozed', minutes)
             windows_to_close = self.windows.copy()
             for window in windows_to_close:
                 if window != self:  # Don't destroy self yet
                     window.destroy()
             self.destroy()
-            GLib.timeout_add_seconds(300, self.show_again)  # 5 minutes
         else:
             # Secondary window: signal primary to handle snooze
             primary_window = None
@@ -320,16 +352,10 @@ class NotificationWindow(Gtk.Window):
                     break
                     
             if primary_window and not primary_window.was_dismissed:
-                primary_window.on_snooze_clicked(None)  # Trigger snooze on primary
+                primary_window.on_snooze_clicked(None, minutes)  # Trigger snooze on primary
             else:
                 self.destroy()  # Fallback if primary is gone
     
-    def show_again(self):
-        """Show the notification again after snooze."""
-        new_notification = NotificationWindow(self.event_data, is_primary=True)
-        new_notification.show_all()
-        return False  # Don't repeat
-    
     def on_join_clicked(self, button, url):
         """Handle join meeting button click."""
         Gtk.show_uri_on_window(None, url, Gdk.CURRENT_TIME)
@@ -353,41 +379,25 @@ class NotificationWindow(Gtk.Window):
         allocation = widget.get_allocation()
         width = allocation.width
         height = allocation.height
+        if width <= 0 or height <= 0:
+            return False
 
-        # Draw background color
         bg_color = self.settings.get('background_color', 'rgba(0, 0, 0, 0.9)')
-        rgba = Gdk.RGBA()
-        rgba.parse(bg_color)
-        cr.set_source_rgba(rgba.red, rgba.green, rgba.blue, rgba.alpha)
-        cr.paint()
-
-        # Draw background image if set
         bg_image = self.settings.get('background_image')
-        if bg_image and os.path.exists(bg_image):
-            try:
-                # Load the image and scale it to fill the window while maintaining aspect ratio
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(bg_image)
-                
-                # Calculate scaling to cover the entire window
-                scale_x = width / pixbuf.get_width()
-                scale_y = height / pixbuf.get_height()
-                scale = max(scale_x, scale_y)
-                
-                new_width = int(pixbuf.get_width() * scale)
-                new_height = int(pixbuf.get_height() * scale)
-                
-                # Center the image
-                x_offset = (width - new_width) // 2
-                y_offset = (height - new_height) // 2
-                
-                # Scale the image
-                scaled_pixbuf = pixbuf.scale_simple(new_width, new_height, GdkPixbuf.InterpType.BILINEAR)
-                
-                # Draw the image
-                Gdk.cairo_set_source_pixbuf(cr, scaled_pixbuf, x_offset, y_offset)
-                cr.paint_with_alpha(0.7)  # Increased opacity for better visibility
-                
-            except Exception as e:
-                print(f"Error loading background image: {e}")
+        cache = get_render_cache()
+        try:
+            # Background colour and scaled image are composed once per size and reused
+            surface = cache.get_background(
+                bg_color, bg_image, width, height,
+                widget.get_scale_factor(), widget.get_window()
+            )
+        except Exception as e:
+            print(f"Error loading background image: {e}")
+            surface = cache.get_background(bg_color, '', width, height, widget.get_scale_factor())
+
+        cr.set_source_surface(surface, 0, 0)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        cr.paint()
+        cr.set_operator(cairo.OPERATOR_OVER)
 
-        return False 
\ No newline at end of file
+        return False
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Cache of pre-rendered notification window backgrounds."""
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Gdk', '3.0')
+from gi.repository import Gdk, GdkPixbuf
+from collections import OrderedDict
+import cairo
+import os
+from metrics.registry import CACHE_LOOKUPS
+
+# Opacity of the background image over the background colour
+IMAGE_ALPHA = 0.7
+
+class RenderCache:
+    """LRU cache of fully composed background surfaces and parsed colours.
+
+    A background is keyed by (image path, mtime, colour, size, scale factor) and
+    holds the colour fill with the decoded, scaled image already painted on top,
+    so redrawing a notification window is a single paint. Decoded source images
+    are cached separately so windows of different sizes share one decode.
+    """
+
+    def __init__(self, max_backgrounds=8, max_images=2):
+        """Create an empty cache with the given LRU limits."""
+        self.max_backgrounds = max_backgrounds
+        self.max_images = max_images
+        self._backgrounds = OrderedDict()
+        self._images = OrderedDict()
+        self._colors = {}
+
+    def get_color(self, spec):
+        """Return a colour string parsed into an (r, g, b, a) tuple."""
+        color = self._colors.get(spec)
+        if color is None:
+            rgba = Gdk.RGBA()
+            if not rgba.parse(spec):
+                rgba.parse('rgba(0, 0, 0, 0.9)')
+            color = (rgba.red, rgba.green, rgba.blue, rgba.alpha)
+            self._colors[spec] = color
+        return color
+
+    def get_background(self, color_spec, image_path, width, height, scale, window=None):
+        """Return a surface holding the composed background for a window size.
+
+        Args:
+            color_spec (str): Background colour as accepted by Gdk.RGBA.parse.
+            image_path (str): Background image, or empty for a plain colour.
+            width (int): Window width in logical pixels.
+            height (int): Window height in logical pixels.
+            scale (int): Window scale factor.
+            window (Gdk.Window): Window the surface will be painted on, if realized.
+        """
+        mtime = None
+        if image_path:
+            try:
+                mtime = os.stat(image_path).st_mtime
+            except OSError:
+                image_path = ''
+
+        key = (image_path, mtime, color_spec, width, height, scale)
+        surface = self._backgrounds.get(key)
+        if surface is not None:
+            self._backgrounds.move_to_end(key)
+            CACHE_LOOKUPS.inc(cache='background', result='hit')
+            return surface
+        CACHE_LOOKUPS.inc(cache='background', result='miss')
+
+        surface = self._render(color_spec, image_path, mtime, width, height, scale, window)
+        self._backgrounds[key] = surface
+        while len(self._backgrounds) > self.max_backgrounds:
+            self._backgrounds.popitem(last=False)
+        return surface
+
+    def _render(self, color_spec, image_path, mtime, width, height, scale, window):
+        """Compose the background colour and image into a new surface."""
+        if window is not None:
+            surface = window.create_similar_image_surface(
+                cairo.FORMAT_ARGB32, width * scale, height * scale, scale
+            )
+        else:
+            surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width * scale, height * scale)
+            surface.set_device_scale(scale, scale)
+
+        cr = cairo.Context(surface)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        cr.set_source_rgba(*self.get_color(color_spec))
+        cr.paint()
+        cr.set_operator(cairo.OPERATOR_OVER)
+
+        if image_path:
+            pixbuf = self._load_image(image_path, mtime)
+
+            # Scale the image to cover the whole window in device pixels, keeping aspect ratio
+            cover = max(width * scale / pixbuf.get_width(), height * scale / pixbuf.get_height())
+            new_width = int(pixbuf.get_width() * cover)
+            new_height = int(pixbuf.get_height() * cover)
+            scaled = pixbuf.scale_simple(new_width, new_height, GdkPixbuf.InterpType.BILINEAR)
+
+            # Draw at device resolution, centered
+            cr.save()
+            cr.scale(1 / scale, 1 / scale)
+            Gdk.cairo_set_source_pixbuf(
+                cr, scaled,
+                (width * scale - new_width) // 2,
+                (height * scale - new_height) // 2
+            )
+            cr.paint_with_alpha(IMAGE_ALPHA)
+            cr.restore()
+
+        surface.flush()
+        return surface
+
+    def _load_image(self, image_path, mtime):
+        """Decode an image file, reusing an earlier decode of the same version."""
+        key = (image_path, mtime)
+        pixbuf = self._images.get(key)
+        if pixbuf is not None:
+            self._images.move_to_end(key)
+            return pixbuf
+
+        pixbuf = GdkPixbuf.Pixbuf.new_from_file(image_path)
+        self._images[key] = pixbuf
+        while len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return pixbuf
+
+_render_cache = None
+
+def get_render_cache():
+    """Return the render cache shared by all notification windows."""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+    return _render_cache
@@ -2,46 +2,30 @@
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, Gdk, GdkPixbuf
-import json
 import os
 import shutil
 from pathlib import Path
 import logging
+from notification.sound import get_sound_player
+from storage.settings_store import get_settings
 
 logger = logging.getLogger(__name__)
 
 class SettingsWindow(Gtk.Window):
     """Settings window for customizing notifications."""
     
-    def __init__(self, parent_settings=None):
+    def __init__(self, calendars=None):
         logger.debug("Initializing Settings Window")
         super().__init__(title="Meeting Notifier Settings")
         
-        # Initialize settings with defaults
-        self.settings = {
-            'background_color': 'rgba(0, 0, 0, 0.9)',
-            'background_image': '',
-            'notification_sound': '',  # Will be set after checking available sounds
-            'sound_enabled': True,
-            'text_color': '#ffffff',
-            'button_color': '#4a4a4a',
-            'button_text_color': '#ffffff',
-            'opacity': 0.85
-        }
-        
-        # Load existing settings if available
-        self.settings_file = os.path.expanduser('~/.config/meeting-notifier/settings.json')
-        
-        # If parent settings are provided, use them instead of loading from file
-        if parent_settings:
-            logger.debug(f"Using parent settings: {parent_settings}")
-            self.settings.update(parent_settings)
-        else:
-            logger.debug("Loading settings from file")
-            self.load_settings()
-        
-        # Set default sound if none is set
-        if not self.settings['notification_sound']:
+        # Edit a copy of the shared settings; it is written back on save
+        self.store = get_settings()
+        self.settings = self.store.as_dict()
+        self.settings_file = self.store.path
+        self.calendars = calendars or []
+        
+        # Set default sound if none is set or the configured one is missing
+        if not self.settings['notification_sound'] or not os.path.exists(self.settings['notification_sound']):
             logger.debug("No notification sound set, setting default")
             self.set_default_sound()
             
@@ -353,6 +337,85 @@ class SettingsWindow(Gtk.Window):
         
         notebook.append_page(sound_box, Gtk.Label(label="Sound"))
         
+        # Notifications tab
+        notifications_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
+        notifications_box.set_margin_top(15)
+        notifications_box.set_margin_bottom(15)
+        notifications_box.set_margin_start(15)
+        notifications_box.set_margin_end(15)
+        
+        # Timing settings frame
+        timing_frame = Gtk.Frame(label="Timing")
+        timing_frame.get_style_context().add_class('settings-frame')
+        timing_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
+        timing_box.set_margin_top(10)
+        timing_box.set_margin_bottom(10)
+        timing_box.set_margin_start(10)
+        timing_box.set_margin_end(10)
+        
+        # Lead time before the meeting starts
+        lead_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        lead_label = Gtk.Label(label="Notify before meeting (minutes):")
+        lead_label.get_style_context().add_class('settings-label')
+        self.lead_spin = Gtk.SpinButton.new_with_range(0, 30, 1)
+        self.lead_spin.set_value(self.settings['notification_lead_minutes'])
+        lead_box.pack_start(lead_label, False, False, 0)
+        lead_box.pack_start(self.lead_spin, False, False, 0)
+        timing_box.pack_start(lead_box, False, False, 0)
+        
+        # Snooze durations
+        snooze_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        snooze_label = Gtk.Label(label="Snooze options (minutes):")
+        snooze_label.get_style_context().add_class('settings-label')
+        self.snooze_entry = Gtk.Entry()
+        self.snooze_entry.set_text(', '.join(str(minutes) for minutes in self.settings['snooze_minutes']))
+        self.snooze_entry.set_tooltip_text("Comma-separated, e.g. 5, 10, 15")
+        snooze_box.pack_start(snooze_label, False, False, 0)
+        snooze_box.pack_start(self.snooze_entry, True, True, 0)
+        timing_box.pack_start(snooze_box, False, False, 0)
+        
+        timing_frame.add(timing_box)
+        notifications_box.pack_start(timing_frame, False, False, 0)
+        
+        # Calendar polling frame
+        polling_frame = Gtk.Frame(label="Calendar Polling")
+        polling_frame.get_style_context().add_class('settings-frame')
+        polling_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
+        polling_box.set_margin_top(10)
+        polling_box.set_margin_bottom(10)
+        polling_box.set_margin_start(10)
+        polling_box.set_margin_end(10)
+        
+        policy_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        policy_label = Gtk.Label(label="Check for changes:")
+        policy_label.get_style_context().add_class('settings-label')
+        self.poll_policy_combo = Gtk.ComboBoxText()
+        self.poll_policy_combo.append('adaptive', "Adaptive (often before meetings, rarely otherwise)")
+        self.poll_policy_combo.append('fixed', "At a fixed interval")
+        self.poll_policy_combo.set_active_id(self.settings['poll_policy'])
+        self.poll_policy_combo.connect("changed", self.on_poll_policy_changed)
+        policy_box.pack_start(policy_label, False, False, 0)
+        policy_box.pack_start(self.poll_policy_combo, False, False, 0)
+        polling_box.pack_start(policy_box, False, False, 0)
+        
+        interval_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        interval_label = Gtk.Label(label="Fixed interval (minutes):")
+        interval_label.get_style_context().add_class('settings-label')
+        self.poll_interval_spin = Gtk.SpinButton.new_with_range(1, 60, 1)
+        self.poll_interval_spin.set_value(self.settings['poll_interval_minutes'])
+        self.poll_interval_spin.set_sensitive(self.settings['poll_policy'] == 'fixed')
+        interval_box.pack_start(interval_label, False, False, 0)
+        interval_box.pack_start(self.poll_interval_spin, False, False, 0)
+        polling_box.pack_start(interval_box, False, False, 0)
+        
+        polling_frame.add(polling_box)
+        notifications_box.pack_start(polling_frame, False, False, 0)
+        
+        notebook.append_page(notifications_box, Gtk.Label(label="Notifications"))
+        
+        # Calendars tab
+        notebook.append_page(self.create_calendar_chooser(), Gtk.Label(label="Calendars"))
+        
         # Save button
         save_button = Gtk.Button(label="Save Changes")
         save_button.get_style_context().add_class('save-button')
@@ -362,6 +425,15 @@ class SettingsWindow(Gtk.Window):
         
         self.show_all()
     
+    def get_snooze_minutes(self):
+        """Parse the snooze durations entry, keeping the saved ones if it is invalid."""
+        try:
+            minutes = sorted({int(value) for value in self.snooze_entry.get_text().split(',') if value.strip()})
+        except ValueError:
+            return self.settings['snooze_minutes']
+        minutes = [value for value in minutes if value > 0]
+        return minutes or self.settings['snooze_minutes']
+        
     def create_image_filter(self):
         """Create a file filter for image files."""
         filter_images = Gtk.FileFilter()
@@ -384,21 +456,9 @@ class SettingsWindow(Gtk.Window):
         sound_filter.add_pattern("*.wav")
         return sound_filter
     
-    def load_settings(self):
-        """Load settings from file."""
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    self.settings.update(json.load(f))
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-    
     def save_settings(self):
         """Save settings to file."""
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            
             # Update settings before saving
             self.settings.update({
                 'background_color': self.color_button.get_rgba().to_string(),
@@ -407,11 +467,17 @@ class SettingsWindow(Gtk.Window):
                 'button_text_color': self.button_text_color_button.get_rgba().to_string(),
                 'opacity': self.opacity_scale.get_value(),
                 'sound_enabled': self.sound_switch.get_active(),
+                'notification_lead_minutes': self.lead_spin.get_value_as_int(),
+                'snooze_minutes': self.get_snooze_minutes(),
+                'poll_policy': self.poll_policy_combo.get_active_id(),
+                'poll_interval_minutes': self.poll_interval_spin.get_value_as_int(),
+                'calendar_ids': self.get_selected_calendar_ids(),
                 'notification_sound': self.settings['notification_sound']  # Preserve the sound file path
             })
             
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f)
+            self.store.update(self.settings)
+            self.store.save()
+            return True
         except Exception as e:
             print(f"Error saving settings: {e}")
             # Add error dialog to show the error to the user
@@ -425,6 +491,7 @@ class SettingsWindow(Gtk.Window):
             dialog.format_secondary_text(str(e))
             dialog.run()
             dialog.destroy()
+            return False
     
     def on_color_selected(self, button):
         """Handle background color selection."""
@@ -477,32 +544,17 @@ class SettingsWindow(Gtk.Window):
             self.settings['notification_sound'] = new_path
     
     def play_sound(self, sound_file):
-        """Play a sound file using available sound players."""
+        """Play a sound file through the shared, non-blocking sound player."""
         if not sound_file or not os.path.exists(sound_file):
             logger.error(f"Sound file not found: {sound_file}")
             return False
 
-        # List of possible sound players and their commands with high quality settings
-        players = [
-            ('ffplay', f'ffplay -nodisp -autoexit -loglevel quiet -af "volume=0.75" "{sound_file}"'),
-            ('play', f'play -q "{sound_file}" vol 0.75'),  # from sox package
-            ('aplay', f'aplay -q "{sound_file}"'),
-            ('paplay', f'paplay --volume=32000 "{sound_file}"'),
-        ]
-
-        for player, command in players:
-            # Check if the player is installed
-            if os.system(f'which {player} >/dev/null 2>&1') == 0:
-                try:
-                    result = os.system(command)
-                    if result == 0:
-                        return True
-                except Exception as e:
-                    logger.error(f"Error playing sound with {player}: {e}")
-                    continue
+        player = get_sound_player()
+        if player.play(sound_file):
+            return True
 
-        # If we get here, no player worked
-        logger.error("No available sound player found. Please install pulseaudio-utils, alsa-utils, sox, or ffmpeg")
+        # If we get here, no backend worked
+        logger.error("No available sound player found. Please install GStreamer, pulseaudio-utils, alsa-utils, sox, or ffmpeg")
         dialog = Gtk.MessageDialog(
             transient_for=self,
             flags=0,
@@ -512,7 +564,8 @@ class SettingsWindow(Gtk.Window):
         )
         dialog.format_secondary_text(
             "Please install one of the following packages to enable sound:\n"
-            "- ffmpeg (recommended)\n"
+            "- gir1.2-gstreamer-1.0 (recommended)\n"
+            "- ffmpeg\n"
             "- pulseaudio-utils\n"
             "- alsa-utils\n"
             "- sox"
@@ -526,14 +579,18 @@ class SettingsWindow(Gtk.Window):
         if self.settings['notification_sound'] and os.path.exists(self.settings['notification_sound']):
             self.play_sound(self.settings['notification_sound'])
     
+    def on_poll_policy_changed(self, combo):
+        """Enable the interval field only for the fixed policy."""
+        self.poll_interval_spin.set_sensitive(combo.get_active_id() == 'fixed')
+    
     def on_sound_enabled_changed(self, switch, gparam):
         """Handle sound enable/disable switch changes."""
         self.settings['sound_enabled'] = switch.get_active()
     
     def on_save_clicked(self, button):
         """Save settings and close window."""
-        self.save_settings()
-        self.destroy()
+        if self.save_settings():
+            self.destroy()
     
     def set_default_sound(self):
         """Set the default notification sound by checking common system sound locations."""
@@ -602,4 +659,86 @@ class SettingsWindow(Gtk.Window):
         sound_file_box.pack_start(self.sound_chooser, True, True, 0)
         sound_file_box.pack_start(test_sound_button, False, False, 0)
         
-        return sound_file_box 
\ No newline at end of file
+        return sound_file_box
+    
+    def create_calendar_chooser(self):
+        """Create the list of calendars to watch for meetings."""
+        calendars_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
+        calendars_box.set_margin_top(15)
+        calendars_box.set_margin_bottom(15)
+        calendars_box.set_margin_start(15)
+        calendars_box.set_margin_end(15)
+        
+        calendars_frame = Gtk.Frame(label="Watched Calendars")
+        calendars_frame.get_style_context().add_class('settings-frame')
+        list_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        list_box.set_margin_top(10)
+        list_box.set_margin_bottom(10)
+        list_box.set_margin_start(10)
+        list_box.set_margin_end(10)
+        
+        self.calendar_list_box = list_box
+        self.calendar_checks = {}
+        self.fill_calendar_checks()
+        
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scrolled.set_min_content_height(200)
+        scrolled.add(list_box)
+        calendars_frame.add(scrolled)
+        calendars_box.pack_start(calendars_frame, True, True, 0)
+        
+        return calendars_box
+    
+    def fill_calendar_checks(self):
+        """Show one check box per calendar in the Calendars tab, keeping any unsaved choices."""
+        edited = {calendar_id: check.get_active() for calendar_id, check in self.calendar_checks.items()}
+        for child in self.calendar_list_box.get_children():
+            child.destroy()
+        self.calendar_checks = {}
+        if not self.calendars:
+            label = Gtk.Label(label="Calendar list is not available yet.")
+            label.get_style_context().add_class('settings-label')
+            self.calendar_list_box.pack_start(label, False, False, 0)
+        
+        selected_ids = self.settings.get('calendar_ids')
+        for calendar in self.calendars:
+            check = Gtk.CheckButton(label=calendar['summary'])
+            if selected_ids is None:
+                # Follow the selection made in Google Calendar until the user picks
+                check.set_active(calendar['selected'] or calendar['primary'])
+            else:
+                check.set_active(calendar['id'] in selected_ids)
+            if calendar['id'] in edited:
+                check.set_active(edited[calendar['id']])
+            self.calendar_list_box.pack_start(check, False, False, 0)
+            self.calendar_checks[calendar['id']] = check
+        self.calendar_list_box.show_all()
+        
+    def set_calendars(self, calendars):
+        """Replace the listed calendars, e.g. once the worker has fetched them."""
+        self.calendars = calendars or []
+        self.fill_calendar_checks()
+        
+    def get_selected_calendar_ids(self):
+        """Return the checked calendar ids, or None to follow the Google Calendar selection.
+        
+        Raises:
+            ValueError: If every calendar was unchecked.
+        """
+        if not self.calendar_checks:
+            return self.settings.get('calendar_ids')
+        checked = [
+            calendar_id for calendar_id, check in self.calendar_checks.items()
+            if check.get_active()
+        ]
+        if not checked:
+            raise ValueError("Select at least one calendar to watch for meetings.")
+        google_default = [
+            calendar['id'] for calendar in self.calendars
+            if calendar['selected'] or calendar['primary']
+        ]
+        if checked == google_default:
+            # Keep following Google Calendar, so calendars added there later are synced too
+            return None
+        return checked
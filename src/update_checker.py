@@ -1,5 +1,4 @@
 """Update checker for the application."""
-import requests
 import json
 import logging
 from datetime import datetime, timedelta
@@ -8,6 +7,8 @@ from .version import VERSION, get_version
 
 logger = logging.getLogger(__name__)
 
+RELEASES_URL = 'https://api.github.com/repos/Ofear/fullscreen-meeting-notifier/releases'
+
 class UpdateChecker:
     """Checks for application updates."""
     
@@ -17,28 +18,55 @@ class UpdateChecker:
         self.last_check_file = self.config_dir / 'last_update_check.json'
         self.check_interval = timedelta(days=7)  # Check weekly
         
-    def should_check(self):
-        """Determine if it's time to check for updates."""
+    def load_last_check(self):
+        """Return the saved result of the last update check, or an empty dict."""
         if not self.last_check_file.exists():
-            return True
+            return {}
             
         try:
             with open(self.last_check_file) as f:
-                data = json.load(f)
-                last_check = datetime.fromisoformat(data['last_check'])
-                return datetime.now() - last_check >= self.check_interval
+                return json.load(f)
         except Exception as e:
             logger.error(f"Error reading last update check: {e}")
+            return {}
+            
+    def should_check(self):
+        """Determine if it's time to check for updates."""
+        data = self.load_last_check()
+        try:
+            last_check = datetime.fromisoformat(data['last_check'])
+            return datetime.now() - last_check >= self.check_interval
+        except (KeyError, ValueError):
             return True
             
-    def save_last_check(self):
-        """Save the timestamp of the last update check."""
+    def clear_last_check_time(self):
+        """Make the next check run now, keeping the saved release and its ETag."""
+        data = self.load_last_check()
+        if data.pop('last_check', None) is None:
+            return
+        try:
+            with open(self.last_check_file, 'w') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.error(f"Error saving update check: {e}")
+            
+    def save_last_check(self, etag=None, latest_version=None, changelog_url=None):
+        """Save the timestamp of the last update check and the release it found.
+        
+        Args:
+            etag (str): ETag of the releases response, sent as If-None-Match next time.
+            latest_version (str): Newest released version, None if there are no releases.
+            changelog_url (str): Page of the newest release.
+        """
         self.config_dir.mkdir(parents=True, exist_ok=True)
         try:
             with open(self.last_check_file, 'w') as f:
                 json.dump({
                     'last_check': datetime.now().isoformat(),
-                    'current_version': VERSION
+                    'current_version': VERSION,
+                    'etag': etag,
+                    'latest_version': latest_version,
+                    'changelog_url': changelog_url
                 }, f)
         except Exception as e:
             logger.error(f"Error saving update check: {e}")
@@ -52,28 +80,37 @@ class UpdateChecker:
         if not self.should_check():
             return None
             
+        # Imported on first use; requests is slow to import and not needed at startup
+        import requests
+        
+        previous = self.load_last_check()
+        headers = {}
+        if previous.get('etag'):
+            # GitHub answers 304 without a body (and without using rate limit) if nothing changed
+            headers['If-None-Match'] = previous['etag']
+            
         try:
-            # First check if there are any releases
-            response = requests.get(
-                'https://api.github.com/repos/Ofear/fullscreen-meeting-notifier/releases',
-                timeout=5
-            )
-            response.raise_for_status()
-            releases = response.json()
+            # Only the newest release is needed
+            response = requests.get(RELEASES_URL, params={'per_page': 1}, headers=headers, timeout=5)
+            if response.status_code == 304:
+                logger.debug("No new releases since the last check")
+                latest_version = previous.get('latest_version')
+                changelog_url = previous.get('changelog_url')
+            else:
+                response.raise_for_status()
+                releases = response.json()
+                latest_version = changelog_url = None
+                if releases:
+                    # Get latest release; releases are sorted by date, newest first
+                    latest_version = releases[0]['tag_name'].lstrip('v')
+                    changelog_url = releases[0]['html_url']
+            self.save_last_check(response.headers.get('ETag', previous.get('etag')), latest_version, changelog_url)
             
-            if not releases:  # No releases yet
+            if latest_version is None:  # No releases yet
                 logger.info("No releases available yet")
-                self.save_last_check()
                 return None
                 
-            # Get latest release
-            latest = releases[0]  # Releases are sorted by date, newest first
-            latest_version = latest['tag_name'].lstrip('v')
-            changelog_url = latest['html_url']
-            
             has_update = latest_version > VERSION
-            self.save_last_check()
-            
             return (has_update, latest_version, changelog_url)
             
         except Exception as e:
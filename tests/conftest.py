@@ -0,0 +1,5 @@
+"""Test setup: application modules are imported from src/ as src/main.py does."""
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
@@ -0,0 +1,96 @@
+"""Keyed diffs of the meetings list model."""
+from datetime import datetime, timedelta, timezone
+import pytest
+
+pytest.importorskip('gi')
+
+from ui.agenda_model import AgendaModel  # noqa: E402
+from gcalendar.event import Event  # noqa: E402
+
+BASE = datetime(2024, 3, 4, 9, 0, tzinfo=timezone.utc)
+
+def _event(event_id, start, summary=None):
+    """A 30-minute meeting starting start minutes after BASE."""
+    start_time = BASE + timedelta(minutes=start)
+    return Event(event_id, 'primary', summary or event_id, start_time, start_time + timedelta(minutes=30))
+
+def _rows(model):
+    return [model.store.get_item(i) for i in range(model.store.get_n_items())]
+
+def _ids(model):
+    return [item.event_id for item in _rows(model)]
+
+def _items(model):
+    return {item.event_id: item for item in _rows(model)}
+
+@pytest.fixture
+def model():
+    return AgendaModel()
+
+@pytest.fixture
+def splices(model):
+    """(position, removed, added) of every items-changed signal."""
+    changes = []
+    model.store.connect('items-changed', lambda store, *change: changes.append(change))
+    return changes
+
+def test_fills_in_start_order(model):
+    model.update([_event('c', 20), _event('a', 0), _event('b', 10)])
+    assert _ids(model) == ['a', 'b', 'c']
+
+def test_ties_are_ordered_by_id(model):
+    model.update([_event('b', 0), _event('a', 0)])
+    assert _ids(model) == ['a', 'b']
+
+def test_unchanged_events_emit_nothing(model, splices):
+    events = [_event('a', 0), _event('b', 10)]
+    model.update(events)
+    splices.clear()
+    model.update([_event('a', 0), _event('b', 10)])
+    assert splices == []
+
+def test_unchanged_rows_keep_their_items(model):
+    model.update([_event('a', 0), _event('b', 10), _event('c', 20)])
+    before = _items(model)
+    model.update([
+        _event('a', 0),
+        _event('b', 10, summary='Renamed'),
+        _event('d', 30),
+    ])
+    after = _items(model)
+    assert _ids(model) == ['a', 'b', 'd']
+    assert after['a'] is before['a']
+    assert after['b'] is not before['b']
+    assert after['b'].event.summary == 'Renamed'
+
+def test_unchanged_rows_get_the_new_event_object(model):
+    model.update([_event('a', 0)])
+    fresh = _event('a', 0)
+    model.update([fresh])
+    assert model.store.get_item(0).event is fresh
+
+def test_removals_are_spliced_per_contiguous_run(model, splices):
+    model.update([_event(name, i * 10) for i, name in enumerate('abcde')])
+    splices.clear()
+    model.update([_event('a', 0), _event('e', 40)])
+    assert _ids(model) == ['a', 'e']
+    assert splices == [(1, 3, 0)]
+
+def test_additions_are_merged_in_order(model, splices):
+    model.update([_event('a', 0), _event('d', 30)])
+    splices.clear()
+    model.update([_event(name, i * 10) for i, name in enumerate('abcde')])
+    assert _ids(model) == ['a', 'b', 'c', 'd', 'e']
+    assert splices == [(1, 0, 2), (4, 0, 1)]
+
+def test_rescheduled_event_moves(model, splices):
+    model.update([_event('a', 0), _event('b', 10), _event('c', 20)])
+    splices.clear()
+    model.update([_event('a', 30), _event('b', 10), _event('c', 20)])
+    assert _ids(model) == ['b', 'c', 'a']
+    assert splices == [(0, 1, 0), (2, 0, 1)]
+
+def test_empty_update_clears(model):
+    model.update([_event('a', 0), _event('b', 10)])
+    model.update([])
+    assert model.store.get_n_items() == 0
@@ -0,0 +1,280 @@
+"""Incremental sync into the event store against a scripted Calendar API."""
+from datetime import datetime, timedelta
+import time
+import pytest
+
+httplib2 = pytest.importorskip('httplib2')
+pytest.importorskip('googleapiclient')
+
+import pytz  # noqa: E402
+from googleapiclient.errors import HttpError  # noqa: E402
+from gcalendar.calendar_sync import CalendarSync  # noqa: E402
+from gcalendar.event_store import EventStore  # noqa: E402
+from gcalendar.resilience import CircuitBreaker, RetryPolicy  # noqa: E402
+
+# Sync prunes events that ended a day ago, so resources are placed around the real time
+NOW = datetime.now(pytz.utc).replace(microsecond=0)
+
+def _http_error(status):
+    return HttpError(httplib2.Response({'status': status}), b'')
+
+def _resource(event_id, start=60, duration=30, status='confirmed'):
+    """An events.list item starting start minutes from now."""
+    start_time = NOW + timedelta(minutes=start)
+    return {
+        'id': event_id,
+        'status': status,
+        'summary': event_id,
+        'start': {'dateTime': start_time.isoformat()},
+        'end': {'dateTime': (start_time + timedelta(minutes=duration)).isoformat()},
+    }
+
+class FakeEventsApi:
+    """Answers events.list requests from per-calendar scripts, in place of a batch."""
+
+    def __init__(self):
+        self.pages = {}  # calendar id -> pages of items returned to a full sync
+        self.changes = {}  # calendar id -> items returned to an incremental sync
+        self.expired = set()  # calendar ids whose sync token is answered with 410
+        self.errors = {}  # calendar id -> error every request for it fails with
+        self.offline = False
+        self.requests = []
+        self.batches = []  # Calendar ids sent in each batch
+
+    def list(self, **params):
+        return params
+
+    def list_next(self, params, result):
+        return dict(params, pageToken=result['nextPageToken']) if 'nextPageToken' in result else None
+
+    def execute(self, params):
+        """Answer a single request, like CalendarSync._execute."""
+        result, error = self.execute_batch({params['calendarId']: params})[params['calendarId']]
+        if error is not None:
+            raise error
+        return result
+
+    def execute_batch(self, requests):
+        if self.offline:
+            raise OSError("network is unreachable")
+        self.requests.extend(requests.values())
+        self.batches.append(sorted(requests))
+        return {calendar_id: self._answer(params) for calendar_id, params in requests.items()}
+
+    def _answer(self, params):
+        calendar_id = params['calendarId']
+        if calendar_id in self.errors:
+            return None, self.errors[calendar_id]
+        if 'syncToken' in params:
+            if calendar_id in self.expired:
+                return None, _http_error(410)
+            return {'items': self.changes.get(calendar_id, []), 'nextSyncToken': f'{calendar_id}-next'}, None
+        pages = self.pages.get(calendar_id, [[]])
+        page = int(params.get('pageToken', 0))
+        result = {'items': pages[page]}
+        if page + 1 < len(pages):
+            result['nextPageToken'] = str(page + 1)
+        else:
+            result['nextSyncToken'] = f'{calendar_id}-full'
+        return result, None
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(str(tmp_path / 'events.db'))
+    yield store
+    store.close()
+
+@pytest.fixture
+def api():
+    return FakeEventsApi()
+
+@pytest.fixture
+def calendar(store, api):
+    """A CalendarSync wired to the fake API instead of an HTTP client."""
+    calendar = CalendarSync.__new__(CalendarSync)
+    calendar.store = store
+    calendar.set_calendar_ids(['primary'])
+    calendar.service = type('Service', (), {'events': lambda self: api})()
+    calendar.retry_policy = RetryPolicy()
+    calendar.breaker = CircuitBreaker()
+    calendar.timezone = pytz.utc
+    calendar._timezone_stale = False
+    calendar._execute = api.execute
+    calendar._execute_batch = api.execute_batch
+    return calendar
+
+def _stored_ids(store, calendar_id='primary'):
+    return sorted(
+        event['id'] for _, event in store.iter_events_between(0, float('inf'), [calendar_id])
+    )
+
+def _go_offline_after_first_page(api):
+    return lambda: setattr(api, 'offline', True)
+
+def test_first_sync_follows_pages_and_saves_token(calendar, store, api):
+    api.pages['primary'] = [[_resource('a')], [_resource('b')]]
+    calendar.sync()
+    assert _stored_ids(store) == ['a', 'b']
+    assert store.get_sync_token('primary') == 'primary-full'
+    assert [request.get('pageToken') for request in api.requests] == [None, '1']
+    assert 'timeMax' in api.requests[0]
+
+def test_incremental_sync_applies_changes(calendar, store, api):
+    api.pages['primary'] = [[_resource('a'), _resource('b')]]
+    calendar.sync()
+    api.changes['primary'] = [_resource('a', start=90), _resource('b', status='cancelled'), _resource('c')]
+    calendar.sync()
+    assert _stored_ids(store) == ['a', 'c']
+    assert api.requests[-1]['syncToken'] == 'primary-full'
+    assert 'timeMin' not in api.requests[-1]
+    assert store.get_sync_token('primary') == 'primary-next'
+
+def test_expired_token_resyncs_and_drops_deleted_events(calendar, store, api):
+    api.pages['primary'] = [[_resource('kept'), _resource('deleted-meanwhile')]]
+    calendar.sync()
+    api.expired.add('primary')
+    api.pages['primary'] = [[_resource('kept')], [_resource('new')]]
+    calendar.sync()
+    assert _stored_ids(store) == ['kept', 'new']
+    assert store.get_sync_token('primary') == 'primary-full'
+
+def test_interrupted_resync_keeps_last_known_schedule(calendar, store, api):
+    api.pages['primary'] = [[_resource('a'), _resource('b')]]
+    calendar.sync()
+    api.expired.add('primary')
+    api.pages['primary'] = [[_resource('a')], [_resource('c')]]
+    with pytest.raises(OSError):
+        calendar.sync(on_page=_go_offline_after_first_page(api))
+    # Nothing is dropped and the old token is kept until a resync completes
+    assert _stored_ids(store) == ['a', 'b']
+    assert store.get_sync_token('primary') == 'primary-full'
+
+    api.offline = False
+    calendar.sync()
+    assert _stored_ids(store) == ['a', 'c']
+
+def test_horizon_renewal_waits_for_complete_resync(calendar, store, api):
+    api.pages['primary'] = [[_resource('a')]]
+    calendar.sync()
+    store.set_metadata('sync_horizon:primary', str(time.time() + 3600))
+    api.offline = True
+    with pytest.raises(OSError):
+        calendar.sync()
+    assert _stored_ids(store) == ['a']
+    assert store.get_sync_token('primary') == 'primary-full'
+
+    api.offline = False
+    api.pages['primary'] = [[_resource('b')]]
+    calendar.sync()
+    assert 'syncToken' not in api.requests[-1]
+    assert _stored_ids(store) == ['b']
+    horizon, _ = store.get_metadata('sync_horizon:primary')
+    assert float(horizon) > time.time() + timedelta(days=27).total_seconds()
+
+def test_selected_calendars_share_each_batch_round(calendar, store, api):
+    calendar.set_calendar_ids(['primary', 'team'])
+    api.pages['primary'] = [[_resource('a')]]
+    api.pages['team'] = [[_resource('b')], [_resource('c')]]
+    calendar.sync()
+    assert api.batches == [['primary', 'team'], ['team']]
+    assert _stored_ids(store, 'team') == ['b', 'c']
+
+def test_calendar_selection_follows_cached_calendar_list(calendar, store):
+    calendar.set_calendar_ids(None)
+    store.save_calendars([
+        {'id': 'me@example.com', 'summary': 'Me', 'primary': True, 'selected': False},
+        {'id': 'team', 'summary': 'Team', 'primary': False, 'selected': True},
+        {'id': 'holidays', 'summary': 'Holidays', 'primary': False, 'selected': False},
+    ])
+    assert calendar.get_selected_calendar_ids() == ['me@example.com', 'team']
+
+def test_permanently_failing_calendar_is_skipped(calendar, store, api):
+    calendar.set_calendar_ids(['primary', 'unsubscribed'])
+    api.pages['primary'] = [[_resource('a')]]
+    api.errors['unsubscribed'] = _http_error(404)
+    calendar.sync()
+    assert _stored_ids(store) == ['a']
+    assert store.get_sync_token('unsubscribed') is None
+
+def test_transient_calendar_error_fails_the_sync(calendar, api):
+    calendar.set_calendar_ids(['primary', 'team'])
+    api.errors['team'] = _http_error(503)
+    with pytest.raises(HttpError):
+        calendar.sync()
+
+def test_sync_fails_when_every_calendar_fails(calendar, api):
+    calendar.set_calendar_ids(['primary', 'team'])
+    api.errors['primary'] = api.errors['team'] = _http_error(404)
+    with pytest.raises(HttpError):
+        calendar.sync()
+
+def test_window_fetch_follows_every_page_and_merges_calendars(calendar, api):
+    calendar.store = None
+    calendar.set_calendar_ids(['primary', 'team'])
+    api.pages['primary'] = [[_resource('p1', 10), _resource('shared', 30)], [_resource('p2', 70)]]
+    api.pages['team'] = [[_resource('t1', 20), _resource('shared', 30)], [_resource('t2', 40)]]
+    partials = []
+    events = calendar.get_upcoming_events(
+        minutes_ahead=24 * 60,
+        on_partial=lambda events: partials.append([event.id for event in events])
+    )
+    assert [event.id for event in events] == ['p1', 't1', 'shared', 't2', 'p2']
+    assert partials == [['p1', 'shared'], ['p1', 't1', 'shared', 'p2']]
+    assert api.batches[0] == ['primary', 'team']
+
+def test_all_day_events_are_ordered_in_the_calendar_timezone(calendar, api):
+    calendar.store = None
+    calendar.timezone = pytz.timezone('Europe/Berlin')
+    day = NOW.astimezone(calendar.timezone).date() + timedelta(days=2)
+    # Half an hour before UTC midnight, but after midnight in Berlin
+    late_call = datetime.combine(day, datetime.min.time(), pytz.utc) - timedelta(minutes=30)
+    all_day = {
+        'id': 'all-day',
+        'summary': 'Offsite',
+        'start': {'date': day.isoformat()},
+        'end': {'date': (day + timedelta(days=1)).isoformat()},
+    }
+    # A server sorting all-day events at UTC midnight puts the call first
+    api.pages['primary'] = [[_resource('late-call', start=(late_call - NOW).total_seconds() / 60), all_day]]
+    events = calendar.get_upcoming_events(minutes_ahead=4 * 24 * 60)
+    assert [event.id for event in events] == ['all-day', 'late-call']
+
+def test_short_window_only_includes_meetings_about_to_start(calendar, api):
+    calendar.store = None
+    api.pages['primary'] = [[_resource('running', -10), _resource('soon', 3)]]
+    events = calendar.get_upcoming_events(minutes_ahead=5)
+    assert [event.id for event in events] == ['soon']
+
+def test_failed_poll_counts_once_towards_the_breaker(calendar, api):
+    calendar.set_calendar_ids(['primary', 'team'])
+    api.errors['primary'] = api.errors['team'] = _http_error(503)
+    with pytest.raises(HttpError):
+        calendar.get_upcoming_events(minutes_ahead=60)
+    assert calendar.breaker._failures == 1
+    api.errors.clear()
+    calendar.get_upcoming_events(minutes_ahead=60)
+    assert calendar.breaker._failures == 0
+
+def test_failed_sync_falls_back_to_the_stored_schedule(calendar, store, api):
+    calendar.set_calendar_ids(None)
+    store.save_calendars([{'id': 'primary', 'summary': 'Me', 'primary': True, 'selected': True}])
+    api.pages['primary'] = [[_resource('standup', 30), _resource('review', 120)]]
+    assert [event.id for event in calendar.get_upcoming_events(minutes_ahead=24 * 60)] == ['standup', 'review']
+
+    api.offline = True
+    with pytest.raises(OSError):
+        calendar.get_upcoming_events(minutes_ahead=24 * 60)
+    events, last_synced = calendar.get_cached_events(minutes_ahead=24 * 60)
+    assert [event.id for event in events] == ['standup', 'review']
+    assert datetime.now() - last_synced < timedelta(minutes=1)
+    assert all(request['calendarId'] == 'primary' for request in api.requests)
+
+    # The next successful sync brings in what changed while offline
+    api.offline = False
+    api.changes['primary'] = [_resource('review', status='cancelled')]
+    assert [event.id for event in calendar.get_upcoming_events(minutes_ahead=24 * 60)] == ['standup']
+    assert [event.id for event in calendar.get_cached_events(minutes_ahead=24 * 60)[0]] == ['standup']
+
+def test_cached_events_without_a_store(calendar):
+    calendar.store = None
+    assert calendar.get_cached_events() == ([], None)
@@ -0,0 +1,98 @@
+"""Single-flight token refresh and token storage."""
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import stat
+import threading
+import time
+import pytest
+
+pytest.importorskip('google.oauth2.credentials')
+
+from google.auth.exceptions import RefreshError  # noqa: E402
+from auth import credential_manager  # noqa: E402
+from auth.credential_manager import CredentialManager, ManagedCredentials, is_invalid_grant  # noqa: E402
+
+SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
+
+@pytest.fixture
+def token_file(tmp_path):
+    path = tmp_path / 'token.json'
+    path.write_text(json.dumps({
+        'token': 'token-0',
+        'refresh_token': 'refresh',
+        'client_id': 'client',
+        'client_secret': 'secret',
+    }))
+    return path
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    """Replace the token endpoint; each refresh takes a moment and issues a new token."""
+    calls = []
+
+    def refresh_token_now(credentials, request):
+        calls.append(request)
+        time.sleep(0.05)  # Long enough for the other callers to queue up
+        credentials.token = f'token-{len(calls)}'
+        credentials.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+
+    monkeypatch.setattr(ManagedCredentials, 'refresh_token_now', refresh_token_now)
+    return calls
+
+@pytest.fixture
+def manager(token_file):
+    manager = CredentialManager(token_file, SCOPES)
+    assert manager.load() is not None
+    return manager
+
+def test_concurrent_refreshes_share_one_request(manager, refreshes, token_file):
+    credentials = manager.credentials
+    stale = credentials.token
+    threads = [
+        threading.Thread(target=manager.refresh, kwargs={'request': object(), 'stale_token': stale})
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(refreshes) == 1
+    assert credentials.token == 'token-1'
+    assert json.loads(token_file.read_text())['token'] == 'token-1'
+
+def test_inline_refresh_goes_through_the_manager(manager, refreshes):
+    manager.credentials.refresh(object())
+    manager.credentials.refresh(object())
+    assert len(refreshes) == 2  # Each call found the current token unusable
+    assert manager.credentials.token == 'token-2'
+
+def test_saved_token_is_private(manager, refreshes, token_file):
+    manager.refresh(object())
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+
+def test_refresh_is_due_before_expiry(manager):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    manager.credentials.expiry = now + credential_manager.REFRESH_MARGIN + timedelta(seconds=60)
+    assert 55 < manager._seconds_until_refresh() <= 60
+    manager.credentials.expiry = now + timedelta(minutes=1)
+    assert manager._seconds_until_refresh() < 0
+
+def test_revoked_refresh_token_stops_refreshing(manager, token_file, monkeypatch):
+    error = RefreshError('invalid_grant: Token has been expired or revoked.', {'error': 'invalid_grant'})
+
+    def revoked(credentials, request):
+        raise error
+
+    monkeypatch.setattr(ManagedCredentials, 'refresh_token_now', revoked)
+    manager.credentials.expiry = datetime.now(timezone.utc).replace(tzinfo=None)
+    reported = []
+    manager.start(on_revoked=reported.append)
+    manager._thread.join(5)
+    assert reported == [error]
+    assert not token_file.exists()
+
+def test_invalid_grant_detection():
+    assert is_invalid_grant(RefreshError('invalid_grant: Bad Request', {'error': 'invalid_grant'}))
+    assert is_invalid_grant(RefreshError('invalid_grant: Token has been expired or revoked.'))
+    assert not is_invalid_grant(RefreshError('temporarily_unavailable', {'error': 'temporarily_unavailable'}))
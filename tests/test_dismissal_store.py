@@ -0,0 +1,132 @@
+"""Dismissal log replay and compaction."""
+import json
+import time
+import pytest
+
+pytest.importorskip('gi')
+
+from storage import dismissal_store  # noqa: E402
+from storage.dismissal_store import DismissalStore  # noqa: E402
+
+MAX_AGE = 3600
+
+def _write_log(path, *records, tail=''):
+    path.write_text(''.join(
+        json.dumps({'id': event_id, 'dismissed_at': ts}) + '\n' for event_id, ts in records
+    ) + tail)
+
+def _write_log_append(path, *records):
+    with open(path, 'a') as f:
+        f.writelines(json.dumps({'id': event_id, 'dismissed_at': ts}) + '\n' for event_id, ts in records)
+
+def _read_log(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def _wait_for_compaction(store):
+    deadline = time.monotonic() + 5
+    while store._compacting:
+        assert time.monotonic() < deadline, "compaction did not finish"
+        time.sleep(0.01)
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / 'dismissed_events.log', tmp_path / 'dismissed_events.json'
+
+def _store(paths):
+    log, legacy = paths
+    return DismissalStore(str(log), str(legacy), max_age=MAX_AGE)
+
+def test_replay_keeps_unexpired_and_latest(paths):
+    now = time.time()
+    _write_log(
+        paths[0],
+        ('recent', now - 60),
+        ('expired', now - MAX_AGE - 1),
+        ('twice', now - MAX_AGE - 10),
+        ('twice', now - 10),
+        tail='{"id": "torn", "dism'
+    )
+    store = _store(paths)
+    assert 'recent' in store
+    assert 'twice' in store
+    assert 'expired' not in store
+    assert 'torn' not in store
+    assert len(store) == 2
+    assert store._log_lines == 5
+
+def test_malformed_records_are_skipped(paths):
+    now = time.time()
+    _write_log(paths[0], ('before', now - 60))
+    with open(paths[0], 'a') as f:
+        f.write('{"id": "no-timestamp"}\n["not", "an", "object"]\n{"id": "bad", "dismissed_at": "soon"}\n')
+    _write_log_append(paths[0], ('after', now - 30))
+    store = _store(paths)
+    assert 'before' in store
+    assert 'after' in store
+    assert len(store) == 2
+
+def test_expired_entry_stops_matching(paths, monkeypatch):
+    store = _store(paths)
+    store.add('meeting')
+    assert 'meeting' in store
+    later = time.time() + MAX_AGE + 1
+    monkeypatch.setattr(dismissal_store.time, 'time', lambda: later)
+    assert 'meeting' not in store
+
+def test_flush_appends_and_survives_restart(paths):
+    _write_log(paths[0], ('old', time.time() - 5))
+    store = _store(paths)
+    store.add('a')
+    store.add('b')
+    assert len(_read_log(paths[0])) == 1  # Batched until the flush
+    store.close()
+    assert [record['id'] for record in _read_log(paths[0])] == ['old', 'a', 'b']
+    assert {'old', 'a', 'b'} <= set(_store(paths)._entries)
+
+def test_legacy_file_is_migrated(paths):
+    log, legacy = paths
+    now = time.time()
+    legacy.write_text(json.dumps({'kept': now - 60, 'dropped': now - MAX_AGE - 1}))
+    store = _store(paths)
+    assert 'kept' in store
+    assert 'dropped' not in store
+    assert not legacy.exists()
+    assert [record['id'] for record in _read_log(log)] == ['kept']
+
+def test_compaction_drops_dead_lines(paths, monkeypatch):
+    monkeypatch.setattr(dismissal_store, 'COMPACT_MIN_LINES', 4)
+    now = time.time()
+    repeated = [now - 100 + i for i in range(6)]
+    _write_log(
+        paths[0],
+        *[('repeated', ts) for ts in repeated],
+        ('expired', now - MAX_AGE - 1),
+        ('live', now - 5),
+    )
+    store = _store(paths)
+    _wait_for_compaction(store)
+    records = _read_log(paths[0])
+    assert {record['id']: record['dismissed_at'] for record in records} == {
+        'repeated': repeated[-1],
+        'live': now - 5,
+    }
+    assert len(records) == 2
+    assert store._log_lines == 2
+
+def test_small_log_is_not_compacted(paths, monkeypatch):
+    monkeypatch.setattr(dismissal_store, 'COMPACT_MIN_LINES', 4)
+    now = time.time()
+    _write_log(paths[0], ('a', now - 3), ('a', now - 2), ('a', now - 1))
+    store = _store(paths)
+    assert not store._compacting
+    assert len(_read_log(paths[0])) == 3
+
+def test_appends_trigger_compaction(paths, monkeypatch):
+    monkeypatch.setattr(dismissal_store, 'COMPACT_MIN_LINES', 4)
+    store = _store(paths)
+    for _ in range(5):
+        store.add('same')
+        store.flush()
+    _wait_for_compaction(store)
+    assert [record['id'] for record in _read_log(paths[0])] == ['same']
+    assert store._log_lines == 1
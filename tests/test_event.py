@@ -0,0 +1,53 @@
+"""Parsing event times and comparing compact events."""
+from datetime import datetime, timedelta, timezone
+import pytest
+
+pytz = pytest.importorskip('pytz')
+
+from gcalendar.event import Event, parse_event_time  # noqa: E402
+
+BERLIN = pytz.timezone('Europe/Berlin')
+
+def _event(**changes):
+    fields = {
+        'id': 'standup',
+        'calendar_id': 'primary',
+        'summary': 'Standup',
+        'start_time': datetime(2024, 3, 4, 9, 0, tzinfo=timezone.utc),
+        'end_time': datetime(2024, 3, 4, 9, 15, tzinfo=timezone.utc),
+    }
+    fields.update(changes)
+    return Event(**fields)
+
+def test_utc_suffix():
+    parsed = parse_event_time({'dateTime': '2024-03-04T09:00:00Z'}, BERLIN)
+    assert parsed == datetime(2024, 3, 4, 9, 0, tzinfo=timezone.utc)
+    assert parsed.utcoffset() == timedelta(0)
+
+def test_explicit_offset_is_kept():
+    parsed = parse_event_time({'dateTime': '2024-03-04T10:00:00+05:30'}, BERLIN)
+    assert parsed.utcoffset() == timedelta(hours=5, minutes=30)
+    assert parsed == datetime(2024, 3, 4, 4, 30, tzinfo=timezone.utc)
+
+def test_all_day_date_starts_at_local_midnight():
+    parsed = parse_event_time({'date': '2024-07-01'}, BERLIN)
+    assert parsed == BERLIN.localize(datetime(2024, 7, 1))
+    assert parsed.utcoffset() == timedelta(hours=2)  # Summer time
+
+def test_naive_timestamp_uses_the_calendar_timezone():
+    parsed = parse_event_time({'dateTime': '2024-01-15T09:00:00'}, BERLIN)
+    assert parsed == datetime(2024, 1, 15, 8, 0, tzinfo=timezone.utc)
+
+def test_date_time_takes_precedence_over_date():
+    parsed = parse_event_time({'dateTime': '2024-03-04T09:00:00Z', 'date': '2024-03-04'}, BERLIN)
+    assert parsed.hour == 9
+
+def test_events_compare_by_value():
+    assert _event() == _event()
+    assert _event() != _event(summary='Standup (moved)')
+    assert _event() != _event(meeting_link='https://meet.google.com/abc-defg-hij')
+    assert _event() != 'standup'
+
+def test_events_are_not_hashable():
+    with pytest.raises(TypeError):
+        hash(_event())
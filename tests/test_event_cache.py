@@ -0,0 +1,60 @@
+"""Range queries of the time-indexed event cache."""
+from datetime import datetime, timedelta, timezone
+from gcalendar.event import Event
+from gcalendar.event_cache import EventCache
+
+BASE = datetime(2024, 3, 4, 12, 0, tzinfo=timezone.utc)
+
+def _event(event_id, start=0, duration=30):
+    """An event starting start minutes after BASE."""
+    start_time = BASE + timedelta(minutes=start)
+    return Event(event_id, 'primary', event_id, start_time, start_time + timedelta(minutes=duration))
+
+def _ids(events):
+    return [event.id for event in events]
+
+def _cache(*events):
+    cache = EventCache()
+    cache.replace(events)
+    return cache
+
+def test_replace_sorts_by_start():
+    cache = _cache(_event('b', 30), _event('a', 0), _event('c', 60))
+    assert _ids(cache) == ['a', 'b', 'c']
+    assert len(cache) == 3
+    assert cache.get('b').id == 'b'
+    assert cache.get('missing') is None
+
+def test_replace_drops_previous_events():
+    cache = _cache(_event('a', 0))
+    cache.replace([_event('b', 10)])
+    assert _ids(cache) == ['b']
+    assert cache.get('a') is None
+
+def test_overlapping_boundaries():
+    cache = _cache(
+        _event('ended-at-start', -30, duration=30),
+        _event('running', -10, duration=20),
+        _event('at-start', 0),
+        _event('at-end', 60),
+        _event('after-end', 61),
+    )
+    window = cache.overlapping(BASE, BASE + timedelta(minutes=60))
+    assert _ids(window) == ['running', 'at-start', 'at-end']
+
+def test_overlapping_finds_long_event_started_long_ago():
+    # Shorter events in between must not hide the long one from the bisect window
+    cache = _cache(
+        _event('all-day', -600, duration=24 * 60),
+        _event('short', -120, duration=15),
+    )
+    assert _ids(cache.overlapping(BASE, BASE + timedelta(minutes=5))) == ['all-day']
+
+def test_overlapping_on_empty_cache():
+    assert EventCache().overlapping(BASE, BASE + timedelta(hours=1)) == []
+
+def test_next_start_is_strictly_after():
+    cache = _cache(_event('now', 0), _event('later', 45))
+    assert cache.next_start(BASE) == BASE + timedelta(minutes=45)
+    assert cache.next_start(BASE - timedelta(seconds=1)) == BASE
+    assert cache.next_start(BASE + timedelta(minutes=45)) is None
@@ -0,0 +1,71 @@
+"""The SQLite event store: changes, range reads and staged full syncs."""
+import pytest
+from gcalendar.event_store import EventStore
+
+HOUR = 3600
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(str(tmp_path / 'events.db'))
+    yield store
+    store.close()
+
+def _row(event_id, start_hours, duration_hours=1):
+    """An upsert tuple for an event starting start_hours after the epoch."""
+    start_ts = start_hours * HOUR
+    return event_id, start_ts, start_ts + duration_hours * HOUR, {'id': event_id}
+
+def _ids(store, calendar_id='primary', start_ts=0, end_ts=1000 * HOUR):
+    return [event['id'] for _, event in store.iter_events_between(start_ts, end_ts, [calendar_id])]
+
+def test_apply_changes_upserts_and_deletes(store):
+    store.apply_changes('primary', [_row('a', 1), _row('b', 2)], [])
+    store.apply_changes('primary', [_row('a', 3)], ['b'])
+    assert _ids(store) == ['a']
+    _, event = next(store.iter_events_between(2 * HOUR, 4 * HOUR, ['primary']))
+    assert event == {'id': 'a'}
+
+def test_iter_events_between_filters_and_orders(store):
+    store.apply_changes('primary', [_row('late', 5), _row('ended', 1), _row('running', 2, 2), _row('beyond', 9)], [])
+    store.apply_changes('team', [_row('other', 3)], [])
+    assert _ids(store, start_ts=3 * HOUR, end_ts=5 * HOUR) == ['running', 'late']
+    pairs = list(store.iter_events_between(0, 10 * HOUR, ['primary', 'team'], chunk_size=2))
+    assert [calendar_id for calendar_id, _ in pairs] == ['primary', 'primary', 'team', 'primary', 'primary']
+
+def test_sync_token_round_trip(store):
+    assert store.get_sync_token('primary') is None
+    assert store.last_synced_at() is None
+    store.save_sync_token('primary', 'token-1')
+    assert store.get_sync_token('primary') == 'token-1'
+    assert store.last_synced_at() is not None
+
+def test_finish_full_sync_drops_unseen_rows_of_that_calendar(store):
+    store.apply_changes('primary', [_row('kept', 1), _row('ghost', 2)], [])
+    store.apply_changes('team', [_row('other', 1)], [])
+    store.save_sync_token('primary', 'old')
+    store.finish_full_sync('primary', {'kept'}, 'new')
+    assert _ids(store) == ['kept']
+    assert _ids(store, 'team') == ['other']
+    assert store.get_sync_token('primary') == 'new'
+
+def test_prune_drops_ended_events(store):
+    store.apply_changes('primary', [_row('old', 1), _row('current', 4)], [])
+    store.prune(3 * HOUR)
+    assert _ids(store) == ['current']
+
+def test_state_survives_reopening(tmp_path):
+    path = str(tmp_path / 'events.db')
+    store = EventStore(path)
+    store.apply_changes('primary', [_row('a', 1)], [])
+    store.save_sync_token('primary', 'token')
+    store.save_calendars([{'id': 'primary'}])
+    store.set_metadata('timezone', 'Europe/Berlin')
+    store.close()
+
+    reopened = EventStore(path)
+    assert _ids(reopened) == ['a']
+    assert reopened.get_sync_token('primary') == 'token'
+    assert reopened.get_calendars()[0] == [{'id': 'primary'}]
+    assert reopened.get_metadata('timezone')[0] == 'Europe/Berlin'
+    assert reopened.get_metadata('missing') == (None, 0)
+    reopened.close()
@@ -0,0 +1,73 @@
+"""The client against tools/fake_calendar_server.py: ordering and time windows."""
+from argparse import Namespace
+from pathlib import Path
+import sys
+import threading
+import pytest
+
+pytest.importorskip('googleapiclient')
+pytest.importorskip('google.auth')
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from google.auth.credentials import AnonymousCredentials  # noqa: E402
+from fake_calendar_server import FakeCalendarData, FakeCalendarServer  # noqa: E402
+from gcalendar.calendar_sync import CalendarSync  # noqa: E402
+from gcalendar.event import parse_event_time  # noqa: E402
+from gcalendar.event_store import EventStore  # noqa: E402
+
+DAYS = 7
+
+# Far from UTC, so all-day events start well before UTC midnight
+ARGS = Namespace(
+    calendars=2, events=400, recurring=2, days=DAYS, timezone='Pacific/Auckland', seed=1,
+    latency_ms=0, jitter_ms=0, error_rate=0, error_codes=[429], verbose=False
+)
+
+@pytest.fixture(scope='module')
+def data():
+    return FakeCalendarData(ARGS)
+
+@pytest.fixture(scope='module')
+def endpoint(data):
+    server = FakeCalendarServer(('127.0.0.1', 0), data, ARGS)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    """Keep the test endpoint's quota file out of the real home directory."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+
+def _window(endpoint, store=None):
+    calendar = CalendarSync(AnonymousCredentials(), store=store, api_endpoint=endpoint)
+    try:
+        return calendar.get_upcoming_events(minutes_ahead=DAYS * 24 * 60)
+    finally:
+        calendar.close()
+
+def test_server_orders_all_day_events_like_the_client(data):
+    body, _ = data.list_events('primary', {'orderBy': 'startTime', 'maxResults': '2500'})
+    starts = [parse_event_time(event['start'], data.tz) for event in body['items']]
+    assert any('date' in event['start'] for event in body['items'])
+    assert starts == sorted(starts)
+
+def test_window_is_ordered_by_start_time(endpoint):
+    events = _window(endpoint)
+    assert any(event.start_time.utcoffset() for event in events)  # All-day events are in the window
+    starts = [event.start_time for event in events]
+    assert starts == sorted(starts)
+
+def test_store_and_window_fetch_agree(endpoint, tmp_path):
+    store = EventStore(str(tmp_path / 'events.db'))
+    try:
+        stored = _window(endpoint, store)
+    finally:
+        store.close()
+    fetched = _window(endpoint)
+    assert len(stored) == len(fetched)
+    assert sorted((event.calendar_id, event.id) for event in stored) == \
+        sorted((event.calendar_id, event.id) for event in fetched)
@@ -0,0 +1,149 @@
+"""The background fetch worker: coalescing and delivery on the main loop."""
+import queue
+import threading
+import pytest
+
+pytest.importorskip('gi')
+
+from gcalendar import fetch_worker  # noqa: E402
+from gcalendar.fetch_worker import CalendarFetchWorker  # noqa: E402
+
+class FakeMainLoop:
+    """Collects GLib.idle_add calls so the test thread can run them like the main loop."""
+
+    def __init__(self):
+        self.calls = queue.Queue()
+
+    def idle_add(self, function, *args):
+        self.calls.put((function, args))
+
+    def run(self, count):
+        """Run the next count idle callbacks, waiting for the worker to queue them."""
+        for _ in range(count):
+            function, args = self.calls.get(timeout=5)
+            function(*args)
+
+    def idle(self):
+        return self.calls.empty()
+
+class FakeCalendar:
+    """A CalendarSync whose fetches block until released."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.fetches = []
+        self.calendar_ids = None
+
+    def set_calendar_ids(self, calendar_ids):
+        self.calendar_ids = calendar_ids
+
+    def get_upcoming_events(self, minutes_ahead, on_partial=None):
+        self.fetches.append(minutes_ahead)
+        self.started.set()
+        assert self.release.wait(5)
+        if on_partial is not None:
+            on_partial(['first page'])
+        return [f'events in {minutes_ahead}']
+
+    def list_calendars(self):
+        return [{'id': 'primary'}]
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def loop(monkeypatch):
+    loop = FakeMainLoop()
+    monkeypatch.setattr(fetch_worker, 'GLib', loop)
+    return loop
+
+@pytest.fixture
+def calendar():
+    return FakeCalendar()
+
+@pytest.fixture
+def worker(calendar, loop):
+    worker = CalendarFetchWorker(lambda: calendar)
+    yield worker
+    calendar.release.set()
+    worker.stop()
+
+def _recorder():
+    results = []
+    return results, lambda result, error: results.append((result, error))
+
+def test_identical_pending_requests_are_coalesced(worker, calendar, loop):
+    first, first_callback = _recorder()
+    merged, merged_callback = _recorder()
+    other, other_callback = _recorder()
+    worker.request_events(5, first_callback)
+    assert calendar.started.wait(5)  # The worker is busy with the first fetch
+
+    worker.request_events(1440, merged_callback)
+    worker.request_events(1440, other_callback)
+    worker.request_events(1440, merged_callback)  # The same callback is only called once
+    calendar.release.set()
+    loop.run(3)
+
+    assert calendar.fetches == [5, 1440]
+    assert first == [(['events in 5'], None)]
+    assert merged == other == [(['events in 1440'], None)]
+    assert loop.idle()
+
+def test_partial_results_reach_every_merged_request(worker, calendar, loop):
+    pages = []
+    _, callback = _recorder()
+    worker.request_events(5, callback)
+    assert calendar.started.wait(5)
+    worker.request_events(60, callback, on_partial=pages.append)
+    worker.request_events(60, callback, on_partial=lambda events: pages.append(('second', events)))
+    calendar.release.set()
+    loop.run(4)  # Result of the first fetch, two partial pages and the result of the second
+    assert pages == [['first page'], ('second', ['first page'])]
+
+def test_requests_made_before_the_calendar_exists_are_served(calendar, loop):
+    factory_called = threading.Event()
+    unblock_factory = threading.Event()
+
+    def factory():
+        factory_called.set()
+        assert unblock_factory.wait(5)
+        return calendar
+
+    ready = []
+    worker = CalendarFetchWorker(factory, on_ready=ready.append)
+    try:
+        calendars, callback = _recorder()
+        worker.set_calendar_ids(['team'])
+        worker.request_calendars(callback)
+        assert factory_called.wait(5)
+        unblock_factory.set()
+        loop.run(2)
+        assert ready == [None]
+        assert calendars == [([{'id': 'primary'}], None)]
+        assert calendar.calendar_ids == ['team']
+    finally:
+        worker.stop()
+
+def test_failed_setup_is_reported_and_stops_the_worker(loop):
+    def factory():
+        raise RuntimeError("no credentials")
+
+    ready = []
+    worker = CalendarFetchWorker(factory, on_ready=ready.append)
+    loop.run(1)
+    assert str(ready[0]) == "no credentials"
+    worker._thread.join(5)
+    assert not worker._thread.is_alive()
+
+def test_errors_are_delivered_to_the_callback(worker, calendar, loop):
+    def fail():
+        raise OSError("network is unreachable")
+
+    calendar.list_calendars = fail
+    results, callback = _recorder()
+    worker.request_calendars(callback)
+    loop.run(1)
+    assert results[0][0] is None
+    assert isinstance(results[0][1], OSError)
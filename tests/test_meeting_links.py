@@ -0,0 +1,97 @@
+"""Meeting link detection and its precedence rules."""
+import pytest
+from gcalendar import meeting_links
+from gcalendar.meeting_links import extract_meeting_link, find_meeting_link
+
+ZOOM = 'https://example.zoom.us/j/123456789?pwd=abc'
+MEET = 'https://meet.google.com/abc-defg-hij'
+TEAMS = 'https://teams.microsoft.com/l/meetup-join/19%3ameeting'
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    meeting_links._cache.clear()
+    yield
+    meeting_links._cache.clear()
+
+def _conference(uri, name='Google Meet', entry_type='video'):
+    return {
+        'conferenceSolution': {'name': name},
+        'entryPoints': [
+            {'entryPointType': 'phone', 'uri': 'tel:+1-555-0100'},
+            {'entryPointType': entry_type, 'uri': uri},
+        ],
+    }
+
+def test_conference_data_beats_description_and_location():
+    event = {
+        'id': 'e1',
+        'conferenceData': _conference(MEET),
+        'location': ZOOM,
+        'description': f'Join: {TEAMS}',
+    }
+    assert extract_meeting_link(event) == (MEET, 'Google Meet')
+
+def test_hangout_link_used_without_video_entry_point():
+    event = {
+        'id': 'e1',
+        'conferenceData': _conference('tel:+1-555-0100', entry_type='phone'),
+        'hangoutLink': MEET,
+        'description': ZOOM,
+    }
+    assert extract_meeting_link(event) == (MEET, 'Google Meet')
+
+def test_conference_provider_falls_back_to_url_pattern():
+    event = {
+        'id': 'e1',
+        'conferenceData': {'entryPoints': [{'entryPointType': 'video', 'uri': ZOOM}]},
+    }
+    assert extract_meeting_link(event) == (ZOOM, 'Zoom')
+
+def test_location_beats_description():
+    event = {'id': 'e1', 'location': TEAMS, 'description': f'Or use {ZOOM}'}
+    assert extract_meeting_link(event) == (TEAMS, 'Microsoft Teams')
+
+def test_description_is_searched_last():
+    event = {'id': 'e1', 'location': 'Room 4', 'description': f'<a href="{ZOOM}">Join</a>'}
+    assert extract_meeting_link(event) == (ZOOM, 'Zoom')
+
+def test_no_link():
+    assert extract_meeting_link({'id': 'e1', 'description': 'Lunch'}) == (None, None)
+
+def test_find_meeting_link_unescapes_and_trims():
+    text = 'Join at https://example.zoom.us/j/1?pwd=a&amp;uname=b.'
+    assert find_meeting_link(text) == ('https://example.zoom.us/j/1?pwd=a&uname=b', 'Zoom')
+
+@pytest.mark.parametrize('url, provider', [
+    ('https://zoomgov.com/j/161234567', 'Zoom'),
+    ('https://teams.live.com/meet/9876543210', 'Microsoft Teams'),
+    ('https://acme.webex.com/meet/jdoe', 'Webex'),
+    ('https://meet.jit.si/standup-room', 'Jitsi Meet'),
+    ('https://whereby.com/team-sync', 'Whereby'),
+    ('https://meet.goto.com/123456789', 'GoTo Meeting'),
+    ('https://chime.aws/1234567890', 'Amazon Chime'),
+    ('https://video.example.com/j/987654321?pwd=x', 'Zoom'),
+])
+def test_provider_patterns(url, provider):
+    assert find_meeting_link(f'Dial in or join {url} today') == (url, provider)
+
+def test_first_link_in_text_wins():
+    assert find_meeting_link(f'{TEAMS} or {MEET}')[1] == 'Microsoft Teams'
+
+def test_result_cached_per_etag():
+    event = {'id': 'e1', 'etag': '"1"', 'description': ZOOM}
+    assert extract_meeting_link(event) == (ZOOM, 'Zoom')
+    # Same etag: the cached result is returned without rescanning
+    assert extract_meeting_link(dict(event, description=MEET)) == (ZOOM, 'Zoom')
+    # A new etag means the event changed
+    assert extract_meeting_link(dict(event, etag='"2"', description=MEET)) == (MEET, 'Google Meet')
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(meeting_links, 'CACHE_SIZE', 2)
+    for number in range(3):
+        extract_meeting_link({'id': f'e{number}', 'etag': '"1"', 'description': ZOOM})
+    assert list(meeting_links._cache) == [('e1', '"1"'), ('e2', '"1"')]
+
+def test_events_without_etag_are_not_cached():
+    extract_meeting_link({'id': 'e1', 'description': ZOOM})
+    assert not meeting_links._cache
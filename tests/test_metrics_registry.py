@@ -0,0 +1,65 @@
+"""The metrics registry and its Prometheus text and JSON renderings."""
+import json
+import pytest
+from metrics.registry import MetricsRegistry
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_counter_and_gauge_render_per_label_set(registry):
+    requests = registry.counter('api_requests_total', "API requests")
+    requests.inc(method='GET', status=200)
+    requests.inc(2, method='GET', status=200)
+    requests.inc(method='POST', status=503)
+    registry.gauge('poll_interval_seconds', "Poll interval").set(60)
+    assert registry.to_prometheus() == (
+        '# HELP api_requests_total API requests\n'
+        '# TYPE api_requests_total counter\n'
+        'api_requests_total{method="GET",status="200"} 3\n'
+        'api_requests_total{method="POST",status="503"} 1\n'
+        '# HELP poll_interval_seconds Poll interval\n'
+        '# TYPE poll_interval_seconds gauge\n'
+        'poll_interval_seconds 60\n'
+    )
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = registry.histogram('parse_seconds', "Parse time", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, source='api')
+    lines = registry.to_prometheus().splitlines()
+    assert lines[2:] == [
+        'parse_seconds_bucket{source="api",le="0.1"} 2',
+        'parse_seconds_bucket{source="api",le="1.0"} 3',
+        'parse_seconds_bucket{source="api",le="+Inf"} 4',
+        'parse_seconds_sum{source="api"} 3.65',
+        'parse_seconds_count{source="api"} 4',
+    ]
+
+def test_label_values_are_escaped(registry):
+    registry.counter('errors_total', "Errors").inc(reason='say "hi" \\ then\nnext')
+    assert r'errors_total{reason="say \"hi\" \\ then\nnext"} 1' in registry.to_prometheus()
+
+def test_histogram_summary_in_json(registry):
+    latency = registry.histogram('lag_seconds', "Lag", buckets=(1, 2, 5))
+    for value in (0.5, 0.5, 1.5, 4):
+        latency.observe(value)
+    data = json.loads(json.dumps(registry.to_dict()))
+    summary = data['lag_seconds']['samples'][0]['value']
+    assert data['lag_seconds']['type'] == 'histogram'
+    assert summary == {'count': 4, 'sum': 6.5, 'mean': 1.625, 'p50': 1, 'p90': 5, 'p99': 5}
+
+def test_same_name_returns_same_metric(registry):
+    assert registry.counter('a_total', "A") is registry.counter('a_total', "A")
+    with pytest.raises(ValueError):
+        registry.gauge('a_total', "A")
+
+def test_generation_changes_only_with_values(registry):
+    gauge = registry.gauge('open', "Open")
+    start = registry.generation
+    gauge.set(1)
+    assert registry.generation == start + 1
+    gauge.set(1)
+    assert registry.generation == start + 1
+    registry.counter('c_total', "C").inc()
+    assert registry.generation > start + 1
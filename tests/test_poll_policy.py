@@ -0,0 +1,75 @@
+"""Poll interval selection."""
+from datetime import datetime, timedelta, timezone
+from gcalendar.event import Event
+from gcalendar.event_cache import EventCache
+from gcalendar.poll_policy import (
+    FIXED, IDLE_INTERVAL, MIN_INTERVAL, QUIET_INTERVAL, PollPolicy
+)
+
+def _at(hour, minute=0):
+    return datetime(2024, 3, 4, hour, minute, tzinfo=timezone.utc)
+
+BASE = _at(12)
+
+def _event(event_id, start, base=BASE):
+    """A 30-minute meeting starting start minutes after base."""
+    start_time = base + timedelta(minutes=start)
+    return Event(event_id, 'primary', event_id, start_time, start_time + timedelta(minutes=30))
+
+def _cache(*events):
+    cache = EventCache()
+    cache.replace(events)
+    return cache
+
+def test_fixed_policy_ignores_schedule():
+    policy = PollPolicy(FIXED, interval_minutes=5)
+    assert policy.next_interval(_cache(_event('soon', 1)), now=BASE) == (300, "fixed interval")
+
+def test_fixed_interval_is_clamped_to_minimum():
+    assert PollPolicy(FIXED, interval_minutes=0.1).interval == MIN_INTERVAL
+
+def test_unknown_policy_falls_back_to_adaptive():
+    assert PollPolicy('bogus') == PollPolicy()
+
+def test_polls_every_minute_until_first_sync():
+    assert PollPolicy().next_interval(EventCache(), synced=False, now=BASE) == (
+        MIN_INTERVAL, "waiting for first sync"
+    )
+
+def test_imminent_meeting_polls_every_minute():
+    seconds, reason = PollPolicy().next_interval(_cache(_event('soon', 15)), now=BASE)
+    assert (seconds, reason) == (MIN_INTERVAL, "meeting starting soon")
+
+def test_sleeps_until_imminent_window_opens():
+    seconds, reason = PollPolicy().next_interval(_cache(_event('later', 25)), now=BASE)
+    assert (seconds, reason) == (10 * 60, "waiting for next meeting")
+
+def test_wait_is_never_shorter_than_minimum():
+    cache = _cache(_event('later', 15, base=BASE + timedelta(seconds=20)))
+    assert PollPolicy().next_interval(cache, now=BASE)[0] == MIN_INTERVAL
+
+def test_idle_interval_during_the_day():
+    policy = PollPolicy()
+    assert policy.next_interval(EventCache(), now=BASE) == (IDLE_INTERVAL, "no upcoming meetings")
+    assert policy.next_interval(_cache(_event('far', 120)), now=BASE) == (
+        IDLE_INTERVAL, "next meeting is far off"
+    )
+
+def test_quiet_hours_use_longer_interval():
+    policy = PollPolicy()
+    night = _at(23)
+    assert policy.next_interval(EventCache(), now=night) == (QUIET_INTERVAL, "quiet hours")
+    cache = _cache(_event('morning', 0, base=_at(9)))
+    assert policy.next_interval(cache, now=night) == (QUIET_INTERVAL, "quiet hours")
+
+def test_quiet_hours_boundaries():
+    policy = PollPolicy()
+    assert policy.next_interval(EventCache(), now=_at(22))[0] == QUIET_INTERVAL
+    assert policy.next_interval(EventCache(), now=_at(6, 59))[0] == QUIET_INTERVAL
+    assert policy.next_interval(EventCache(), now=_at(7))[0] == IDLE_INTERVAL
+    assert policy.next_interval(EventCache(), now=_at(21, 59))[0] == IDLE_INTERVAL
+
+def test_meeting_in_quiet_hours_still_polls_every_minute():
+    night = _at(23)
+    cache = _cache(_event('late-call', 10, base=night))
+    assert PollPolicy().next_interval(cache, now=night) == (MIN_INTERVAL, "meeting starting soon")
@@ -0,0 +1,97 @@
+"""LRU caching of composed notification backgrounds."""
+import os
+import pytest
+
+pytest.importorskip('gi')
+pytest.importorskip('cairo')
+
+from metrics.registry import CACHE_LOOKUPS  # noqa: E402
+from ui import render_cache  # noqa: E402
+from ui.render_cache import RenderCache  # noqa: E402
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Replace composing with a record of what was rendered."""
+    rendered = []
+
+    def render(self, color_spec, image_path, mtime, width, height, scale, window):
+        rendered.append((image_path, mtime, color_spec, width, height, scale))
+        return object()
+
+    monkeypatch.setattr(RenderCache, '_render', render)
+    return rendered
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / 'background.png'
+    path.write_bytes(b'not decoded in these tests')
+    return str(path)
+
+def _lookups(result):
+    return sum(
+        value for labels, value in CACHE_LOOKUPS.samples()
+        if labels == {'cache': 'background', 'result': result}
+    )
+
+def test_same_window_reuses_the_surface(renders):
+    cache = RenderCache()
+    first = cache.get_background('#000000', '', 1920, 1080, 1)
+    assert cache.get_background('#000000', '', 1920, 1080, 1) is first
+    assert len(renders) == 1
+
+def test_size_scale_and_colour_are_part_of_the_key(renders):
+    cache = RenderCache()
+    cache.get_background('#000000', '', 1920, 1080, 1)
+    cache.get_background('#000000', '', 3840, 2160, 1)
+    cache.get_background('#000000', '', 1920, 1080, 2)
+    cache.get_background('#ffffff', '', 1920, 1080, 1)
+    assert len(renders) == 4
+
+def test_replaced_image_is_rendered_again(renders, image):
+    cache = RenderCache()
+    cache.get_background('#000000', image, 800, 600, 1)
+    cache.get_background('#000000', image, 800, 600, 1)
+    mtime = os.stat(image).st_mtime
+    os.utime(image, (mtime + 10, mtime + 10))
+    cache.get_background('#000000', image, 800, 600, 1)
+    assert [render[1] for render in renders] == [mtime, mtime + 10]
+
+def test_missing_image_falls_back_to_plain_colour(renders, tmp_path):
+    cache = RenderCache()
+    cache.get_background('#000000', str(tmp_path / 'deleted.png'), 800, 600, 1)
+    assert renders == [('', None, '#000000', 800, 600, 1)]
+
+def test_least_recently_used_background_is_evicted(renders):
+    cache = RenderCache(max_backgrounds=2)
+    cache.get_background('#000000', '', 100, 100, 1)
+    cache.get_background('#000000', '', 200, 200, 1)
+    cache.get_background('#000000', '', 100, 100, 1)  # Most recently used again
+    cache.get_background('#000000', '', 300, 300, 1)  # Evicts 200x200
+    cache.get_background('#000000', '', 100, 100, 1)
+    cache.get_background('#000000', '', 200, 200, 1)
+    assert [render[3] for render in renders] == [100, 200, 300, 200]
+
+def test_hits_and_misses_are_counted(renders):
+    hits, misses = _lookups('hit'), _lookups('miss')
+    cache = RenderCache()
+    for _ in range(3):
+        cache.get_background('#000000', '', 640, 480, 1)
+    assert _lookups('hit') - hits == 2
+    assert _lookups('miss') - misses == 1
+
+def test_decoded_images_are_shared_and_bounded(monkeypatch, image):
+    decoded = []
+
+    class FakePixbuf:
+        @staticmethod
+        def new_from_file(path):
+            decoded.append(path)
+            return object()
+
+    monkeypatch.setattr(render_cache.GdkPixbuf, 'Pixbuf', FakePixbuf)
+    cache = RenderCache(max_images=1)
+    first = cache._load_image(image, 1.0)
+    assert cache._load_image(image, 1.0) is first
+    cache._load_image(image, 2.0)  # A new version of the file replaces the old decode
+    cache._load_image(image, 1.0)
+    assert len(decoded) == 3
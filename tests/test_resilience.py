@@ -0,0 +1,169 @@
+"""Retry delays, circuit breaker state transitions and quota accounting."""
+import json
+import pytest
+
+httplib2 = pytest.importorskip('httplib2')
+pytest.importorskip('googleapiclient')
+
+from googleapiclient.errors import HttpError  # noqa: E402
+from gcalendar import resilience  # noqa: E402
+from gcalendar.resilience import CircuitBreaker, CircuitOpenError, QuotaCounter, RetryPolicy  # noqa: E402
+
+def _http_error(status, content=b'', **headers):
+    response = httplib2.Response({'status': status, **headers})
+    return HttpError(response, content)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable time.monotonic for the breaker."""
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, 'monotonic', lambda: now[0])
+    return now
+
+def test_retryable_errors():
+    policy = RetryPolicy()
+    assert policy.is_retryable(_http_error(429))
+    assert policy.is_retryable(_http_error(503))
+    assert policy.is_retryable(_http_error(403, b'{"reason": "rateLimitExceeded"}'))
+    assert policy.is_retryable(OSError())
+    assert not policy.is_retryable(_http_error(403, b'{"reason": "forbidden"}'))
+    assert not policy.is_retryable(_http_error(404))
+    assert not policy.is_retryable(ValueError())
+
+def test_retry_after_header_takes_precedence():
+    policy = RetryPolicy(max_delay=30)
+    assert policy.delay(0, _http_error(429, **{'retry-after': '7'})) == 7
+    assert policy.delay(0, _http_error(429, **{'retry-after': '120'})) == 30
+
+def test_unparseable_retry_after_uses_backoff():
+    policy = RetryPolicy(base_delay=1, max_delay=30)
+    error = _http_error(503, **{'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+    for _ in range(20):
+        assert 1 <= policy.delay(1, error) <= 2
+
+def test_backoff_uses_equal_jitter_and_cap():
+    policy = RetryPolicy(base_delay=1, max_delay=10)
+    for _ in range(20):
+        assert 2 <= policy.delay(2) <= 4
+        assert 5 <= policy.delay(8) <= 10
+
+def test_call_retries_transient_errors(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(resilience.time, 'sleep', sleeps.append)
+    results = iter([_http_error(503, **{'retry-after': '2'}), 'ok'])
+
+    def flaky():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert RetryPolicy().call(flaky) == 'ok'
+    assert sleeps == [2]
+
+def test_call_does_not_retry_permanent_errors(monkeypatch):
+    monkeypatch.setattr(resilience.time, 'sleep', lambda delay: pytest.fail("slept"))
+    calls = []
+
+    def missing():
+        calls.append(1)
+        raise _http_error(404)
+
+    with pytest.raises(HttpError):
+        RetryPolicy().call(missing)
+    assert len(calls) == 1
+
+def test_call_gives_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(resilience.time, 'sleep', lambda delay: None)
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise _http_error(500)
+
+    with pytest.raises(HttpError):
+        RetryPolicy(max_attempts=3).call(down)
+    assert len(calls) == 3
+
+def test_breaker_opens_at_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.check()
+    assert raised.value.retry_in == 60
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
+
+def test_breaker_half_opens_after_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock[0] += 59
+    assert breaker.is_open
+    clock[0] += 1
+    assert not breaker.is_open
+    breaker.check()  # The trial poll is let through
+
+def test_failed_trial_doubles_timeout_up_to_maximum(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, max_reset_timeout=200)
+    breaker.record_failure()
+    for expected in (120, 200, 200):
+        clock[0] += breaker.retry_in
+        breaker.record_failure()
+        assert breaker.retry_in == expected
+
+def test_successful_trial_closes_and_resets_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock[0] += 60
+    breaker.record_failure()
+    clock[0] += 120
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.retry_in == 0
+    breaker.record_failure()
+    assert breaker.retry_in == 60
+
+@pytest.fixture
+def quota_path(tmp_path):
+    return tmp_path / 'api_quota.json'
+
+def test_quota_is_saved_lazily(clock, quota_path):
+    quota = QuotaCounter(str(quota_path), save_interval=600)
+    quota.add()  # A new quota day is saved at once
+    assert json.loads(quota_path.read_text())['calls'] == 1
+    quota.add(5)
+    assert json.loads(quota_path.read_text())['calls'] == 1
+    clock[0] += 600
+    quota.add()
+    assert json.loads(quota_path.read_text())['calls'] == 7
+
+def test_quota_flush_writes_pending_count(clock, quota_path):
+    quota = QuotaCounter(str(quota_path))
+    quota.add()
+    quota.add(2)
+    quota.flush()
+    restarted = QuotaCounter(str(quota_path))
+    assert (restarted.day, restarted.calls) == (quota.day, 3)
+
+def test_quota_warning_threshold_saves(clock, quota_path, caplog):
+    quota = QuotaCounter(str(quota_path), daily_budget=10, warn_ratio=0.8)
+    quota.add()
+    quota.add(7)
+    assert json.loads(quota_path.read_text())['calls'] == 8
+    assert "nearing the daily budget" in caplog.text
+
+def test_quota_resets_on_a_new_day(clock, quota_path):
+    quota_path.write_text(json.dumps({'day': '2000-01-01', 'calls': 9000}))
+    quota = QuotaCounter(str(quota_path))
+    quota.add()
+    assert quota.calls == 1
+    assert json.loads(quota_path.read_text())['day'] != '2000-01-01'
@@ -0,0 +1,188 @@
+"""Notification scheduling: queue order, lazy invalidation and snoozes."""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip('gi')
+
+from notification import scheduler as scheduler_module  # noqa: E402
+from notification.scheduler import NotificationScheduler  # noqa: E402
+from storage.snooze_store import SnoozeStore  # noqa: E402
+from gcalendar.event import Event  # noqa: E402
+
+BASE = datetime(2024, 3, 4, 12, 0, tzinfo=timezone.utc)
+
+class FakeMainLoop:
+    """Stands in for GLib timers and the wall clock so triggers can be stepped."""
+
+    def __init__(self):
+        self.now = BASE.timestamp()
+        self.timers = {}  # source id -> (due timestamp, callback)
+        self._next_id = 1
+
+    def timeout_add(self, delay_ms, callback):
+        source_id = self._next_id
+        self._next_id += 1
+        self.timers[source_id] = (self.now + delay_ms / 1000, callback)
+        return source_id
+
+    def source_remove(self, source_id):
+        del self.timers[source_id]
+
+    @property
+    def armed_at(self):
+        """Due time of the single armed timer, or None."""
+        assert len(self.timers) <= 1
+        return next(iter(self.timers.values()))[0] if self.timers else None
+
+    def run_until(self, ts):
+        """Advance the clock to ts, firing armed timers that come due on the way."""
+        while self.timers and self.armed_at <= ts:
+            source_id, (due, callback) = next(iter(self.timers.items()))
+            del self.timers[source_id]
+            self.now = due
+            callback()
+        self.now = ts
+
+@pytest.fixture
+def loop(monkeypatch):
+    loop = FakeMainLoop()
+    monkeypatch.setattr(scheduler_module, 'GLib', loop)
+    monkeypatch.setattr(scheduler_module, 'time', SimpleNamespace(time=lambda: loop.now))
+    return loop
+
+@pytest.fixture
+def fired():
+    return []
+
+def _scheduler(fired, **kwargs):
+    return NotificationScheduler(
+        lambda event, due_ts: fired.append((event.id, due_ts)), lead_time=60, **kwargs
+    )
+
+def _event(event_id, start):
+    """A 30-minute event starting start minutes after BASE."""
+    start_time = BASE + timedelta(minutes=start)
+    return Event(event_id, 'primary', event_id, start_time, start_time + timedelta(minutes=30))
+
+def _trigger(minutes):
+    """Trigger timestamp of an event starting minutes after BASE, with a 60s lead."""
+    return BASE.timestamp() + minutes * 60 - 60
+
+def test_fires_in_start_order_with_one_timer(loop, fired):
+    scheduler = _scheduler(fired)
+    scheduler.update([_event('c', 20), _event('a', 5), _event('b', 10)])
+    assert loop.armed_at == _trigger(5)
+
+    loop.run_until(_trigger(20))
+    assert fired == [('a', _trigger(5)), ('b', _trigger(10)), ('c', _trigger(20))]
+    assert loop.armed_at is None
+
+def test_simultaneous_triggers_fire_together(loop, fired):
+    scheduler = _scheduler(fired)
+    scheduler.update([_event('a', 5), _event('b', 5)])
+    loop.run_until(_trigger(5))
+    assert sorted(fired) == [('a', _trigger(5)), ('b', _trigger(5))]
+
+def test_rescheduled_event_invalidates_old_entry(loop, fired):
+    scheduler = _scheduler(fired)
+    scheduler.update([_event('a', 5)])
+    scheduler.update([_event('a', 10)])
+    assert loop.armed_at == _trigger(10)
+
+    loop.run_until(_trigger(10))
+    assert fired == [('a', _trigger(10))]
+    assert scheduler._heap == []
+
+def test_moved_earlier_event_rearms_sooner(loop, fired):
+    scheduler = _scheduler(fired)
+    scheduler.update([_event('a', 10)])
+    scheduler.update([_event('a', 5)])
+    assert loop.armed_at == _trigger(5)
+    loop.run_until(_trigger(10))
+    assert fired == [('a', _trigger(5))]
+
+def test_removed_event_never_fires(loop, fired):
+    scheduler = _scheduler(fired)
+    scheduler.update([_event('a', 5), _event('b', 10)])
+    scheduler.update([_event('b', 10)])
+    assert loop.armed_at == _trigger(10)
+    loop.run_until(_trigger(10))
+    assert fired == [('b', _trigger(10))]
+
+def test_unchanged_events_keep_their_entries(loop, fired):
+    scheduler = _scheduler(fired)
+    events = [_event('a', 5), _event('b', 10)]
+    scheduler.update(events)
+    heap = list(scheduler._heap)
+    scheduler.update(events)
+    assert scheduler._heap == heap
+
+def test_fired_event_is_not_fired_again_by_a_sync(loop, fired):
+    scheduler = _scheduler(fired)
+    event = _event('a', 5)
+    scheduler.update([event])
+    loop.run_until(_trigger(5))
+    scheduler.update([event])
+    loop.run_until(_trigger(6))
+    assert fired == [('a', _trigger(5))]
+
+def test_cancel_drops_pending_trigger(loop, fired):
+    scheduler = _scheduler(fired)
+    scheduler.update([_event('a', 5), _event('b', 10)])
+    scheduler.cancel('a')
+    assert loop.armed_at == _trigger(10)
+
+def test_prepare_runs_before_trigger(loop, fired):
+    prepared = []
+    scheduler = _scheduler(
+        fired, prepare_callback=lambda event: prepared.append((event.id, loop.now)), prepare_ahead=30
+    )
+    scheduler.update([_event('a', 5)])
+    assert loop.armed_at == _trigger(5) - 30
+    loop.run_until(_trigger(5))
+    assert prepared == [('a', _trigger(5) - 30)]
+    assert fired == [('a', _trigger(5))]
+
+def test_snooze_fires_at_wake_time(loop, fired):
+    scheduler = _scheduler(fired)
+    event = _event('a', 5)
+    scheduler.update([event])
+    loop.run_until(_trigger(5))
+    scheduler.snooze(event, _trigger(5) + 120)
+    loop.run_until(_trigger(5) + 120)
+    assert fired == [('a', _trigger(5)), ('a', _trigger(5) + 120)]
+
+def test_snooze_is_rearmed_after_restart(loop, fired, tmp_path):
+    path = str(tmp_path / 'snoozes.json')
+    event = _event('a', -2)  # Already started; the snooze outlives the start
+    wake_ts = BASE.timestamp() + 300
+    first = _scheduler(fired, snooze_store=SnoozeStore(path))
+    first.update([event])
+    first.snooze(event, wake_ts)
+    first.stop()
+
+    restarted = _scheduler(fired, snooze_store=SnoozeStore(path))
+    restarted.update([event])
+    assert loop.armed_at == wake_ts
+    loop.run_until(wake_ts)
+    assert fired == [('a', wake_ts)]
+    assert SnoozeStore(path).items() == []
+
+def test_snooze_of_cancelled_meeting_is_dropped(loop, fired, tmp_path):
+    path = str(tmp_path / 'snoozes.json')
+    SnoozeStore(path).add('gone', BASE.timestamp() + 300)
+    scheduler = _scheduler(fired, snooze_store=SnoozeStore(path))
+    scheduler.update([_event('other', 30)])
+    assert SnoozeStore(path).items() == []
+    assert loop.armed_at == _trigger(30)
+
+def test_cancel_snooze(loop, fired, tmp_path):
+    store = SnoozeStore(str(tmp_path / 'snoozes.json'))
+    scheduler = _scheduler(fired, snooze_store=store)
+    event = _event('a', -2)
+    scheduler.update([event])
+    scheduler.snooze(event, BASE.timestamp() + 300)
+    scheduler.cancel_snooze('a')
+    assert store.items() == []
+    assert loop.armed_at is None
@@ -0,0 +1,114 @@
+"""The shared settings store: atomic saves and reloads from disk."""
+import json
+import os
+import threading
+import time
+import pytest
+
+pytest.importorskip('gi')
+
+from storage import atomic_file  # noqa: E402
+from storage import settings_store  # noqa: E402
+from storage.settings_store import DEFAULT_SETTINGS, SettingsStore  # noqa: E402
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'settings.json'
+
+@pytest.fixture
+def changes():
+    return []
+
+def _store(path, changes):
+    store = SettingsStore(str(path))
+    store.connect_changed(lambda store: changes.append(store.as_dict()))
+    return store
+
+def _file_changed(store, event_type=None):
+    """Deliver a file monitor event as Gio would after settings.json was replaced."""
+    event_type = event_type or settings_store.Gio.FileMonitorEvent.CHANGES_DONE_HINT
+    store.on_file_changed(None, None, None, event_type)
+
+def test_missing_file_uses_defaults(path, changes):
+    store = _store(path, changes)
+    assert store.as_dict() == DEFAULT_SETTINGS
+    assert store.get('unknown', 'fallback') == 'fallback'
+
+def test_file_values_override_defaults(path, changes):
+    path.write_text(json.dumps({'opacity': 0.5}))
+    store = _store(path, changes)
+    assert store['opacity'] == 0.5
+    assert store['sound_enabled'] is DEFAULT_SETTINGS['sound_enabled']
+
+def test_update_notifies_only_on_change(path, changes):
+    store = _store(path, changes)
+    store.update({'opacity': DEFAULT_SETTINGS['opacity']})
+    assert changes == []
+    store.update({'opacity': 0.5})
+    assert [change['opacity'] for change in changes] == [0.5]
+    assert not path.exists()  # Nothing is written until save()
+
+def test_save_replaces_the_file_without_leftovers(path, changes):
+    store = _store(path, changes)
+    store.update({'text_color': '#000000'})
+    store.save()
+    assert json.loads(path.read_text())['text_color'] == '#000000'
+    assert os.listdir(path.parent) == ['settings.json']
+
+def test_failed_save_keeps_the_old_file(path, changes, monkeypatch):
+    path.write_text(json.dumps({'opacity': 0.5}))
+    store = _store(path, changes)
+    store.update({'opacity': 0.7})
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(atomic_file.os, 'replace', crash)
+    with pytest.raises(OSError):
+        store.save()
+    assert json.loads(path.read_text()) == {'opacity': 0.5}
+    assert os.listdir(path.parent) == ['settings.json']
+
+def test_file_change_reloads_and_notifies(path, changes):
+    store = _store(path, changes)
+    path.write_text(json.dumps({'opacity': 0.3}))
+    _file_changed(store)
+    assert store['opacity'] == 0.3
+    assert len(changes) == 1
+
+    _file_changed(store, settings_store.Gio.FileMonitorEvent.MOVED_IN)
+    assert len(changes) == 1  # Unchanged contents do not notify again
+
+def test_other_monitor_events_are_ignored(path, changes):
+    store = _store(path, changes)
+    path.write_text(json.dumps({'opacity': 0.3}))
+    _file_changed(store, settings_store.Gio.FileMonitorEvent.ATTRIBUTE_CHANGED)
+    assert store['opacity'] == DEFAULT_SETTINGS['opacity']
+    assert changes == []
+
+def test_unreadable_file_keeps_current_values(path, changes):
+    path.write_text(json.dumps({'opacity': 0.3}))
+    store = _store(path, changes)
+    path.write_text('{"opacity": ')
+    _file_changed(store)
+    assert store['opacity'] == 0.3
+    assert changes == []
+
+def test_concurrent_first_use_shares_one_store(monkeypatch):
+    monkeypatch.setattr(settings_store, '_settings', None)
+    created = []
+
+    class SlowStore:
+        def __init__(self):
+            created.append(self)
+            time.sleep(0.05)  # Long enough for the other caller to ask too
+
+    monkeypatch.setattr(settings_store, 'SettingsStore', SlowStore)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(settings_store.get_settings())) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(created) == 1
+    assert results == created * 2
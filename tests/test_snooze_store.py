@@ -0,0 +1,26 @@
+"""Persistence of snoozed notifications."""
+import json
+from storage.snooze_store import SnoozeStore
+
+def test_snoozes_survive_reloading(tmp_path):
+    path = str(tmp_path / 'snoozes.json')
+    store = SnoozeStore(path)
+    store.add('a', 100.0)
+    store.add('b', 200.0)
+    store.remove('a')
+    store.remove('missing')
+    assert SnoozeStore(path).items() == [('b', 200.0)]
+
+def test_retain_drops_snoozes_of_other_events(tmp_path):
+    path = tmp_path / 'snoozes.json'
+    store = SnoozeStore(str(path))
+    store.add('kept', 100.0)
+    store.add('cancelled', 200.0)
+    store.retain({'kept', 'unsnoozed'})
+    assert store.items() == [('kept', 100.0)]
+    assert json.loads(path.read_text()) == {'kept': 100.0}
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / 'snoozes.json'
+    path.write_text('{"a": ')
+    assert SnoozeStore(str(path)).items() == []
@@ -0,0 +1,163 @@
+"""The pooled HTTP transport and conditional requests through the validator cache."""
+from types import SimpleNamespace
+import pytest
+
+httplib2 = pytest.importorskip('httplib2')
+pytest.importorskip('googleapiclient')
+
+import requests  # noqa: E402
+from googleapiclient.errors import HttpError  # noqa: E402
+from googleapiclient.http import HttpRequest  # noqa: E402
+from metrics.registry import CACHE_LOOKUPS  # noqa: E402
+from gcalendar import transport  # noqa: E402
+from gcalendar.resilience import RetryPolicy  # noqa: E402
+from gcalendar.transport import PooledHttp, TransportResponse, ValidatorCache  # noqa: E402
+
+def _request(uri):
+    """Stands in for a googleapiclient HttpRequest."""
+    return SimpleNamespace(uri=uri, headers={})
+
+def _http_error(status):
+    return HttpError(httplib2.Response({'status': status}), b'')
+
+def _response(status=200, headers=None, content=b'{}', reason='OK'):
+    """A requests.Response as AuthorizedSession returns it, body already decoded."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers.update(headers or {})
+    response._content = content
+    return response
+
+class FakeSession:
+    """Stands in for AuthorizedSession; answers every request with one scripted response."""
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self.headers = {}
+        self.adapters = {}
+        self.answer = _response()
+        self.requests = []
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+@pytest.fixture
+def http(monkeypatch):
+    monkeypatch.setattr(transport, 'AuthorizedSession', FakeSession)
+    return PooledHttp(credentials=object())
+
+def _execute(http, uri='https://example.test/calendar/v3/users/me/calendarList'):
+    """Run a request through googleapiclient the way the service objects do."""
+    return HttpRequest(http, lambda response, content: content, uri).execute()
+
+def test_response_headers_look_like_httplib2():
+    response = TransportResponse(_response(
+        headers={'ETag': '"v1"', 'Content-Type': 'application/json', 'Content-Encoding': 'gzip',
+                 'Content-Length': '120', 'Transfer-Encoding': 'chunked'}
+    ))
+    # Lower-cased names; the decoded body no longer matches the encoding and length headers
+    assert response == {'etag': '"v1"', 'content-type': 'application/json', 'status': '200'}
+    assert response.status == 200
+    assert response.reason == 'OK'
+
+def test_requests_share_the_pooled_session(http):
+    http.session.answer = _response(content=b'{"items": []}')
+    response, content = http.request('https://example.test/calendars', headers={'If-None-Match': '"v1"'})
+    assert (response.status, content) == (200, b'{"items": []}')
+    method, url, kwargs = http.session.requests[0]
+    assert (method, url) == ('GET', 'https://example.test/calendars')
+    assert kwargs['timeout'] == (transport.CONNECT_TIMEOUT, transport.READ_TIMEOUT) == (5, 30)
+    assert kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert 'gzip' in http.session.headers['Accept-Encoding']
+    assert 'gzip' in http.session.headers['User-Agent']
+    assert http.latencies[-1][:3] == ('GET', '/calendars', 200)
+
+def test_error_status_becomes_http_error(http):
+    http.session.answer = _response(404, {'Content-Type': 'application/json'}, b'{"error": {}}', 'Not Found')
+    with pytest.raises(HttpError) as error:
+        _execute(http)
+    assert error.value.resp.status == 404
+
+def test_connection_error_is_a_retryable_network_error(http):
+    http.session.answer = requests.ConnectionError("connection refused")
+    with pytest.raises(OSError) as error:
+        _execute(http)
+    assert RetryPolicy().is_retryable(error.value)
+
+def _lookups():
+    """Current (hits, misses) of the HTTP validator cache."""
+    counts = {'hit': 0, 'miss': 0}
+    for labels, value in CACHE_LOOKUPS.samples():
+        if labels['cache'] == 'http':
+            counts[labels['result']] += value
+    return counts['hit'], counts['miss']
+
+def test_unknown_uri_is_sent_unconditionally():
+    request = _request('https://example.test/calendars')
+    ValidatorCache().prepare(request)
+    assert request.headers == {}
+
+def test_not_modified_reuses_the_stored_result():
+    cache = ValidatorCache()
+    result = {'etag': '"v1"', 'items': [{'id': 'primary'}]}
+    cache.store(_request('https://example.test/calendars'), result)
+
+    request = _request('https://example.test/calendars')
+    cache.prepare(request)
+    assert request.headers['If-None-Match'] == '"v1"'
+    assert cache.resolve(request, _http_error(304)) is result
+
+def test_other_errors_are_not_resolved():
+    cache = ValidatorCache()
+    request = _request('https://example.test/calendars')
+    cache.store(request, {'etag': '"v1"'})
+    assert cache.resolve(request, _http_error(404)) is None
+    assert cache.resolve(request, OSError()) is None
+    assert cache.resolve(_request('https://example.test/other'), _http_error(304)) is None
+
+def test_results_without_etag_are_not_stored():
+    cache = ValidatorCache()
+    cache.store(_request('https://example.test/settings'), {'value': 'UTC'})
+    request = _request('https://example.test/settings')
+    cache.prepare(request)
+    assert request.headers == {}
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ValidatorCache(size=2)
+    for name in ('a', 'b'):
+        cache.store(_request(f'https://example.test/{name}'), {'etag': name})
+    cache.prepare(_request('https://example.test/a'))  # a is now the most recently used
+    cache.store(_request('https://example.test/c'), {'etag': 'c'})
+    assert cache.resolve(_request('https://example.test/a'), _http_error(304)) == {'etag': 'a'}
+    assert cache.resolve(_request('https://example.test/b'), _http_error(304)) is None
+
+def test_lookups_are_counted_once_per_request():
+    cache = ValidatorCache()
+    hits, misses = _lookups()
+
+    first = _request('https://example.test/calendars')
+    cache.prepare(first)  # Nothing stored yet
+    cache.store(first, {'etag': '"v1"'})
+    assert _lookups() == (hits, misses + 1)
+
+    unchanged = _request('https://example.test/calendars')
+    cache.prepare(unchanged)
+    cache.resolve(unchanged, _http_error(304))
+    assert _lookups() == (hits + 1, misses + 1)
+
+    changed = _request('https://example.test/calendars')
+    cache.prepare(changed)
+    cache.store(changed, {'etag': '"v2"'})  # 200 despite If-None-Match
+    assert _lookups() == (hits + 1, misses + 2)
+
+    without_etag = _request('https://example.test/settings')
+    cache.prepare(without_etag)
+    cache.store(without_etag, {'value': 'UTC'})
+    assert _lookups() == (hits + 1, misses + 3)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Microbenchmark: Event model with partial responses vs. the old event dicts.
+
+Compares parsing full event resources into dictionaries with dateutil (the
+old path) against parsing fields=-projected resources into slotted Event
+objects with datetime.fromisoformat. Reports the response size, parse time
+per event and the memory retained by the parsed events.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+from dateutil import parser as dateutil_parser
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from gcalendar.event import Event, EVENT_FIELDS, parse_event_time
+
+TIMEZONE = pytz.timezone('Europe/Berlin')
+
+def make_resource(index, attendees, description_size):
+    """Build a full event resource like events.list returns without fields=."""
+    return {
+        'kind': 'calendar#event',
+        'etag': f'"{3000000000000000 + index}"',
+        'id': f'event{index:06d}',
+        'status': 'confirmed',
+        'htmlLink': f'https://www.google.com/calendar/event?eid=event{index:06d}',
+        'created': '2024-01-01T09:00:00.000Z',
+        'updated': '2024-01-02T09:00:00.000Z',
+        'summary': f'All hands #{index}',
+        'description': 'Agenda and notes. ' * (description_size // 18),
+        'location': 'Main auditorium',
+        'creator': {'email': 'organizer@example.com'},
+        'organizer': {'email': 'organizer@example.com', 'displayName': 'Organizer'},
+        'start': {'dateTime': '2024-05-06T10:00:00+02:00', 'timeZone': 'Europe/Berlin'},
+        'end': {'dateTime': '2024-05-06T11:00:00+02:00', 'timeZone': 'Europe/Berlin'},
+        'iCalUID': f'event{index:06d}@google.com',
+        'sequence': 0,
+        'attendees': [
+            {
+                'email': f'person{n}@example.com',
+                'displayName': f'Person {n}',
+                'responseStatus': 'needsAction',
+            }
+            for n in range(attendees)
+        ],
+        'hangoutLink': 'https://meet.google.com/abc-defg-hij',
+        'reminders': {'useDefault': True},
+        'eventType': 'default',
+    }
+
+def project(resource):
+    """Keep the top-level fields requested with fields=, like a partial response."""
+    wanted = {field.split('(')[0].split('/')[0] for field in EVENT_FIELDS.split(',')}
+    return {key: value for key, value in resource.items() if key in wanted}
+
+def parse_legacy(resource):
+    """The old parsing path: dateutil and a dictionary with every attendee."""
+    def parse_time(value):
+        parsed = dateutil_parser.parse(value.get('dateTime', value.get('date')))
+        if parsed.tzinfo is None:
+            parsed = TIMEZONE.localize(parsed)
+        return parsed
+
+    return {
+        'id': resource['id'],
+        'calendar_id': 'primary',
+        'summary': resource.get('summary', 'No Title'),
+        'start_time': parse_time(resource['start']),
+        'end_time': parse_time(resource['end']),
+        'description': resource.get('description', ''),
+        'location': resource.get('location', ''),
+        'meeting_link': resource.get('hangoutLink'),
+        'attendees': [
+            attendee.get('email')
+            for attendee in resource.get('attendees', [])
+            if attendee.get('email')
+        ],
+        'organizer': resource.get('organizer', {}).get('email', '')
+    }
+
+def parse_event(resource):
+    """The new parsing path: fromisoformat into a slotted Event."""
+    return Event(
+        resource['id'],
+        'primary',
+        resource.get('summary', 'No Title'),
+        parse_event_time(resource['start'], TIMEZONE),
+        parse_event_time(resource['end'], TIMEZONE),
+        description=resource.get('description', ''),
+        location=resource.get('location', ''),
+        meeting_link=resource.get('hangoutLink'),
+        organizer=resource.get('organizer', {}).get('email', '')
+    )
+
+def measure(name, parse, payloads):
+    """Print parse time per event and memory retained by the parsed events."""
+    resources = [json.loads(payload) for payload in payloads]
+    runs = timeit.repeat(lambda: [parse(resource) for resource in resources], number=1, repeat=5)
+    per_event_us = min(runs) / len(resources) * 1e6
+
+    gc.collect()
+    tracemalloc.start()
+    # Decode inside the measurement so only what the parsed events keep alive remains
+    events = [parse(json.loads(payload)) for payload in payloads]
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size_kb = sum(len(payload) for payload in payloads) / 1024
+    print(
+        f"{name:<28} {size_kb:10.0f} KB {per_event_us:12.1f} µs "
+        f"{retained / len(events) / 1024:12.1f} KB"
+    )
+    return per_event_us, retained
+
+def main():
+    """Main function."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--events', type=int, default=500, help="number of events")
+    arg_parser.add_argument('--attendees', type=int, default=300, help="attendees per event")
+    arg_parser.add_argument('--description', type=int, default=4000,
+                            help="description length in characters")
+    args = arg_parser.parse_args()
+
+    resources = [make_resource(i, args.attendees, args.description) for i in range(args.events)]
+    full = [json.dumps(resource) for resource in resources]
+    projected = [json.dumps(project(resource)) for resource in resources]
+
+    print(f"{args.events} events, {args.attendees} attendees each\n")
+    print(f"{'':<28} {'response':>13} {'parse/event':>15} {'memory/event':>15}")
+    legacy_time, legacy_memory = measure('dict + dateutil (old)', parse_legacy, full)
+    event_time, event_memory = measure('Event + fields= (new)', parse_event, projected)
+    print(
+        f"\nParsing is {legacy_time / event_time:.1f}x faster and parsed events use "
+        f"{legacy_memory / event_memory:.1f}x less memory"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Benchmark notification windows on many monitors under Xvfb.
+
+For every combination of monitor count and resolution a headless X server
+is started with one virtual screen split into monitors with xrandr
+--setmonitor, and a fresh child process shows notifications on it. The
+child reports:
+
+- build time: constructing the hidden windows for every monitor
+  (what the app does 30 seconds ahead of the meeting),
+- trigger to mapped: from present_all() until every window is mapped,
+  for prepared windows and for windows built at trigger time (cold),
+- frame time: one frame of a window, from its frame clock's before-paint
+  to after-paint (layout and drawing), over repeated redraws,
+- peak RSS of the child process.
+
+Results are printed as a table and saved as JSON. Requires Xvfb and xrandr
+(sudo apt install xvfb x11-xserver-utils).
+"""
+import argparse
+import json
+import math
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+# Resolution name -> (width, height, physical width mm, physical height mm)
+RESOLUTIONS = {
+    '1080p': (1920, 1080, 527, 296),
+    '4k': (3840, 2160, 597, 336),
+}
+DEFAULT_MONITORS = [1, 2, 4, 6]
+# Seconds to wait for X events before a run is considered hung
+EVENT_TIMEOUT = 10
+
+def start_xvfb(width, height):
+    """Start Xvfb on a free display; returns (process, display name)."""
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        ['Xvfb', '-displayfd', str(write_fd), '-screen', '0', f'{width}x{height}x24',
+         '+extension', 'RANDR', '-nolisten', 'tcp'],
+        pass_fds=(write_fd,),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        process.kill()
+        sys.exit("Xvfb did not start")
+    return process, f':{number}'
+
+def set_monitors(display, count, resolution):
+    """Split the screen into count monitors in a grid."""
+    width, height, width_mm, height_mm = RESOLUTIONS[resolution]
+    columns = math.ceil(math.sqrt(count))
+    for index in range(count):
+        x = index % columns * width
+        y = index // columns * height
+        # The first monitor takes over Xvfb's output so the automatic full-screen monitor goes away
+        output = 'screen' if index == 0 else 'none'
+        subprocess.run(
+            ['xrandr', '--display', display, '--setmonitor', f'bench-{index}',
+             f'{width}/{width_mm}x{height}/{height_mm}+{x}+{y}', output],
+            check=True
+        )
+
+def run_config(count, resolution, args):
+    """Benchmark one monitor layout in a child process; returns its result dict."""
+    width, height, _, _ = RESOLUTIONS[resolution]
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    xvfb, display = start_xvfb(width * columns, height * rows)
+    try:
+        set_monitors(display, count, resolution)
+        with tempfile.TemporaryDirectory() as home:
+            # Default settings in a private home, without sound
+            config_dir = Path(home) / '.config' / 'meeting-notifier'
+            config_dir.mkdir(parents=True)
+            settings = {'sound_enabled': False, 'background_image': args.background_image or ''}
+            (config_dir / 'settings.json').write_text(json.dumps(settings))
+            result_file = Path(home) / 'result.json'
+            env = dict(os.environ, DISPLAY=display, HOME=home, GDK_BACKEND='x11')
+            env.pop('WAYLAND_DISPLAY', None)
+            child = subprocess.run(
+                [sys.executable, __file__, '--child', str(result_file),
+                 '--runs', str(args.runs), '--frames', str(args.frames)],
+                env=env,
+                stdout=subprocess.DEVNULL,  # NotificationWindow prints progress
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=EVENT_TIMEOUT * (args.runs + 2) * 4
+            )
+            if child.returncode != 0:
+                print(child.stderr, file=sys.stderr)
+                return {'monitors': count, 'resolution': resolution, 'error': f"exit code {child.returncode}"}
+            result = json.loads(result_file.read_text())
+    finally:
+        xvfb.terminate()
+        xvfb.wait()
+    result.update(monitors=count, resolution=resolution)
+    return result
+
+def summarize(values):
+    """Median, 95th percentile and maximum of a list of milliseconds."""
+    ordered = sorted(values)
+    return {
+        'median_ms': round(statistics.median(ordered), 2),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        'max_ms': round(ordered[-1], 2),
+    }
+
+def child_main(result_file, runs, frames):
+    """Show notifications on the current display and write the measurements."""
+    sys.path.insert(0, str(SRC_DIR))
+    import gi
+    gi.require_version('Gtk', '3.0')
+    gi.require_version('Gdk', '3.0')
+    from gi.repository import Gdk, GLib, Gtk
+    from gcalendar.event import Event
+    from ui.notification_window import NotificationWindow
+
+    def run_until(done):
+        # A short timer keeps the blocking iteration from sleeping past the deadline
+        wakeup = GLib.timeout_add(5, lambda: True)
+        deadline = time.monotonic() + EVENT_TIMEOUT
+        try:
+            while not done():
+                if time.monotonic() > deadline:
+                    raise TimeoutError("X events did not arrive")
+                GLib.MainContext.default().iteration(True)
+        finally:
+            GLib.source_remove(wakeup)
+
+    def make_event(index):
+        start = datetime.now(timezone.utc) + timedelta(minutes=1)
+        return Event(
+            f'bench{index}',
+            'primary',
+            'Quarterly planning review',
+            start,
+            start + timedelta(hours=1),
+            description='Agenda:\n' + '\n'.join(f'{n}. Topic {n}' for n in range(1, 8)),
+            meeting_link='https://meet.google.com/abc-defg-hij',
+            meeting_provider='Google Meet'
+        )
+
+    def present(notification):
+        started = time.perf_counter()
+        notification.present_all(time.time())
+        run_until(lambda: len(notification.mapped_windows) == len(notification.windows))
+        return (time.perf_counter() - started) * 1000
+
+    def measure_frames(windows):
+        durations = []
+        pending = set()
+        started = {}
+
+        def on_before_paint(clock, window):
+            started[window] = time.perf_counter()
+
+        def on_after_paint(clock, window):
+            if window in started:
+                durations.append((time.perf_counter() - started.pop(window)) * 1000)
+            pending.discard(window)
+
+        handlers = []
+        for window in windows:
+            clock = window.get_frame_clock()
+            handlers.append((clock, clock.connect('before-paint', on_before_paint, window)))
+            handlers.append((clock, clock.connect('after-paint', on_after_paint, window)))
+        for _ in range(frames):
+            pending.update(windows)
+            for window in windows:
+                window.queue_draw()
+            run_until(lambda: not pending)
+        for clock, handler in handlers:
+            clock.disconnect(handler)
+        return durations
+
+    def close(notification):
+        windows = list(notification.windows)
+        for window in windows:
+            window.destroy()
+        while Gtk.events_pending():
+            Gtk.main_iteration()
+
+    detected = Gdk.Display.get_default().get_n_monitors()
+    build, prepared, cold, frame_times = [], [], [], []
+    for index in range(runs):
+        # Prepared: windows built ahead, mapped at trigger time
+        started = time.perf_counter()
+        notification = NotificationWindow(make_event(index), is_primary=True)
+        build.append((time.perf_counter() - started) * 1000)
+        prepared.append(present(notification))
+        frame_times.extend(measure_frames(list(notification.windows)))
+        close(notification)
+
+        # Cold: built and mapped at trigger time
+        started = time.perf_counter()
+        notification = NotificationWindow(make_event(index), is_primary=True)
+        present(notification)
+        cold.append((time.perf_counter() - started) * 1000)
+        close(notification)
+
+    result = {
+        'monitors_detected': detected,
+        'build': summarize(build),
+        'trigger_to_mapped_prepared': summarize(prepared),
+        'trigger_to_mapped_cold': summarize(cold),
+        'frame': summarize(frame_times),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    Path(result_file).write_text(json.dumps(result))
+
+def main():
+    """Main function."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--monitors', type=int, nargs='+', default=DEFAULT_MONITORS,
+                            help="monitor counts to test (default 1 2 4 6)")
+    arg_parser.add_argument('--resolutions', nargs='+', choices=sorted(RESOLUTIONS),
+                            default=['1080p', '4k'], help="monitor resolutions to test")
+    arg_parser.add_argument('--runs', type=int, default=10, help="notifications shown per layout")
+    arg_parser.add_argument('--frames', type=int, default=30, help="redraws timed per notification")
+    arg_parser.add_argument('--background-image', help="background image to render, default none")
+    arg_parser.add_argument('--output', default='bench_monitors.json', help="where to save the JSON results")
+    arg_parser.add_argument('--child', metavar='RESULT_FILE', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        child_main(args.child, args.runs, args.frames)
+        return
+
+    results = []
+    print(f"{'layout':<14} {'build':>10} {'prepared':>10} {'cold':>10} {'frame':>10} {'peak RSS':>10}")
+    for resolution in args.resolutions:
+        for count in args.monitors:
+            result = run_config(count, resolution, args)
+            results.append(result)
+            layout = f"{count} x {resolution}"
+            if 'error' in result:
+                print(f"{layout:<14} failed: {result['error']}")
+                continue
+            if result['monitors_detected'] != count:
+                print(f"Warning: GDK saw {result['monitors_detected']} monitors instead of {count}")
+            print(
+                f"{layout:<14} {result['build']['median_ms']:8.1f}ms "
+                f"{result['trigger_to_mapped_prepared']['median_ms']:8.1f}ms "
+                f"{result['trigger_to_mapped_cold']['median_ms']:8.1f}ms "
+                f"{result['frame']['median_ms']:8.2f}ms {result['peak_rss_mb']:8.1f}MB"
+            )
+
+    Path(args.output).write_text(json.dumps({
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'runs': args.runs,
+        'frames': args.frames,
+        'background_image': args.background_image,
+        'results': results,
+    }, indent=2))
+    print(f"\nMedians shown; full results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
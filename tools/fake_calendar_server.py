@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Google Calendar v3 API, for load and scale tests.
+
+Serves the endpoints the notifier uses with synthetic data:
+
+- events.list with paging, time windows, orderBy, fields= projection,
+  sync tokens (410 Gone when a token is invalidated) and ETags (304),
+- events.get, calendarList.list, settings.get and freeBusy.query,
+- multipart batch requests on /batch/calendar/v3.
+
+Calendars are generated from a seed, so runs are reproducible: thousands of
+one-off events, all-day events and recurring series expanded into instances.
+Optional churn edits, adds and cancels events while the server runs so
+incremental syncs have work to do, and latency and errors (429, 5xx, 403
+rateLimitExceeded) can be injected.
+
+Point the notifier at it with the 'api_endpoint' setting or
+
+    MEETING_NOTIFIER_API_ENDPOINT=http://127.0.0.1:8080/ python3 -m src.main
+
+No sign-in is needed then. Events are kept in test_events.db instead of the
+real store. GET /fake/stats returns request counts and POST
+/fake/invalidate-sync-tokens makes the next incremental syncs fail with 410.
+"""
+import argparse
+import base64
+import email.parser
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytz
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/calendar/v3'
+BATCH_PATH = '/batch/calendar/v3'
+# Limits of the real API
+MAX_PAGE_SIZE = 2500
+DEFAULT_PAGE_SIZE = 250
+MAX_BATCH_PARTS = 50
+
+PROVIDER_LINKS = [
+    'https://meet.google.com/abc-defg-hij',
+    'https://example.zoom.us/j/1234567890?pwd=abcdef',
+    'https://teams.microsoft.com/l/meetup-join/19%3ameeting_abc%40thread.v2/0',
+    'https://meet.jit.si/load-test-room',
+]
+
+class ApiError(Exception):
+    """An error answered in the Calendar API's JSON error format."""
+
+    def __init__(self, status, reason, message, domain='global', headers=None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.domain = domain
+        self.headers = headers or {}
+
+    def body(self):
+        return {'error': {
+            'errors': [{'domain': self.domain, 'reason': self.reason, 'message': str(self)}],
+            'code': self.status,
+            'message': str(self),
+        }}
+
+def format_time(value):
+    """RFC 3339 in UTC, the way the API returns dateTime values."""
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def parse_time(text):
+    """Parse an RFC 3339 query parameter."""
+    return datetime.fromisoformat(text.replace('Z', '+00:00'))
+
+def event_bounds(event, calendar_timezone):
+    """Return the (start, end) datetimes of an event resource.
+
+    All-day dates start at midnight in the calendar's timezone, as they do
+    for the API and the notifier.
+    """
+    def parse(value):
+        if 'dateTime' in value:
+            return parse_time(value['dateTime'])
+        return calendar_timezone.localize(datetime.fromisoformat(value['date']))
+    return parse(event['start']), parse(event['end'])
+
+def encode_token(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+def decode_token(token):
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode()))
+    except ValueError:
+        return None
+
+def parse_fields(text):
+    """Parse a fields= mask like 'items(id,start),nextPageToken' into a tree."""
+    tree = {}
+    position = 0
+
+    def parse_list(node):
+        nonlocal position
+        while position < len(text):
+            name = ''
+            while position < len(text) and text[position] not in ',()':
+                name += text[position]
+                position += 1
+            # a/b/c selects nested fields
+            parts = [part for part in name.strip().split('/') if part]
+            target = node
+            for part in parts[:-1]:
+                if target.get(part) is None:
+                    target[part] = {}
+                target = target[part]
+            leaf = parts[-1] if parts else None
+            if position < len(text) and text[position] == '(':
+                position += 1
+                child = target.get(leaf) or {}
+                parse_list(child)
+                target[leaf] = child
+            elif leaf:
+                target[leaf] = None
+            if position < len(text) and text[position] == ')':
+                position += 1
+                return
+            position += 1  # Skip the comma
+
+    parse_list(tree)
+    return tree
+
+def project(value, tree):
+    """Keep only the fields selected by a parsed fields= mask."""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: project(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+class FakeCalendarData:
+    """Synthetic calendars with versioned events, shared by all request threads."""
+
+    def __init__(self, args):
+        """Generate the calendars described by the command line arguments."""
+        self.lock = threading.Lock()
+        self.random = random.Random(args.seed)
+        self.timezone = args.timezone
+        self.tz = pytz.timezone(args.timezone)
+        self.version = 0
+        self.sync_epoch = 0  # Sync tokens from older epochs are rejected with 410
+        self.calendars = {}  # calendar id -> {'entry': ..., 'events': {id: event}, 'versions': {id: version}}
+        self.now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        self.days = args.days
+        self.next_id = 0
+
+        for index in range(args.calendars):
+            calendar_id = 'primary' if index == 0 else f'team{index}@group.calendar.example.com'
+            self.calendars[calendar_id] = {
+                'entry': {
+                    'kind': 'calendar#calendarListEntry',
+                    'id': calendar_id,
+                    'summary': 'Load test user' if index == 0 else f'Team calendar {index}',
+                    'timeZone': self.timezone,
+                    'accessRole': 'owner' if index == 0 else 'reader',
+                    'selected': True,
+                    'primary': index == 0,
+                },
+                'events': {},
+                'versions': {},
+            }
+            calendar = self.calendars[calendar_id]
+            for _ in range(args.events):
+                self._store(calendar, self._make_event(calendar_id))
+            for series in range(args.recurring):
+                for event in self._make_series(calendar_id, series):
+                    self._store(calendar, event)
+        total = sum(len(calendar['events']) for calendar in self.calendars.values())
+        logger.info(f"Generated {total} events in {len(self.calendars)} calendars")
+
+    def _new_id(self, prefix='evt'):
+        self.next_id += 1
+        return f'{prefix}{self.next_id:07d}'
+
+    def _store(self, calendar, event):
+        """Add or replace an event, giving it a new version and etag."""
+        self.version += 1
+        event['etag'] = f'"{self.version}"'
+        event['updated'] = format_time(datetime.now(timezone.utc))
+        calendar['events'][event['id']] = event
+        calendar['versions'][event['id']] = self.version
+
+    def _make_event(self, calendar_id, start=None):
+        """A one-off event somewhere in the generated range."""
+        rng = self.random
+        event_id = self._new_id()
+        if start is None:
+            offset = rng.randrange(-24 * 4, self.days * 24 * 4)
+            start = self.now + timedelta(minutes=15 * offset)
+        event = {
+            'kind': 'calendar#event',
+            'id': event_id,
+            'status': 'confirmed',
+            'htmlLink': f'https://calendar.example.com/event?eid={event_id}',
+            'summary': f'Meeting {event_id[3:]}',
+            'organizer': {'email': f'{calendar_id.split("@")[0]}@example.com'},
+            'attendees': [
+                {'email': f'person{rng.randrange(1000)}@example.com', 'responseStatus': 'needsAction'}
+                for _ in range(rng.randrange(0, 12))
+            ],
+            'reminders': {'useDefault': True},
+            'eventType': 'default',
+        }
+        if rng.random() < 0.05:
+            day = start.date()
+            event['start'] = {'date': day.isoformat()}
+            event['end'] = {'date': (day + timedelta(days=1)).isoformat()}
+            return event
+        event['start'] = {'dateTime': format_time(start), 'timeZone': self.timezone}
+        event['end'] = {'dateTime': format_time(start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90]))),
+                        'timeZone': self.timezone}
+        link = rng.choice(PROVIDER_LINKS)
+        where = rng.random()
+        if where < 0.4:
+            event['hangoutLink'] = PROVIDER_LINKS[0]
+            event['conferenceData'] = {
+                'conferenceSolution': {'name': 'Google Meet'},
+                'entryPoints': [{'entryPointType': 'video', 'uri': PROVIDER_LINKS[0]}],
+            }
+        elif where < 0.6:
+            event['location'] = link
+        elif where < 0.9:
+            event['description'] = f'Agenda for the meeting.\n\nJoin: {link}\n' + 'Notes. ' * rng.randrange(0, 200)
+        return event
+
+    def _make_series(self, calendar_id, series):
+        """Instances of a daily or weekly recurring series, as singleEvents=true returns them."""
+        rng = self.random
+        base_id = self._new_id('series')
+        weekly = series % 3 == 2
+        first = (self.now - timedelta(days=1)).replace(hour=rng.choice([8, 9, 10, 14, 16]),
+                                                       minute=rng.choice([0, 15, 30, 45]))
+        duration = timedelta(minutes=rng.choice([15, 30]))
+        instances = []
+        day = first
+        while day < self.now + timedelta(days=self.days):
+            if day.weekday() < 5 and (not weekly or day.weekday() == first.weekday()):
+                instance_id = f'{base_id}_{day.strftime("%Y%m%dT%H%M%SZ")}'
+                instances.append({
+                    'kind': 'calendar#event',
+                    'id': instance_id,
+                    'status': 'confirmed',
+                    'summary': f'{"Weekly sync" if weekly else "Daily standup"} {series}',
+                    'recurringEventId': base_id,
+                    'originalStartTime': {'dateTime': format_time(day), 'timeZone': self.timezone},
+                    'start': {'dateTime': format_time(day), 'timeZone': self.timezone},
+                    'end': {'dateTime': format_time(day + duration), 'timeZone': self.timezone},
+                    'organizer': {'email': f'{calendar_id.split("@")[0]}@example.com'},
+                    'hangoutLink': PROVIDER_LINKS[0],
+                })
+            day += timedelta(days=1)
+        return instances
+
+    def churn(self, changes):
+        """Edit, cancel and add events, as other users of the calendars would."""
+        with self.lock:
+            for _ in range(changes):
+                calendar = self.calendars[self.random.choice(list(self.calendars))]
+                live = [event for event in calendar['events'].values() if event['status'] != 'cancelled']
+                action = self.random.random()
+                if action < 0.2 or not live:
+                    start = datetime.now(timezone.utc) + timedelta(minutes=self.random.randrange(5, 240))
+                    self._store(calendar, self._make_event(calendar['entry']['id'], start.replace(second=0)))
+                    continue
+                event = dict(self.random.choice(live))
+                if action < 0.3:
+                    event = {'kind': 'calendar#event', 'id': event['id'], 'status': 'cancelled'}
+                elif 'dateTime' in event['start']:
+                    start, end = event_bounds(event, self.tz)
+                    shift = timedelta(minutes=15 * self.random.choice([-2, -1, 1, 2]))
+                    event['start'] = dict(event['start'], dateTime=format_time(start + shift))
+                    event['end'] = dict(event['end'], dateTime=format_time(end + shift))
+                else:
+                    event['summary'] = event['summary'] + ' (updated)'
+                self._store(calendar, event)
+
+    def calendar(self, calendar_id):
+        calendar = self.calendars.get(calendar_id)
+        if calendar is None:
+            raise ApiError(404, 'notFound', 'Not Found')
+        return calendar
+
+    def list_events(self, calendar_id, params):
+        """events.list; returns (body, etag)."""
+        calendar = self.calendar(calendar_id)
+        page_size = min(int(params.get('maxResults', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        page = decode_token(params['pageToken']) if 'pageToken' in params else None
+        if 'pageToken' in params and page is None:
+            raise ApiError(400, 'invalid', 'Invalid page token')
+
+        with self.lock:
+            if 'syncToken' in params:
+                if 'timeMin' in params or 'timeMax' in params or 'orderBy' in params:
+                    raise ApiError(400, 'invalid', 'Sync token cannot be combined with timeMin, timeMax or orderBy')
+                token = decode_token(params['syncToken'])
+                if not token or token.get('c') != calendar_id or token.get('e') != self.sync_epoch:
+                    raise ApiError(410, 'fullSyncRequired', 'Sync token is no longer valid, a full sync is required.')
+                since = token['v']
+                items = [
+                    calendar['events'][event_id]
+                    for event_id, version in calendar['versions'].items()
+                    if version > since
+                ]
+                items.sort(key=lambda event: calendar['versions'][event['id']])
+            else:
+                time_min = parse_time(params['timeMin']) if 'timeMin' in params else None
+                time_max = parse_time(params['timeMax']) if 'timeMax' in params else None
+                items = []
+                for event in calendar['events'].values():
+                    if event['status'] == 'cancelled' and params.get('showDeleted') != 'true':
+                        continue
+                    if event['status'] != 'cancelled':
+                        start, end = event_bounds(event, self.tz)
+                        if (time_min and end <= time_min) or (time_max and start >= time_max):
+                            continue
+                    items.append(event)
+                if params.get('orderBy') == 'startTime':
+                    items.sort(key=lambda event: event_bounds(event, self.tz)[0])
+                else:
+                    items.sort(key=lambda event: event['id'])
+            # Later pages report the version seen by the first page, so nothing is skipped
+            version = page['v'] if page else max(calendar['versions'].values(), default=0)
+            etag = f'"{version}-{len(items)}"'
+
+        offset = page['o'] if page else 0
+        body = {
+            'kind': 'calendar#events',
+            'etag': etag,
+            'summary': calendar['entry']['summary'],
+            'timeZone': self.timezone,
+            'items': items[offset:offset + page_size],
+        }
+        if offset + page_size < len(items):
+            body['nextPageToken'] = encode_token({'o': offset + page_size, 'v': version})
+        elif 'orderBy' not in params:
+            body['nextSyncToken'] = encode_token({'c': calendar_id, 'v': version, 'e': self.sync_epoch})
+        return body, etag
+
+    def get_event(self, calendar_id, event_id):
+        event = self.calendar(calendar_id)['events'].get(event_id)
+        if event is None:
+            raise ApiError(404, 'notFound', 'Not Found')
+        return event, event['etag']
+
+    def calendar_list(self, params):
+        entries = [calendar['entry'] for calendar in self.calendars.values()]
+        page_size = min(int(params.get('maxResults', 100)), 250)
+        offset = (decode_token(params['pageToken']) or {}).get('o', 0) if 'pageToken' in params else 0
+        etag = '"calendars-%d"' % len(entries)
+        body = {'kind': 'calendar#calendarList', 'etag': etag, 'items': entries[offset:offset + page_size]}
+        if offset + page_size < len(entries):
+            body['nextPageToken'] = encode_token({'o': offset + page_size})
+        return body, etag
+
+    def setting(self, name):
+        if name != 'timezone':
+            raise ApiError(404, 'notFound', 'Not Found')
+        etag = '"' + hashlib.sha1(self.timezone.encode()).hexdigest()[:12] + '"'
+        return {'kind': 'calendar#setting', 'etag': etag, 'id': 'timezone', 'value': self.timezone}, etag
+
+    def free_busy(self, query):
+        time_min, time_max = parse_time(query['timeMin']), parse_time(query['timeMax'])
+        calendars = {}
+        with self.lock:
+            for item in query.get('items', []):
+                calendar = self.calendars.get(item['id'])
+                if calendar is None:
+                    calendars[item['id']] = {'errors': [{'domain': 'global', 'reason': 'notFound'}], 'busy': []}
+                    continue
+                busy = []
+                for event in calendar['events'].values():
+                    if event['status'] == 'cancelled' or 'dateTime' not in event['start']:
+                        continue
+                    start, end = event_bounds(event, self.tz)
+                    if end > time_min and start < time_max:
+                        busy.append((max(start, time_min), min(end, time_max)))
+                merged = []
+                for start, end in sorted(busy):
+                    if merged and start <= merged[-1][1]:
+                        merged[-1][1] = max(merged[-1][1], end)
+                    else:
+                        merged.append([start, end])
+                calendars[item['id']] = {
+                    'busy': [{'start': format_time(start), 'end': format_time(end)} for start, end in merged]
+                }
+        return {'kind': 'calendar#freeBusy', 'timeMin': query['timeMin'], 'timeMax': query['timeMax'],
+                'calendars': calendars}
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    """Routes API requests to the shared FakeCalendarData."""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def handle_request(self, method):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        server.count('requests')
+        server.inject_latency()
+        if urlsplit(self.path).path == BATCH_PATH and method == 'POST':
+            status, headers, content = self.handle_batch(body)
+        else:
+            status, headers, content = server.dispatch(method, self.path, dict(self.headers), body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def handle_batch(self, body):
+        """Answer a multipart/mixed batch by dispatching each part."""
+        content_type = self.headers.get('Content-Type', '')
+        message = email.parser.BytesParser().parsebytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+        )
+        if not message.is_multipart():
+            return self.server.error_response(ApiError(400, 'invalid', 'Batch body must be multipart/mixed'))
+        parts = message.get_payload()
+        if len(parts) > MAX_BATCH_PARTS:
+            return self.server.error_response(
+                ApiError(400, 'invalid', f'A batch may contain at most {MAX_BATCH_PARTS} requests'))
+        self.server.count('batches')
+
+        boundary = f'batch_{random.getrandbits(64):016x}'
+        out = []
+        for part in parts:
+            request_line, _, rest = part.get_payload().partition('\r\n')
+            if not rest:
+                request_line, _, rest = part.get_payload().partition('\n')
+            headers_text, _, part_body = rest.replace('\r\n', '\n').partition('\n\n')
+            headers = dict(line.split(': ', 1) for line in headers_text.split('\n') if ': ' in line)
+            method, path, _ = request_line.split(' ', 2)
+            status, response_headers, content = self.server.dispatch(
+                method, path, headers, part_body.encode(), in_batch=True)
+            header_lines = ''.join(f'{name}: {value}\r\n' for name, value in response_headers.items())
+            # The client folds long Content-ID headers; it expects them back unfolded
+            content_id = part.get('Content-ID', '').replace('\r', '').replace('\n', '').strip('<>')
+            out.append(
+                f'--{boundary}\r\nContent-Type: application/http\r\n'
+                f'Content-ID: <response-{content_id}>\r\n\r\n'
+                f'HTTP/1.1 {status} {self.responses.get(status, ("",))[0]}\r\n'
+                f'{header_lines}Content-Length: {len(content)}\r\n\r\n'
+                + content.decode() + '\r\n'
+            )
+        content = (''.join(out) + f'--{boundary}--\r\n').encode()
+        return 200, {'Content-Type': f'multipart/mixed; boundary={boundary}'}, content
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            logger.info(f"{self.address_string()} {format % args}")
+
+class FakeCalendarServer(ThreadingHTTPServer):
+    """HTTP server holding the fake data and the fault injection settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address, data, args):
+        super().__init__(address, FakeCalendarHandler)
+        self.data = data
+        self.latency = args.latency_ms / 1000
+        self.jitter = args.jitter_ms / 1000
+        self.error_rate = args.error_rate
+        self.error_codes = args.error_codes
+        self.verbose = args.verbose
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + amount
+
+    def inject_latency(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+    def injected_error(self):
+        """Return an ApiError to answer with, or None."""
+        if not self.error_rate or random.random() >= self.error_rate:
+            return None
+        status = random.choice(self.error_codes)
+        self.count(f'injected_{status}')
+        if status == 403:
+            return ApiError(403, 'rateLimitExceeded', 'Rate Limit Exceeded', domain='usageLimits')
+        if status == 429:
+            return ApiError(429, 'rateLimitExceeded', 'Rate Limit Exceeded', domain='usageLimits',
+                            headers={'Retry-After': '1'})
+        return ApiError(status, 'backendError', 'Backend Error')
+
+    def error_response(self, error):
+        headers = dict(error.headers, **{'Content-Type': 'application/json; charset=UTF-8'})
+        return error.status, headers, json.dumps(error.body()).encode()
+
+    def dispatch(self, method, path, headers, body, in_batch=False):
+        """Handle one API request; returns (status, headers, content)."""
+        url = urlsplit(path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        segments = [unquote(segment) for segment in url.path.split('/') if segment]
+        try:
+            if segments[:1] == ['fake']:
+                return self.admin(method, segments[1:])
+            if '/' + '/'.join(segments[:2]) != API_PREFIX:
+                raise ApiError(404, 'notFound', 'Not Found')
+            error = self.injected_error()
+            if error is not None:
+                raise error
+            self.count('batch_parts' if in_batch else 'calls')
+            route = segments[2:]
+            if method == 'GET' and len(route) == 3 and route[0] == 'calendars' and route[2] == 'events':
+                result, etag = self.data.list_events(route[1], params)
+                self.count('events_returned', len(result['items']))
+            elif method == 'GET' and len(route) == 4 and route[0] == 'calendars' and route[2] == 'events':
+                result, etag = self.data.get_event(route[1], route[3])
+            elif method == 'GET' and route == ['users', 'me', 'calendarList']:
+                result, etag = self.data.calendar_list(params)
+            elif method == 'GET' and len(route) == 4 and route[:3] == ['users', 'me', 'settings']:
+                result, etag = self.data.setting(route[3])
+            elif method == 'POST' and route == ['freeBusy']:
+                result, etag = self.data.free_busy(json.loads(body or b'{}')), None
+            else:
+                raise ApiError(404, 'notFound', 'Not Found')
+        except ApiError as error:
+            return self.error_response(error)
+        except (KeyError, ValueError) as error:
+            return self.error_response(ApiError(400, 'invalid', f'Invalid request: {error}'))
+
+        if etag is not None and headers.get('If-None-Match') == etag:
+            self.count('not_modified')
+            return 304, {'ETag': etag}, b''
+        if 'fields' in params:
+            result = project(result, parse_fields(params['fields']))
+        response_headers = {'Content-Type': 'application/json; charset=UTF-8'}
+        if etag is not None:
+            response_headers['ETag'] = etag
+        return 200, response_headers, json.dumps(result).encode()
+
+    def admin(self, method, route):
+        """Test controls under /fake/."""
+        if method == 'GET' and route == ['stats']:
+            with self._stats_lock:
+                content = json.dumps(self.stats, indent=2)
+            return 200, {'Content-Type': 'application/json'}, content.encode()
+        if method == 'POST' and route == ['invalidate-sync-tokens']:
+            with self.data.lock:
+                self.data.sync_epoch += 1
+            return 200, {'Content-Type': 'application/json'}, b'{}'
+        return self.error_response(ApiError(404, 'notFound', 'Not Found'))
+
+def run_churn(data, changes, interval):
+    """Apply churn forever on a daemon thread."""
+    while True:
+        time.sleep(interval)
+        data.churn(changes)
+
+def main():
+    """Main function."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8080)
+    arg_parser.add_argument('--calendars', type=int, default=3, help="number of calendars, the first is primary")
+    arg_parser.add_argument('--events', type=int, default=2000, help="one-off events per calendar")
+    arg_parser.add_argument('--recurring', type=int, default=10, help="recurring series per calendar")
+    arg_parser.add_argument('--days', type=int, default=14, help="days ahead to generate events for")
+    arg_parser.add_argument('--timezone', default='Europe/Berlin', help="calendar timezone setting")
+    arg_parser.add_argument('--seed', type=int, default=1, help="random seed for reproducible data")
+    arg_parser.add_argument('--churn', type=int, default=0, help="events changed per churn interval")
+    arg_parser.add_argument('--churn-interval', type=float, default=60, help="seconds between churn rounds")
+    arg_parser.add_argument('--latency-ms', type=float, default=0, help="added to every HTTP request")
+    arg_parser.add_argument('--jitter-ms', type=float, default=0, help="random +/- variation of the latency")
+    arg_parser.add_argument('--error-rate', type=float, default=0,
+                            help="fraction of API calls answered with an injected error")
+    arg_parser.add_argument('--error-codes', type=int, nargs='+', default=[429, 503, 403],
+                            help="statuses to inject; 403 and 429 are rate-limit errors")
+    arg_parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = arg_parser.parse_args()
+
+    data = FakeCalendarData(args)
+    if args.churn:
+        threading.Thread(target=run_churn, args=(data, args.churn, args.churn_interval), daemon=True).start()
+    server = FakeCalendarServer((args.host, args.port), data, args)
+    logger.info(f"Fake Calendar API on http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
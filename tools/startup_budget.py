@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Check the import-time budget of the application's start-up path.
+
+Imports src.main in a fresh interpreter with -X importtime, prints the
+slowest top-level imports and fails when the total exceeds the budget or
+when a module that is meant to be imported lazily shows up.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Total import time allowed before the tray icon can be shown
+DEFAULT_BUDGET_MS = 300
+
+# Modules that must only be imported after start-up (on the fetch worker or on first use)
+LAZY_MODULES = [
+    'googleapiclient',
+    'google_auth_oauthlib',
+    'google.oauth2',
+    'pytz',
+    'dateutil',
+    'requests',
+]
+
+def measure(root_dir):
+    """Import the app once; return {top-level module: cumulative µs} and all module names."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import src.main'],
+        cwd=root_dir,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        sys.exit(f"Importing src.main failed with exit code {result.returncode}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown by indentation; top-level imports are the least indented
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+
+    top_indent = min(indent for indent, _, _ in entries)
+    top_level = {name: cumulative for indent, name, cumulative in entries if indent == top_indent}
+    modules = {name for _, name, _ in entries}
+    return top_level, modules
+
+def main():
+    """Main function."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                            help=f"maximum total import time (default {DEFAULT_BUDGET_MS} ms)")
+    arg_parser.add_argument('--runs', type=int, default=5,
+                            help="number of fresh interpreters to measure; the median is used")
+    arg_parser.add_argument('--top', type=int, default=15,
+                            help="number of slowest imports to list")
+    args = arg_parser.parse_args()
+
+    root_dir = Path(__file__).parent.parent
+    runs = [measure(root_dir) for _ in range(args.runs)]
+    totals = [sum(top_level.values()) / 1000 for top_level, _ in runs]
+    total_ms = statistics.median(totals)
+
+    top_level, modules = runs[-1]
+    print(f"Slowest top-level imports (last of {args.runs} runs):")
+    for name, cumulative in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print(f"\nTotal import time: {total_ms:.1f} ms (median), budget {args.budget_ms:.0f} ms")
+
+    failed = False
+    eager = sorted(
+        name for name in modules
+        if any(name == lazy or name.startswith(lazy + '.') for lazy in LAZY_MODULES)
+    )
+    if eager:
+        print(f"Error: imported at start-up but should be lazy: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("Error: start-up import budget exceeded")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()